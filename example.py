@@ -3,13 +3,64 @@ Example: Quick Start with MetaPersona
 This script demonstrates basic usage of MetaPersona as a library.
 """
 import os
+import sys
 from src import AgentManager, MemoryLoop
+from src.response_cache import ResponseCache
 
 # Set your LLM provider
 os.environ['LLM_PROVIDER'] = 'openai'  # or 'anthropic', 'ollama'
 os.environ['OPENAI_API_KEY'] = 'your-api-key-here'
 
-def main():
+def process_with_cache(agent, tasks, cache):
+    """Answer tasks from the response cache, sending only misses to the LLM."""
+    model = getattr(agent.llm, "model", "")
+    system_prompt = agent.build_system_prompt()
+    
+    responses = [cache.get(model, system_prompt, task) if cache else None for task in tasks]
+    misses = [i for i, response in enumerate(responses) if response is None]
+    if len(misses) < len(tasks):
+        print(f"✓ {len(tasks) - len(misses)} response(s) served from cache")
+    
+    if misses:
+        # Process all uncached tasks in a single request
+        fresh = agent.process_tasks_batch([tasks[i] for i in misses])
+        for i, response in zip(misses, fresh):
+            responses[i] = response
+            if cache and not response.startswith("Error processing task:"):
+                cache.set(model, system_prompt, tasks[i], response)
+    
+    return responses
+
+
+def stream_with_cache(agent, task, cache):
+    """Print a task's response as it streams in, serving it from cache if possible."""
+    model = getattr(agent.llm, "model", "")
+    system_prompt = agent.build_system_prompt()
+    
+    response = cache.get(model, system_prompt, task) if cache else None
+    if response is not None:
+        print(response)
+        return response
+    
+    streamed = []
+    
+    def on_token(token):
+        streamed.append(token)
+        print(token, end="", flush=True)
+    
+    response = agent.process_task_stream(task, on_token=on_token)
+    if response != "".join(streamed):
+        # A skill result (or error) replaced the streamed text
+        print(f"\n{response}" if streamed else response)
+    else:
+        print()
+    
+    if cache and not response.startswith("Error processing task:"):
+        cache.set(model, system_prompt, task, response)
+    return response
+
+
+def main(use_cache: bool = True, stream: bool = True):
     """Run a simple example interaction."""
     
     # Initialize agent
@@ -29,14 +80,21 @@ def main():
             "Draft a professional email declining a meeting invitation"
         ]
         
+        cache = ResponseCache("./data/response_cache") if use_cache else None
+        # Without streaming, all uncached tasks go out in a single batched request
+        responses = None if stream else process_with_cache(agent, tasks, cache)
+        
         for i, task in enumerate(tasks, 1):
             print(f"\n{'='*60}")
             print(f"Task {i}: {task}")
             print('='*60)
-            
-            # Process task
-            response = agent.process_task(task)
-            print(f"\nResponse:\n{response}\n")
+            print("\nResponse:")
+            if stream:
+                response = stream_with_cache(agent, task, cache)
+            else:
+                response = responses[i - 1]
+                print(response)
+            print()
             
             # Record interaction
             memory.record_interaction(task, response, tags=["demo"])
@@ -60,4 +118,4 @@ def main():
         print("2. Installed dependencies: pip install -r requirements.txt")
 
 if __name__ == "__main__":
-    main()
+    main(use_cache="--no-cache" not in sys.argv, stream="--no-stream" not in sys.argv)
@@ -75,15 +75,24 @@ def demo_with_summary(meeting_id):
     
     # Load meeting metadata
     from pathlib import Path
-    import json
     from src.meeting_listener import MeetingMetadata
     from datetime import datetime
     
+    # orjson is much faster on large transcripts; fall back to stdlib json
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+        import json
+    
     meeting_dir = Path('./data/meetings') / meeting_id
     metadata_file = meeting_dir / 'metadata.json'
     
-    with open(metadata_file, 'r') as f:
-        metadata_dict = json.load(f)
+    if orjson:
+        metadata_dict = orjson.loads(metadata_file.read_bytes())
+    else:
+        with open(metadata_file, 'r') as f:
+            metadata_dict = json.load(f)
     
     metadata = MeetingMetadata(
         meeting_id=metadata_dict['meeting_id'],
@@ -159,8 +168,11 @@ def demo_with_summary(meeting_id):
     
     # Save summary
     summary_file = meeting_dir / 'summary.json'
-    with open(summary_file, 'w') as f:
-        json.dump(summary.to_dict(), f, indent=2)
+    if orjson:
+        summary_file.write_bytes(orjson.dumps(summary.to_dict(), option=orjson.OPT_INDENT_2))
+    else:
+        with open(summary_file, 'w') as f:
+            json.dump(summary.to_dict(), f, indent=2)
     
     print(f"\n✓ Summary saved to: {summary_file}")
 
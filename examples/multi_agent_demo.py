@@ -3,22 +3,55 @@ Multi-Agent System Demo
 Demonstrates the power of multiple specialized agents working together.
 """
 import asyncio
+from functools import lru_cache
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-from src.agent_registry import AgentRegistry
-from src.task_router import TaskRouter
-from src.specialized_agents import ResearchAgent, CodeAgent, WriterAgent, GeneralistAgent
-from src.llm_provider import get_llm_provider
-from src.skills import SkillManager
+# rich and the src modules (LLM SDKs, numpy, ...) are imported inside the
+# functions that use them, so importing this module stays cheap.
 
-console = Console()
+REGISTRY_SNAPSHOT = Path("./data/registry.msgpack")
+
+# Ids of the demo agents; the registry builds one SingleUseAgent per id
+AGENT_IDS = ("researcher", "coder", "writer", "generalist")
+
+
+@lru_cache(maxsize=1)
+def _console():
+    """Rich console shared by every demo."""
+    from rich.console import Console
+    return Console()
+
+
+def __getattr__(name):
+    """Expose ``console`` lazily (PEP 562)."""
+    if name == "console":
+        return _console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=1)
+def _registry():
+    """Agent registry built once and reused by every demo."""
+    from src.agent_registry import AgentRegistry
+    
+    # Reuse the snapshot from an earlier run instead of rebuilding every agent;
+    # it may come from another command and lack some of the demo agents
+    registry = AgentRegistry.load(REGISTRY_SNAPSHOT) if REGISTRY_SNAPSHOT.exists() else AgentRegistry()
+    missing = [agent_id for agent_id in AGENT_IDS if agent_id not in registry]
+    for agent_id in missing:
+        registry.register(agent_id)
+    if missing:
+        registry.dump(REGISTRY_SNAPSHOT)
+    return registry
 
 
 async def demo_basic_routing():
     """Demonstrate basic task routing to different agents."""
+    from rich.panel import Panel
+    from src.task_router import TaskRouter
+    from src.rate_limiter import RateLimiter
+    
+    console = _console()
     console.print(Panel(
         "[bold cyan]Demo 1: Basic Task Routing[/bold cyan]\n\n"
         "Watch how different tasks are routed to specialized agents",
@@ -26,55 +59,14 @@ async def demo_basic_routing():
     ))
     
     # Setup
-    registry = AgentRegistry(Path("./data"))
-    llm_provider = get_llm_provider()
-    skills_manager = SkillManager()
-    
-    # Register agents
-    console.print("\n[bold]Registering Agents...[/bold]")
-    
-    researcher = ResearchAgent(
-        agent_id="researcher",
-        role="researcher",
-        description="Specialized in research, information gathering, and analysis",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    )
-    registry.register(researcher)
-    console.print("  ✓ ResearchAgent registered")
-    
-    coder = CodeAgent(
-        agent_id="coder",
-        role="coder",
-        description="Specialized in coding, debugging, and technical tasks",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    )
-    registry.register(coder)
-    console.print("  ✓ CodeAgent registered")
-    
-    writer = WriterAgent(
-        agent_id="writer",
-        role="writer",
-        description="Specialized in writing, content creation, and communication",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    )
-    registry.register(writer)
-    console.print("  ✓ WriterAgent registered")
-    
-    generalist = GeneralistAgent(
-        agent_id="generalist",
-        role="generalist",
-        description="Handles general tasks and conversations",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    )
-    registry.register(generalist)
-    console.print("  ✓ GeneralistAgent registered")
-    
-    # Create router
-    router = TaskRouter(registry, default_agent_id="generalist")
+    registry = _registry()
+    
+    console.print("\n[bold]Registered Agents:[/bold]")
+    for agent in registry.list_all():
+        console.print(f"  ✓ {agent.agent_id}")
+    
+    # Create router (throttled by RPM_LIMIT / TPM_LIMIT if set)
+    router = TaskRouter(registry, default_agent_id="generalist", rate_limiter=RateLimiter.from_env())
     
     # Test tasks
     test_tasks = [
@@ -97,7 +89,7 @@ async def demo_basic_routing():
         console.print(f"  → Routed to: [bold]{recommended}[/bold] (confidence: {confidence:.2f})")
         
         # Execute task
-        result = await router.execute_task(task)
+        result = await router.aexecute_task(task)
         
         if result.success:
             response = str(result.result)[:150]  # Truncate for display
@@ -108,6 +100,11 @@ async def demo_basic_routing():
 
 async def demo_routing_explanation():
     """Demonstrate routing decision explanation."""
+    from rich.panel import Panel
+    from rich.table import Table
+    from src.task_router import TaskRouter
+    
+    console = _console()
     console.print(Panel(
         "[bold cyan]Demo 2: Routing Decision Explanation[/bold cyan]\n\n"
         "See how the router analyzes tasks and selects agents",
@@ -115,32 +112,7 @@ async def demo_routing_explanation():
     ))
     
     # Setup
-    registry = AgentRegistry(Path("./data"))
-    llm_provider = get_llm_provider()
-    skills_manager = SkillManager()
-    
-    # Register agents
-    registry.register(ResearchAgent(
-        agent_id="researcher",
-        role="researcher",
-        description="Research specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    ))
-    registry.register(CodeAgent(
-        agent_id="coder",
-        role="coder",
-        description="Coding specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    ))
-    registry.register(WriterAgent(
-        agent_id="writer",
-        role="writer",
-        description="Writing specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    ))
+    registry = _registry()
     
     router = TaskRouter(registry, min_confidence=0.5)
     
@@ -175,6 +147,10 @@ async def demo_routing_explanation():
 
 async def demo_agent_collaboration():
     """Demonstrate multiple agents working on a complex task."""
+    from rich.panel import Panel
+    from src.task_router import TaskRouter
+    
+    console = _console()
     console.print(Panel(
         "[bold cyan]Demo 3: Agent Collaboration[/bold cyan]\n\n"
         "Multiple agents working together on a complex project",
@@ -182,65 +158,48 @@ async def demo_agent_collaboration():
     ))
     
     # Setup
-    registry = AgentRegistry(Path("./data"))
-    llm_provider = get_llm_provider()
-    skills_manager = SkillManager()
-    
-    # Register agents
-    researcher = ResearchAgent(
-        agent_id="researcher",
-        role="researcher",
-        description="Research specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    )
-    registry.register(researcher)
-    
-    coder = CodeAgent(
-        agent_id="coder",
-        role="coder",
-        description="Coding specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    )
-    registry.register(coder)
-    
-    writer = WriterAgent(
-        agent_id="writer",
-        role="writer",
-        description="Writing specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    )
-    registry.register(writer)
+    registry = _registry()
     
     router = TaskRouter(registry)
     
     # Complex project: Build a web scraper
     console.print("\n[bold]Project:[/bold] Build a web scraper with documentation\n")
     
-    subtasks = [
-        ("Research best practices for web scraping in Python", "researcher"),
-        ("Write Python code for a simple web scraper", "coder"),
-        ("Write documentation for the web scraper", "writer")
+    # Research and code are independent; documentation needs the code
+    stages = [
+        [
+            ("Research best practices for web scraping in Python", "researcher"),
+            ("Write Python code for a simple web scraper", "coder"),
+        ],
+        [
+            ("Write documentation for the web scraper", "writer"),
+        ],
     ]
     
     results = []
+    step = 0
     
-    for i, (task, preferred_role) in enumerate(subtasks, 1):
-        console.print(f"[cyan]Step {i}:[/cyan] {task}")
-        
-        # Route to preferred role
-        result = await router.execute_task(task, preferred_role=preferred_role)
+    for stage in stages:
+        context = {"previous_results": results} if results else None
         
-        if result.success:
-            results.append(result.result)
-            agent_id = result.metadata.get('agent_id', 'unknown')
-            console.print(f"  ✓ Completed by {agent_id}")
-        else:
-            console.print(f"  ✗ Failed: {result.error}")
+        # Run every subtask in this stage concurrently
+        stage_results = await asyncio.gather(*(
+            router.aexecute_task(task, context=context, preferred_role=preferred_role)
+            for task, preferred_role in stage
+        ))
         
-        console.print()
+        for (task, preferred_role), result in zip(stage, stage_results):
+            step += 1
+            console.print(f"[cyan]Step {step}:[/cyan] {task}")
+            
+            if result.success:
+                results.append(result.result)
+                agent_id = result.metadata.get('agent_id', 'unknown')
+                console.print(f"  ✓ Completed by {agent_id}")
+            else:
+                console.print(f"  ✗ Failed: {result.error}")
+            
+            console.print()
     
     console.print("[bold green]✓ Project completed![/bold green]")
     console.print(f"\n[dim]Generated {len(results)} deliverables[/dim]")
@@ -248,6 +207,12 @@ async def demo_agent_collaboration():
 
 async def demo_routing_stats():
     """Demonstrate routing statistics and analytics."""
+    from rich.panel import Panel
+    from rich.table import Table
+    from src.task_router import TaskRouter
+    from src.rate_limiter import RateLimiter
+    
+    console = _console()
     console.print(Panel(
         "[bold cyan]Demo 4: Routing Statistics[/bold cyan]\n\n"
         "View analytics about agent usage and routing decisions",
@@ -255,34 +220,9 @@ async def demo_routing_stats():
     ))
     
     # Setup
-    registry = AgentRegistry(Path("./data"))
-    llm_provider = get_llm_provider()
-    skills_manager = SkillManager()
-    
-    # Register agents
-    registry.register(ResearchAgent(
-        agent_id="researcher",
-        role="researcher",
-        description="Research specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    ))
-    registry.register(CodeAgent(
-        agent_id="coder",
-        role="coder",
-        description="Coding specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    ))
-    registry.register(GeneralistAgent(
-        agent_id="generalist",
-        role="generalist",
-        description="General tasks",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    ))
+    registry = _registry()
     
-    router = TaskRouter(registry, default_agent_id="generalist")
+    router = TaskRouter(registry, default_agent_id="generalist", rate_limiter=RateLimiter.from_env())
     
     # Execute various tasks
     console.print("\n[bold]Executing various tasks...[/bold]\n")
@@ -296,8 +236,12 @@ async def demo_routing_stats():
         "Tell me a joke"
     ]
     
+    def on_progress(done: int, total: int):
+        console.print(f"  [dim]{done}/{total} tasks complete[/dim]")
+    
+    await router.aexecute_batch(tasks, max_concurrency=10, on_progress=on_progress)
+    
     for task in tasks:
-        await router.execute_task(task)
         console.print(f"  • Routed: {task[:40]}...")
     
     # Show statistics
@@ -329,6 +273,9 @@ async def demo_routing_stats():
 
 async def demo_agent_status():
     """Show detailed agent status information."""
+    from rich.panel import Panel
+    
+    console = _console()
     console.print(Panel(
         "[bold cyan]Demo 5: Agent Status & Capabilities[/bold cyan]\n\n"
         "View detailed information about each agent",
@@ -336,49 +283,26 @@ async def demo_agent_status():
     ))
     
     # Setup
-    registry = AgentRegistry(Path("./data"))
-    llm_provider = get_llm_provider()
-    skills_manager = SkillManager()
-    
-    # Register agents
-    registry.register(ResearchAgent(
-        agent_id="researcher",
-        role="researcher",
-        description="Research specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    ))
-    registry.register(CodeAgent(
-        agent_id="coder",
-        role="coder",
-        description="Coding specialist",
-        llm_provider=llm_provider,
-        skills_manager=skills_manager
-    ))
+    registry = _registry()
     
     console.print("\n[bold]Agent Details:[/bold]\n")
     
-    for agent in registry.list_all():
-        status = agent.get_status()
-        
+    for status in registry.status_snapshot():
         console.print(Panel(
-            f"[bold]Role:[/bold] {status['role']}\n"
-            f"[bold]Description:[/bold] {status['description']}\n"
-            f"[bold]Capabilities:[/bold] {status['capabilities'][0]['name']} (+{len(status['capabilities'])-1} more)\n"
-            f"[bold]Skills Available:[/bold] {status['skills_count']}\n"
-            f"[bold]Total Interactions:[/bold] {status['interactions_count']}",
+            f"[bold]Mode:[/bold] {status['mode']}\n"
+            f"[bold]Mode Changes:[/bold] {status['mode_changes']}\n"
+            f"[bold]Recent Messages:[/bold] {status['recent_messages']}",
             title=f"Agent: {status['agent_id']}",
             border_style="cyan"
         ))
-        
-        console.print("\n[bold]Capabilities:[/bold]")
-        for cap in status['capabilities']:
-            console.print(f"  • {cap['name']}: {cap['description']} (confidence: {cap['confidence']})")
         console.print()
 
 
 async def main():
     """Run all demos."""
+    from rich.panel import Panel
+    
+    console = _console()
     console.print(Panel(
         "[bold cyan]MetaPersona Multi-Agent System Demo[/bold cyan]\n\n"
         "Demonstrating intelligent task routing and agent collaboration",
@@ -403,6 +327,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    console = _console()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
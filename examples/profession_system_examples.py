@@ -1,23 +1,26 @@
 """
 Example usage of the Universal Profession Understanding System
 """
+import os
+import json
+import asyncio
 from pathlib import Path
 from src.profession import UniversalProfessionSystem
 from src.llm_provider import get_llm_provider
 from src.cognitive_profile import ProfileManager
 
-def example_software_engineer():
+
+def _pretty_json(obj) -> str:
+    """Indented JSON for display, via orjson when installed."""
+    try:
+        import orjson  # type: ignore
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    except ImportError:
+        return json.dumps(obj, indent=2)
+
+async def example_software_engineer(upus: UniversalProfessionSystem, cognitive_profile):
     """Example: Onboarding a software engineer."""
     
-    # Initialize system
-    llm = get_llm_provider()
-    upus = UniversalProfessionSystem(
-        llm_provider=llm,
-        data_dir=Path("data"),
-        google_api_key="YOUR_GOOGLE_API_KEY",  # Set in environment
-        google_cse_id="YOUR_GOOGLE_CSE_ID"
-    )
-    
     # User describes their profession
     profession_description = """
     I'm a senior software engineer working in fintech. 
@@ -45,24 +48,21 @@ def example_software_engineer():
     """
     
     # Onboard the profession
-    schema = upus.onboard_profession(
+    schema = await upus.aonboard_profession(
         user_input=profession_description,
         user_id="user123",
         interactive=False
     )
     
     print("\n" + "="*80)
-    print("PROFESSION SCHEMA CREATED")
+    print("EXAMPLE 1: Software Engineer - PROFESSION SCHEMA CREATED")
     print("="*80)
     print(schema.to_json())
     
     # Later: Process a query with profession context
-    profile_manager = ProfileManager("data")
-    cognitive_profile = profile_manager.load_profile()
-    
     query = "Should I refactor this legacy payment processing module or wait until after the Q4 release?"
     
-    result = upus.process_query(
+    result = await upus.aprocess_query(
         query=query,
         user_id="user123",
         cognitive_profile=cognitive_profile
@@ -76,19 +76,12 @@ def example_software_engineer():
     print("\n" + "="*80)
     print("DECISION FACTORS EXTRACTED")
     print("="*80)
-    import json
-    print(json.dumps(result["decision_factors"], indent=2))
+    print(_pretty_json(result["decision_factors"]))
 
 
-def example_nurse():
+async def example_nurse(upus: UniversalProfessionSystem):
     """Example: Onboarding a nurse."""
     
-    llm = get_llm_provider()
-    upus = UniversalProfessionSystem(
-        llm_provider=llm,
-        data_dir=Path("data")
-    )
-    
     profession_description = """
     I'm a registered nurse (RN) working in the ICU at a Level 1 trauma center.
     
@@ -120,7 +113,7 @@ def example_nurse():
     Regulatory: HIPAA compliance, Joint Commission standards, state nursing board regulations
     """
     
-    schema = upus.onboard_profession(
+    schema = await upus.aonboard_profession(
         user_input=profession_description,
         user_id="nurse456"
     )
@@ -128,20 +121,14 @@ def example_nurse():
     # Show summary
     summary = upus.get_profession_summary("nurse456")
     print("\n" + "="*80)
-    print("PROFESSION SUMMARY")
+    print("EXAMPLE 2: ICU Nurse - PROFESSION SUMMARY")
     print("="*80)
     print(summary)
 
 
-def example_financial_analyst():
+async def example_financial_analyst(upus: UniversalProfessionSystem, cognitive_profile):
     """Example: Onboarding a financial analyst."""
     
-    llm = get_llm_provider()
-    upus = UniversalProfessionSystem(
-        llm_provider=llm,
-        data_dir=Path("data")
-    )
-    
     profession_description = """
     I'm a senior financial analyst at an investment bank, focusing on equity research.
     
@@ -174,51 +161,35 @@ def example_financial_analyst():
     - Public statements require legal approval
     """
     
-    schema = upus.onboard_profession(
+    schema = await upus.aonboard_profession(
         user_input=profession_description,
         user_id="analyst789"
     )
     
     # Create aligned persona
-    profile_manager = ProfileManager("data")
-    cognitive_profile = profile_manager.load_profile()
-    
-    aligned_persona = upus.create_aligned_persona("analyst789", cognitive_profile)
+    aligned_persona = await upus.acreate_aligned_persona("analyst789", cognitive_profile)
     
     print("\n" + "="*80)
-    print("ALIGNED PERSONA (Parallel-Self)")
+    print("EXAMPLE 3: Financial Analyst - ALIGNED PERSONA (Parallel-Self)")
     print("="*80)
-    import json
-    print(json.dumps(aligned_persona, indent=2))
+    print(_pretty_json(aligned_persona))
 
 
-def example_query_with_expansion():
+async def example_query_with_expansion(upus: UniversalProfessionSystem, cognitive_profile):
     """Example: Query that triggers knowledge expansion."""
     
-    llm = get_llm_provider()
-    upus = UniversalProfessionSystem(
-        llm_provider=llm,
-        data_dir=Path("data"),
-        google_api_key="YOUR_API_KEY",
-        google_cse_id="YOUR_CSE_ID"
-    )
-    
-    # Load existing profession
-    profile_manager = ProfileManager("data")
-    cognitive_profile = profile_manager.load_profile()
-    
     # Query mentions something not in the schema
     query = "What are the best practices for implementing GDPR compliance in our customer data pipeline?"
     
     # This will detect "GDPR" as a knowledge gap and fetch information
-    result = upus.process_query(
+    result = await upus.aprocess_query(
         query=query,
         user_id="user123",
         cognitive_profile=cognitive_profile
     )
     
     print("\n" + "="*80)
-    print("KNOWLEDGE EXPANSION TRIGGERED")
+    print("EXAMPLE 4: Query with Knowledge Expansion - KNOWLEDGE EXPANSION TRIGGERED")
     print("="*80)
     print(f"Sources used: {len(result['sources'])}")
     for source in result['sources']:
@@ -228,26 +199,31 @@ def example_query_with_expansion():
     print(result["enhanced_query"])
 
 
-if __name__ == "__main__":
-    print("Universal Profession Understanding System - Examples\n")
+async def main():
+    """Run the examples, overlapping their LLM calls."""
+    # One system (and LLM client) shared by every example
+    upus = UniversalProfessionSystem(
+        llm_provider=get_llm_provider(),
+        data_dir=Path("data"),
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+        google_cse_id=os.getenv("GOOGLE_SEARCH_ENGINE_ID")
+    )
     
-    # Run examples
-    print("\n" + "="*80)
-    print("EXAMPLE 1: Software Engineer")
-    print("="*80)
-    example_software_engineer()
+    # Load the cognitive profile once for every example
+    cognitive_profile = ProfileManager("data").load_profile()
     
-    print("\n\n" + "="*80)
-    print("EXAMPLE 2: ICU Nurse")
-    print("="*80)
-    example_nurse()
+    # The three onboardings are independent, so run them concurrently
+    await asyncio.gather(
+        example_software_engineer(upus, cognitive_profile),
+        example_nurse(upus),
+        example_financial_analyst(upus, cognitive_profile)
+    )
     
-    print("\n\n" + "="*80)
-    print("EXAMPLE 3: Financial Analyst")
-    print("="*80)
-    example_financial_analyst()
+    # Queries the software engineer profession onboarded above
+    await example_query_with_expansion(upus, cognitive_profile)
+
+
+if __name__ == "__main__":
+    print("Universal Profession Understanding System - Examples\n")
     
-    print("\n\n" + "="*80)
-    print("EXAMPLE 4: Query with Knowledge Expansion")
-    print("="*80)
-    example_query_with_expansion()
+    asyncio.run(main())
@@ -2,13 +2,16 @@
 Batch Safety Template Generator
 Pre-generates safety rules for common professions to reduce API costs and improve onboarding speed.
 """
-from src.profession import UniversalProfessionSystem
+from src.profession import UniversalProfessionSystem, ProfessionSchema, KnowledgeExpansionLayer
 from src.llm_provider import get_llm_provider
+from src.rate_limiter import RateLimiter
 from pathlib import Path
-import time
+import asyncio
+import os
 
 # Top 100 common professions across major industries
-COMMON_PROFESSIONS = [
+# (dict.fromkeys drops repeated pairs, keeping order)
+COMMON_PROFESSIONS = tuple(dict.fromkeys((
     # Technology
     ("Software Engineer", "Technology"),
     ("Data Scientist", "Technology"),
@@ -130,15 +133,30 @@ COMMON_PROFESSIONS = [
     ("Construction Manager", "Construction"),
     ("Architect", "Architecture"),
     ("Structural Engineer", "Engineering"),
-]
+)))
 
-def generate_templates(max_professions: int = None, delay_seconds: float = 2.0):
+DATA_DIR = Path("./data")
+
+# Per-profession names computed once at import, not per generation
+PROFESSION_SLUGS = {
+    (profession, industry): profession.lower().replace(' ', '_')
+    for profession, industry in COMMON_PROFESSIONS
+}
+TEMPLATE_FILENAMES = {
+    (profession, industry): KnowledgeExpansionLayer.template_filename(profession, industry)
+    for profession, industry in COMMON_PROFESSIONS
+}
+
+async def generate_templates(max_professions: int = None, max_concurrency: int = 8):
     """
     Generate safety rule templates for common professions.
     
+    Missing templates are generated concurrently, at most ``max_concurrency``
+    at a time and paced by RPM_LIMIT / TPM_LIMIT when those are set.
+    
     Args:
         max_professions: Maximum number to generate (None = all)
-        delay_seconds: Delay between generations to avoid rate limits
+        max_concurrency: Maximum number of LLM requests in flight at once
     """
     print("=" * 70)
     print("Safety Template Batch Generator")
@@ -146,53 +164,69 @@ def generate_templates(max_professions: int = None, delay_seconds: float = 2.0):
     
     # Initialize system
     llm = get_llm_provider()
-    system = UniversalProfessionSystem(llm, "./data")
+    system = UniversalProfessionSystem(llm, DATA_DIR)
     
     professions_to_generate = COMMON_PROFESSIONS[:max_professions] if max_professions else COMMON_PROFESSIONS
     
-    print(f"\n📋 Generating templates for {len(professions_to_generate)} professions...")
-    print(f"⏱️  Estimated time: {len(professions_to_generate) * delay_seconds / 60:.1f} minutes\n")
+    print(f"\n📋 Checking templates for {len(professions_to_generate)} professions...")
+    
+    # One directory scan tells us which templates already exist
+    knowledge = system.knowledge_expansion
+    existing = {entry.name for entry in os.scandir(knowledge.template_dir)}
+    
+    pending = [key for key in professions_to_generate if TEMPLATE_FILENAMES[key] not in existing]
+    skip_count = len(professions_to_generate) - len(pending)
+    if skip_count:
+        print(f"   ⏭️  {skip_count} templates already exist, skipping...")
+    
+    rate_limiter = RateLimiter.from_env()
+    
+    # One in-place progress bar when tqdm is installed, plain lines otherwise
+    try:
+        from tqdm import tqdm
+    except ImportError:
+        tqdm = None
+    bar = tqdm(total=len(pending), desc="templates", unit="prof", mininterval=0.5) if tqdm and pending else None
+    log = bar.write if bar else print
     
+    # Minimal schemas carry just what safety generation needs
+    schemas = [
+        ProfessionSchema.minimal(profession, industry, f"template_{PROFESSION_SLUGS[(profession, industry)]}")
+        for profession, industry in pending
+    ]
     success_count = 0
-    skip_count = 0
     error_count = 0
     
-    for i, (profession, industry) in enumerate(professions_to_generate, 1):
-        print(f"\n[{i}/{len(professions_to_generate)}] {profession} ({industry})")
-        
-        # Check if template already exists
-        existing_template = system.knowledge_expansion.load_safety_template(profession, industry)
-        if existing_template:
-            print(f"   ⏭️  Template already exists, skipping...")
-            skip_count += 1
-            continue
-        
+    def save_result(schema: ProfessionSchema, safety_rules) -> None:
+        nonlocal success_count, error_count
+        profession, industry = schema.profession_name, schema.industry
         try:
-            # Create minimal schema for safety generation
-            from src.profession.schema import ProfessionSchema
-            
-            minimal_schema = ProfessionSchema(
-                profession_id=f"template_{profession.lower().replace(' ', '_')}",
-                profession_name=profession,
-                industry=industry
-            )
-            
-            # Generate safety rules
-            safety_rules = system.knowledge_expansion.generate_comprehensive_safety_rules(minimal_schema)
-            
-            # Save as template
-            system.knowledge_expansion.save_safety_template(profession, industry, safety_rules)
-            
-            print(f"   ✅ Generated: {len(safety_rules.critical)} critical, {len(safety_rules.important)} important rules")
+            knowledge.save_safety_template(profession, industry, safety_rules, verbose=False)
             success_count += 1
-            
-            # Rate limiting
-            if i < len(professions_to_generate):
-                time.sleep(delay_seconds)
-                
+            if bar:
+                bar.set_postfix(crit=len(safety_rules.critical), imp=len(safety_rules.important), refresh=False)
+            else:
+                print(f"   ✅ {profession} ({industry}): {len(safety_rules.critical)} critical, {len(safety_rules.important)} important rules")
         except Exception as e:
-            print(f"   ❌ Error: {e}")
             error_count += 1
+            log(f"   ❌ {profession} ({industry}): {e}")
+        finally:
+            if bar:
+                bar.update(1)
+    
+    if pending:
+        log(f"\n🚀 Generating {len(pending)} templates ({max_concurrency} at a time)...\n")
+    
+    # Every prompt goes out in one batched submission; templates are saved as they arrive
+    try:
+        await knowledge.agenerate_comprehensive_safety_rules_batch(
+            schemas, max_concurrency, rate_limiter, on_result=save_result
+        )
+    finally:
+        # Close the provider's async client while this event loop still runs
+        await llm.aclose()
+    if bar:
+        bar.close()
     
     print("\n" + "=" * 70)
     print("Generation Complete!")
@@ -200,7 +234,7 @@ def generate_templates(max_professions: int = None, delay_seconds: float = 2.0):
     print(f"✅ Successfully generated: {success_count}")
     print(f"⏭️  Skipped (existing): {skip_count}")
     print(f"❌ Errors: {error_count}")
-    print(f"📁 Templates saved to: data/safety_templates/")
+    print(f"📁 Templates saved to: {knowledge.template_dir}/")
     print("=" * 70)
 
 if __name__ == "__main__":
@@ -208,8 +242,8 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Generate safety rule templates for common professions")
     parser.add_argument("--max", type=int, default=None, help="Maximum number of professions to generate")
-    parser.add_argument("--delay", type=float, default=2.0, help="Delay between generations (seconds)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum concurrent LLM requests")
     
     args = parser.parse_args()
     
-    generate_templates(max_professions=args.max, delay_seconds=args.delay)
+    asyncio.run(generate_templates(max_professions=args.max, max_concurrency=args.concurrency))
@@ -1,21 +1,42 @@
 #!/usr/bin/env python3
-"""List all available audio devices"""
+"""List all available audio devices, grouped by host API"""
+import sys
 import sounddevice as sd
 
 devices = sd.query_devices()
-print("\n=== Available Audio Devices ===\n")
+hostapis = sd.query_hostapis()
+lines = ["", "=== Available Audio Devices ===", ""]
 
+# Bucket device indices by host API, dropping repeats of the same name within one API
+by_hostapi = {api_index: [] for api_index in range(len(hostapis))}
+seen = set()
 for i, device in enumerate(devices):
-    device_type = []
-    if device['max_input_channels'] > 0:
-        device_type.append('INPUT')
-    if device['max_output_channels'] > 0:
-        device_type.append('OUTPUT')
-    
-    print(f"{i}: {device['name']}")
-    print(f"   Type: {' + '.join(device_type)}")
-    print(f"   Channels: In={device['max_input_channels']}, Out={device['max_output_channels']}")
-    print()
+    key = (device['name'], device['hostapi'])
+    if key in seen:
+        continue
+    seen.add(key)
+    by_hostapi.setdefault(device['hostapi'], []).append(i)
 
-print(f"Default Input Device: {sd.default.device[0]}")
-print(f"Default Output Device: {sd.default.device[1]}")
+for api_index, device_indices in by_hostapi.items():
+    if not device_indices:
+        continue
+    api_name = hostapis[api_index]['name'] if api_index < len(hostapis) else f"Host API {api_index}"
+    lines.append(f"--- {api_name} ---")
+
+    for i in device_indices:
+        device = devices[i]
+        name = device['name']
+        inputs = device['max_input_channels']
+        outputs = device['max_output_channels']
+        device_type = 'INPUT + OUTPUT' if inputs and outputs else 'INPUT' if inputs else 'OUTPUT' if outputs else ''
+
+        lines.append(f"{i}: {name}")
+        lines.append(f"   Type: {device_type}")
+        lines.append(f"   Channels: In={inputs}, Out={outputs}")
+        lines.append("")
+
+lines.append(f"Default Input Device: {sd.default.device[0]}")
+lines.append(f"Default Output Device: {sd.default.device[1]}")
+
+# One write instead of a print (and flush) per line
+sys.stdout.write("\n".join(lines) + "\n")
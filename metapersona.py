@@ -7,43 +7,120 @@ MetaPersona CLI - Command Line Interface
 Interact with your personal AI agent.
 """
 import os
+import re
 import sys
 import click
-from datetime import datetime
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.markdown import Markdown
-from rich.prompt import Prompt, Confirm
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent))
-
-from src.identity import IdentityLayer
-from src.persona_agent import AgentManager
-from src.memory_loop import MemoryLoop
-from src.cognitive_profile import ProfileManager
-from src.skills import SkillManager
-from src.skills.builtin import CalculatorSkill, FileOpsSkill, WebSearchSkill, TimezoneSkill, FlightSkill
-from src.personalized_agents import (
-    PersonalizedResearchAgent,
-    PersonalizedCodeAgent, 
-    PersonalizedWriterAgent,
-    PersonalizedGeneralistAgent
+# Make the src package importable from any working directory (running the
+# script already puts its directory first on the path)
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+
+# Heavier src.* modules and rich widgets are imported inside the commands that
+# use them, so short commands (--help, status, history) start quickly
+
+# Auto-highlighting (numbers, paths, ...) is off: output is styled via explicit
+# markup, so the per-print highlighter regexes are wasted work
+console = Console(highlight=False)
+
+# init's profile questions: (prompt, choices, default, profile section, field)
+INIT_QUESTIONS = (
+    ("Writing tone", ("formal", "casual", "technical", "friendly", "professional"), "casual",
+     "writing_style", "tone"),
+    ("Vocabulary level", ("simple", "intermediate", "advanced", "expert"), "intermediate",
+     "writing_style", "vocabulary_level"),
+    ("Decision-making approach", ("analytical", "intuitive", "cautious", "bold", "balanced"), "analytical",
+     "decision_pattern", "approach"),
+    ("Risk tolerance", ("conservative", "moderate", "aggressive"), "moderate",
+     "decision_pattern", "risk_tolerance"),
 )
-from src.user_profiling import UserProfilingSystem, UserProfile
-from src.meeting_listener import MeetingListener, MeetingSummarizer
-from src.meeting_integrations import MeetingURLParser, VirtualAudioDevice, setup_meeting_listener
-from src.onboarding import run_onboarding
-from src.persona_factory import PersonaFactory
-from src.question_router import QuestionRouter
+# Chat turns between agent-state saves (state is also saved when a session ends)
+SAVE_EVERY_TURNS = 5
+
+# Chat REPL command words are at most this long (with surrounding whitespace)
+MAX_COMMAND_LENGTH = 16
+# Words that send a chat message down the task-execution pipeline
+DIAGNOSTIC_KEYWORDS = ('run', 'execute', 'perform', 'task:', 'begin')
+# Agent registry snapshot inside the data directory (see AgentRegistry.dump)
+REGISTRY_SNAPSHOT = "registry.msgpack"
+# UserProfile fields adaptive-chat hands to agents (timestamps, hobbies etc. aren't needed)
+ADAPTIVE_CONTEXT_FIELDS = frozenset({
+    "user_id", "profession", "technical_level", "preferred_communication_style",
+    "loaded_skill_packs", "agent_routing_preferences",
+})
+# Distinct inputs whose agent scores adaptive-chat keeps for repeated turns
+SCORE_CACHE_SIZE = 512
+# Unmistakable task openings routed straight to one agent, skipping scoring and LLM routing
+_ROUTE_PREFILTER = re.compile(
+    r"\s*(?:(?P<coder>```|def |class |import |fix (?:the |this |a )?bug)"
+    r"|(?P<researcher>research |find (?:papers|sources)|literature )"
+    r"|(?P<writer>draft |rewrite |proofread ))",
+    re.IGNORECASE,
+)
+# Confidence reported for a prefilter match
+PREFILTER_CONFIDENCE = 0.99
+# Characters and line prefixes that mean a reply needs the Markdown renderer
+_MARKDOWN_SYNTAX = re.compile(r'[`*_#\[\]>|\\]|^\s*(?:[-+]|\d+\.)\s', re.MULTILINE)
+
+
+def _render_response(response: str):
+    """Markdown for replies that use markdown syntax, plain text otherwise.
+    
+    Plain one-liners skip building a CommonMark AST; Text keeps them from
+    being read as Rich markup.
+    """
+    if _MARKDOWN_SYNTAX.search(response):
+        from rich.markdown import Markdown
+        return Markdown(response)
+    from rich.text import Text
+    return Text(response)
+
+
+@lru_cache(maxsize=64)
+def _expert_context(name: str, role: str, expertise_areas: tuple) -> str:
+    """Instructions for answering as an expert persona.
+    
+    Cached so repeat turns routed to the same expert reuse one identical
+    string (which also keeps the prompt prefix stable for provider caching).
+    """
+    return f"""You are {name}, {role}.
+    Your expertise: {', '.join(expertise_areas)}
+    Respond as this expert while maintaining the user's communication style and preferences."""
+
 
-console = Console()
+def _stream_response(agent, task: str, context: str = None) -> str:
+    """Run a PersonaAgent task, showing the reply live as it streams in.
+    
+    Chunks are shown as plain text; the finished reply replaces them,
+    rendered by _render_response. Returns the finished reply.
+    """
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.text import Text
+    
+    # Chunks are appended in place; Live re-renders the panel on its own refresh
+    streamed = Text()
+    with Live(Panel(streamed, border_style="green"), console=console, refresh_per_second=12, transient=True):
+        response = agent.process_task_stream(task, context=context, on_token=streamed.append)
+    console.print(Panel(_render_response(response), border_style="green"))
+    return response
+
+
+def _report_io_error(future):
+    """Done-callback for chat's background writes: show a failure instead of dropping it."""
+    error = future.exception()
+    if error is not None:
+        console.print(f"[red]Background save failed: {error}[/red]")
 
 
 @click.group()
@@ -57,6 +134,10 @@ def cli():
 @click.option('--data-dir', default='./data', help='Data directory path')
 def init(user_id: str, data_dir: str):
     """Initialize MetaPersona identity and profile."""
+    from rich.panel import Panel
+    from rich.prompt import Prompt, Confirm
+    from src.identity import IdentityLayer
+    from src.cognitive_profile import CognitiveProfile, ProfileManager
     console.print("\n[bold cyan]🚀 Initializing MetaPersona...[/bold cyan]\n")
     
     # Create identity
@@ -75,32 +156,13 @@ def init(user_id: str, data_dir: str):
     profile = profile_manager.load_profile()
     
     if not profile:
-        profile = profile_manager.create_profile(user_id)
+        # Asked before the first save, so the new profile is written once
+        profile = CognitiveProfile(user_id=user_id)
         
         # Interactive profile setup
         console.print("\n[bold]Let's personalize your agent:[/bold]\n")
-        
-        # Writing style
-        tone = Prompt.ask("Writing tone", 
-                         choices=["formal", "casual", "technical", "friendly", "professional"],
-                         default="casual")
-        profile.writing_style.tone = tone
-        
-        vocab = Prompt.ask("Vocabulary level",
-                          choices=["simple", "intermediate", "advanced", "expert"],
-                          default="intermediate")
-        profile.writing_style.vocabulary_level = vocab
-        
-        # Decision style
-        decision_style = Prompt.ask("Decision-making approach",
-                                   choices=["analytical", "intuitive", "cautious", "bold", "balanced"],
-                                   default="analytical")
-        profile.decision_pattern.approach = decision_style
-        
-        risk = Prompt.ask("Risk tolerance",
-                         choices=["conservative", "moderate", "aggressive"],
-                         default="moderate")
-        profile.decision_pattern.risk_tolerance = risk
+        for label, choices, default, section, field in INIT_QUESTIONS:
+            setattr(getattr(profile, section), field, Prompt.ask(label, choices=list(choices), default=default))
         
         profile_manager.save_profile(profile)
         
@@ -122,6 +184,8 @@ def init(user_id: str, data_dir: str):
 @click.option('--data-dir', default='./data', help='Data directory path')
 def onboard(data_dir: str):
     """Complete onboarding to generate personalized expert personas."""
+    from src.onboarding import run_onboarding
+    from src.persona_factory import PersonaFactory
     data_path = Path(data_dir)
     
     # Run onboarding interview
@@ -150,6 +214,13 @@ def onboard(data_dir: str):
 @click.option('--use-experts', is_flag=True, help='Enable auto-generated expert personas')
 def chat(provider: str, data_dir: str, use_profile: bool, use_experts: bool):
     """Start interactive chat session with your agent (with optional expert routing)."""
+    from rich.panel import Panel
+    from rich.prompt import Prompt, Confirm
+    from src.persona_agent import AgentManager
+    from src.memory_loop import MemoryLoop
+    from src.cognitive_profile import ProfileManager
+    from src.user_profiling import UserProfilingSystem
+    from concurrent.futures import ThreadPoolExecutor
     console.print("\n[bold cyan]💬 MetaPersona Chat Session[/bold cyan]\n")
     
     # Initialize agent
@@ -158,6 +229,10 @@ def chat(provider: str, data_dir: str, use_profile: bool, use_experts: bool):
         if use_profile:
             use_experts = True
             
+        # Profiles loaded here are handed to the agent instead of being read twice
+        cognitive_profile = None
+        user_profile = None
+        
         # Check if adaptive profile is requested but doesn't exist - trigger onboarding
         if use_profile or use_experts:
             profile_manager = ProfileManager(data_dir)
@@ -186,7 +261,12 @@ def chat(provider: str, data_dir: str, use_profile: bool, use_experts: bool):
                         use_experts = False
         
         agent_manager = AgentManager(data_dir)
-        agent = agent_manager.initialize_agent(provider_name=provider, use_adaptive_profile=use_profile)
+        agent = agent_manager.initialize_agent(
+            provider_name=provider,
+            use_adaptive_profile=use_profile,
+            cognitive_profile=cognitive_profile,
+            user_profile=user_profile
+        )
         memory = MemoryLoop(data_dir)
         
         # Show profile information
@@ -212,80 +292,134 @@ def chat(provider: str, data_dir: str, use_profile: bool, use_experts: bool):
             console.print("[green]✓ Expert persona routing enabled[/green]")
             console.print("[dim]Questions will be automatically routed to the best expert persona[/dim]\n")
         
-        console.print("\n[dim]Type 'exit' to quit, 'clear' to clear history, 'status' for agent info, 'experts' to list experts[/dim]\n")
-        
-        while True:
+        console.print("\n[dim]Type 'exit' to quit, 'clear' to clear history, 'status' for agent info, 'experts' to list experts,\n"
+                      "'/feedback <turn> <score 1-5> [text]' to rate a reply[/dim]\n")
+        
+        # Agent state is saved every few turns, and always when the session ends
+        unsaved_turns = 0
+        # Disk writes run on one background thread (in submission order) so the
+        # next prompt doesn't wait on them; the pool is drained on exit, and a
+        # failed write is reported by _report_io_error
+        io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mp-io")
+        
+        def submit_io(fn, *args):
+            future = io_pool.submit(fn, *args)
+            future.add_done_callback(_report_io_error)
+            return future
+        
+        def record_turn(task: str, response: str) -> int:
+            # Runs on io_pool, the only writer, so the count is this turn's index
+            memory.record_interaction(task, response)
+            return memory.interaction_count - 1
+        
+        # Futures of each turn's memory index this session, and the scores given
+        # to them; accuracy is updated once from the scores when the session ends
+        turn_ids = []
+        session_scores = []
+        
+        def rate_turn(turn: int, score: int, feedback_text: str = "") -> bool:
+            # Waits for the interaction's own write; a turn that wasn't saved can't be rated
             try:
-                task = Prompt.ask("\n[bold cyan]You[/bold cyan]")
-                
-                if task.lower() == 'exit':
-                    break
-                elif task.lower() == 'clear':
-                    agent.clear_conversation()
-                    console.print("[yellow]Conversation history cleared[/yellow]")
-                    continue
-                elif task.lower() == 'status':
-                    show_status(agent)
-                    continue
-                elif task.lower() == 'experts' and question_router:
-                    personas = question_router.factory.list_personas()
-                    console.print("\n[bold]Your Expert Personas:[/bold]")
-                    for p in personas:
-                        console.print(f"  • [cyan]{p['name']}[/cyan] - {p['role']}")
-                        console.print(f"    Expertise: {', '.join(p['expertise_areas'][:3])}")
-                    console.print()
-                    continue
-                
-                # DIAGNOSTIC MODE: Print which handler/routing is triggered
-                diagnostic_keywords = ['run', 'execute', 'perform', 'task:', 'begin']
-                if any(kw in task.lower() for kw in diagnostic_keywords):
-                    console.print("[yellow][DIAGNOSTIC] Routing to task-execution pipeline (agent.process_task)")
-                    response = agent.process_task(task)
-                elif use_experts and question_router:
-                    console.print("[yellow][DIAGNOSTIC] Routing to expert persona via QuestionRouter")
-                    routing = question_router.route_question(task, agent.profile)
-                    if routing['expert_persona']:
-                        console.print(f"[dim]→ Routing to expert: {routing['expert_persona']['name']} (confidence: {routing['confidence']:.0%})[/dim]")
-                        expert_context = f"""You are {routing['expert_persona']['name']}, {routing['expert_persona']['role']}.
-Your expertise: {', '.join(routing['expert_persona']['expertise_areas'])}
-Respond as this expert while maintaining the user's communication style and preferences."""
-                        response = agent.process_task(task, context=expert_context)
+                index = turn_ids[turn - 1].result()
+            except Exception as e:
+                console.print(f"[red]Turn {turn} was not saved, so it can't be rated: {e}[/red]")
+                return False
+            submit_io(memory.add_feedback, index, score, feedback_text)
+            session_scores.append(score)
+            return True
+        
+        try:
+            while True:
+                try:
+                    task = Prompt.ask("\n[bold cyan]You[/bold cyan]")
+                    # Lower-case once for command and keyword checks; only short input can be a command
+                    task_lower = task.lower()
+                    command = task_lower.strip() if len(task) <= MAX_COMMAND_LENGTH else ""
+                    
+                    if command == 'exit':
+                        if turn_ids and Confirm.ask("\n[dim]Rate any turns?[/dim]", default=False):
+                            # click validates the ranges and re-asks on bad input
+                            while True:
+                                turn = click.prompt(f"Turn to rate (1-{len(turn_ids)}, 0 to finish)",
+                                                    type=click.IntRange(0, len(turn_ids)), default=0)
+                                if not turn:
+                                    break
+                                score = click.prompt("Rate response (1-5)", type=click.IntRange(1, 5), default=3)
+                                feedback_text = click.prompt("Feedback (optional)", default="", show_default=False)
+                                rate_turn(turn, score, feedback_text)
+                        break
+                    elif command == 'clear':
+                        agent.clear_conversation()
+                        console.print("[yellow]Conversation history cleared[/yellow]")
+                        continue
+                    elif command == 'status':
+                        show_status(agent)
+                        continue
+                    elif command == 'experts' and question_router:
+                        personas = question_router.factory.list_personas()
+                        console.print("\n[bold]Your Expert Personas:[/bold]")
+                        for p in personas:
+                            console.print(f"  • [cyan]{p['name']}[/cyan] - {p['role']}")
+                            console.print(f"    Expertise: {', '.join(p['expertise_areas'][:3])}")
+                        console.print()
+                        continue
+                    elif task_lower.startswith('/feedback'):
+                        parts = task.split(maxsplit=3)
+                        try:
+                            turn, score = int(parts[1]), int(parts[2])
+                        except (IndexError, ValueError):
+                            turn, score = 0, 0
+                        if not (1 <= turn <= len(turn_ids) and 1 <= score <= 5):
+                            console.print(f"[yellow]Usage: /feedback <turn 1-{len(turn_ids)}> <score 1-5> [text][/yellow]")
+                        elif rate_turn(turn, score, parts[3] if len(parts) > 3 else ""):
+                            console.print(f"[green]✓ Feedback recorded for turn {turn}[/green]")
+                        continue
+                    
+                    # DIAGNOSTIC MODE: Print which handler/routing is triggered
+                    expert_context = None
+                    if any(kw in task_lower for kw in DIAGNOSTIC_KEYWORDS):
+                        console.print("[yellow][DIAGNOSTIC] Routing to task-execution pipeline (agent.process_task)")
+                    elif use_experts and question_router:
+                        console.print("[yellow][DIAGNOSTIC] Routing to expert persona via QuestionRouter")
+                        routing = question_router.route_question(task, agent.profile)
+                        if routing['expert_persona']:
+                            console.print(f"[dim]→ Routing to expert: {routing['expert_persona']['name']} (confidence: {routing['confidence']:.0%})[/dim]")
+                            persona = routing['expert_persona']
+                            expert_context = _expert_context(persona['name'], persona['role'], tuple(persona['expertise_areas']))
                     else:
-                        response = agent.process_task(task)
-                else:
-                    console.print("[yellow][DIAGNOSTIC] Routing to main agent (default)")
-                    response = agent.process_task(task)
-                
-                # Display response
-                console.print(f"\n[bold green]Agent[/bold green]")
-                console.print(Panel(Markdown(response), border_style="green"))
-                
-                # Record interaction
-                interaction = memory.record_interaction(task, response)
-                agent.profile.interaction_count += 1
-                
-                # Optional feedback
-                if Confirm.ask("\n[dim]Provide feedback?[/dim]", default=False):
-                    score = float(Prompt.ask("Rate response (1-5)", default="3"))
-                    feedback_text = Prompt.ask("Feedback (optional)", default="")
+                        console.print("[yellow][DIAGNOSTIC] Routing to main agent (default)")
                     
-                    interactions = memory.load_all_interactions()
-                    memory.add_feedback(len(interactions) - 1, score, feedback_text)
-                    agent.profile.feedback_received += 1
+                    # Display response as it streams in
+                    console.print(f"\n[bold green]Agent[/bold green]")
+                    response = _stream_response(agent, task, expert_context)
                     
-                    # Update accuracy
-                    agent.profile.accuracy_score = (
-                        (agent.profile.accuracy_score * (agent.profile.feedback_received - 1) + score / 5.0)
-                        / agent.profile.feedback_received
-                    )
-                
-                # Save state
+                    # Record interaction
+                    turn_ids.append(submit_io(record_turn, task, response))
+                    agent.profile.interaction_count += 1
+                    console.print(f"[dim]Turn {len(turn_ids)}[/dim]")
+                    
+                    # Save state
+                    unsaved_turns += 1
+                    if unsaved_turns >= SAVE_EVERY_TURNS:
+                        submit_io(agent_manager.save_agent_state, agent)
+                        unsaved_turns = 0
+                    
+                except KeyboardInterrupt:
+                    console.print("\n[yellow]Use 'exit' to quit[/yellow]")
+                except Exception as e:
+                    console.print(f"[red]Error: {str(e)}[/red]")
+            
+        finally:
+            io_pool.shutdown(wait=True)
+            if session_scores:
+                # Fold the session's ratings into the running accuracy mean
+                profile = agent.profile
+                for score in session_scores:
+                    profile.feedback_received += 1
+                    profile.accuracy_score += (score / 5.0 - profile.accuracy_score) / profile.feedback_received
+                unsaved_turns += 1
+            if unsaved_turns:
                 agent_manager.save_agent_state(agent)
-                
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Use 'exit' to quit[/yellow]")
-            except Exception as e:
-                console.print(f"[red]Error: {str(e)}[/red]")
         
         console.print("\n[cyan]Chat session ended.[/cyan]\n")
         
@@ -300,15 +434,15 @@ Respond as this expert while maintaining the user's communication style and pref
 @click.option('--data-dir', default='./data', help='Data directory path')
 def ask(task: str, provider: str, data_dir: str):
     """Ask your agent to perform a single task."""
+    from src.persona_agent import AgentManager
+    from src.memory_loop import MemoryLoop
     try:
         agent_manager = AgentManager(data_dir)
         agent = agent_manager.initialize_agent(provider_name=provider)
         memory = MemoryLoop(data_dir)
         
-        response = agent.process_task(task)
-        
         console.print(f"\n[bold green]Response:[/bold green]")
-        console.print(Panel(Markdown(response), border_style="green"))
+        response = _stream_response(agent, task)
         
         # Record interaction
         memory.record_interaction(task, response)
@@ -323,6 +457,9 @@ def ask(task: str, provider: str, data_dir: str):
 @click.option('--data-dir', default='./data', help='Data directory path')
 def status(data_dir: str):
     """Show agent status and learning progress."""
+    from rich.table import Table
+    from src.memory_loop import MemoryLoop
+    from src.cognitive_profile import ProfileManager
     try:
         profile_manager = ProfileManager(data_dir)
         profile = profile_manager.load_profile()
@@ -376,6 +513,7 @@ def status(data_dir: str):
 
 def show_status(agent):
     """Display agent status in chat."""
+    from rich.table import Table
     status = agent.get_agent_status()
     
     table = Table(show_header=False)
@@ -393,10 +531,8 @@ def show_status(agent):
 @click.option('--data-dir', default='./data', help='Data directory path')
 def learn(example_file: str, data_dir: str):
     """Add writing examples to improve agent's style."""
+    from src.cognitive_profile import ProfileManager
     try:
-        with open(example_file, 'r', encoding='utf-8') as f:
-            example_text = f.read()
-        
         profile_manager = ProfileManager(data_dir)
         profile = profile_manager.load_profile()
         
@@ -404,8 +540,13 @@ def learn(example_file: str, data_dir: str):
             console.print("[yellow]No profile found. Run 'metapersona init' first.[/yellow]")
             return
         
-        profile_manager.update_writing_style(profile, example_text)
-        console.print(f"[green]✓ Added writing example ({len(example_text)} chars)[/green]")
+        # The example is stored whole in the profile, so it is read in full,
+        # but only once we know there is a profile to add it to
+        example_text = Path(example_file).read_text(encoding='utf-8')
+        if profile_manager.update_writing_style(profile, example_text):
+            console.print(f"[green]✓ Added writing example ({len(example_text)} chars)[/green]")
+        else:
+            console.print("[yellow]This example is already in your profile.[/yellow]")
         
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
@@ -416,6 +557,8 @@ def learn(example_file: str, data_dir: str):
 @click.option('--count', default=10, help='Number of recent interactions to show')
 def history(data_dir: str, count: int):
     """View interaction history."""
+    from rich.markup import escape
+    from src.memory_loop import MemoryLoop
     try:
         memory = MemoryLoop(data_dir)
         interactions = memory.get_recent_interactions(count)
@@ -424,32 +567,43 @@ def history(data_dir: str, count: int):
             console.print("[yellow]No interactions recorded yet.[/yellow]")
             return
         
-        console.print(f"\n[bold]Recent Interactions ({len(interactions)}):[/bold]\n")
+        def preview(text: str) -> str:
+            return escape(text[:100]) + ("..." if len(text) > 100 else "")
         
-        for i, interaction in enumerate(interactions[-count:], 1):
+        # Render everything (heading included) in one print; user text is
+        # escaped so it can't break the markup of the combined block
+        lines = [f"\n[bold]Recent Interactions ({len(interactions)}):[/bold]\n"]
+        for i, interaction in enumerate(interactions, 1):
             score_text = f"⭐ {interaction.feedback_score:.1f}/5" if interaction.feedback_score else "No feedback"
             
-            console.print(f"[bold cyan]{i}. {interaction.timestamp}[/bold cyan] {score_text}")
-            console.print(f"[dim]Task:[/dim] {interaction.task[:100]}...")
-            console.print(f"[dim]Response:[/dim] {interaction.response[:100]}...")
-            console.print()
+            lines.append(f"[bold cyan]{i}. {interaction.timestamp}[/bold cyan] {score_text}")
+            lines.append(f"[dim]Task:[/dim] {preview(interaction.task)}")
+            lines.append(f"[dim]Response:[/dim] {preview(interaction.response)}")
+            lines.append("")
+        console.print("\n".join(lines))
         
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
 
 
+@lru_cache(maxsize=1)
+def _builtin_skills():
+    """SkillManager with the built-in skills registered, built once per process."""
+    from src.skills import SkillManager
+    from src.skills.builtin import CalculatorSkill, FileOpsSkill, WebSearchSkill, TimezoneSkill, FlightSkill
+    
+    skill_manager = SkillManager()
+    for skill_class in (CalculatorSkill, FileOpsSkill, WebSearchSkill, TimezoneSkill, FlightSkill):
+        skill_manager.registry.register(skill_class())
+    return skill_manager
+
+
 @cli.command()
 @click.option('--data-dir', default='./data', help='Data directory path')
 def skills(data_dir: str):
     """List available skills."""
     try:
-        # Initialize skill manager and load built-in skills
-        skill_manager = SkillManager()
-        skill_manager.registry.register(CalculatorSkill())
-        skill_manager.registry.register(FileOpsSkill())
-        skill_manager.registry.register(WebSearchSkill())
-        skill_manager.registry.register(TimezoneSkill())
-        skill_manager.registry.register(FlightSkill())
+        skill_manager = _builtin_skills()
         
         skills_list = skill_manager.list_available_skills()
         
@@ -483,13 +637,7 @@ def skills(data_dir: str):
 def skill_info(skill_name: str, data_dir: str):
     """Get detailed information about a skill."""
     try:
-        # Initialize skill manager and load built-in skills
-        skill_manager = SkillManager()
-        skill_manager.registry.register(CalculatorSkill())
-        skill_manager.registry.register(FileOpsSkill())
-        skill_manager.registry.register(WebSearchSkill())
-        skill_manager.registry.register(TimezoneSkill())
-        skill_manager.registry.register(FlightSkill())
+        skill_manager = _builtin_skills()
         
         info = skill_manager.get_skill_info(skill_name)
         
@@ -524,20 +672,15 @@ def skill_info(skill_name: str, data_dir: str):
 @click.option('--params', '-p', multiple=True, help='Skill parameters as key=value')
 def use_skill(skill_name: str, data_dir: str, params):
     """Execute a skill directly."""
+    from rich.panel import Panel
     try:
-        # Initialize skill manager and load built-in skills
-        skill_manager = SkillManager()
-        skill_manager.registry.register(CalculatorSkill())
-        skill_manager.registry.register(FileOpsSkill())
-        skill_manager.registry.register(WebSearchSkill())
-        skill_manager.registry.register(TimezoneSkill())
-        skill_manager.registry.register(FlightSkill())
+        skill_manager = _builtin_skills()
         
         # Parse parameters
         parameters = {}
         for param in params:
-            if '=' in param:
-                key, value = param.split('=', 1)
+            key, sep, value = param.partition('=')
+            if sep:
                 parameters[key.strip()] = value.strip()
         
         # Execute skill
@@ -559,40 +702,45 @@ def use_skill(skill_name: str, data_dir: str, params):
         console.print(f"[red]Error: {str(e)}[/red]")
 
 
+@lru_cache(maxsize=4)
+def _registry(data_dir: str):
+    """Agent registry for data_dir, built once per process (from its saved snapshot if any)."""
+    from src.agent_registry import AgentRegistry
+    
+    snapshot = Path(data_dir) / REGISTRY_SNAPSHOT
+    return AgentRegistry.load(snapshot) if snapshot.exists() else AgentRegistry()
+
+
 @cli.command("agents-list")
 @click.option('--data-dir', default='./data', help='Data directory path')
 def agents_list(data_dir: str):
     """List all registered agents."""
+    from rich.table import Table
     try:
-        from src.agent_registry import AgentRegistry
         
-        registry = AgentRegistry(Path(data_dir))
-        agents = registry.list_all()
+        statuses = _registry(data_dir).status_snapshot()
         
-        if not agents:
+        if not statuses:
             console.print("[yellow]No agents registered yet.[/yellow]")
             console.print("\n[dim]Tip: Agents are registered when you use multi-agent features.[/dim]")
             return
         
         table = Table(title="Registered Agents")
         table.add_column("Agent ID", style="cyan")
-        table.add_column("Role", style="green")
-        table.add_column("Description", style="white")
-        table.add_column("Capabilities", style="yellow")
-        table.add_column("Interactions", style="magenta")
+        table.add_column("Mode", style="green")
+        table.add_column("Mode Changes", style="yellow")
+        table.add_column("Recent Messages", style="magenta")
         
-        for agent in agents:
+        for status in statuses:
             table.add_row(
-                agent.agent_id,
-                agent.role,
-                agent.description[:50] + "..." if len(agent.description) > 50 else agent.description,
-                str(len(agent.capabilities)),
-                str(len(agent.memory.interactions))
+                status['agent_id'],
+                status['mode'],
+                str(status['mode_changes']),
+                str(status['recent_messages'])
             )
         
         console.print(table)
-        console.print(f"\n[bold]Total Agents:[/bold] {len(agents)}")
-        console.print(f"[bold]Roles:[/bold] {', '.join(registry.list_roles())}")
+        console.print(f"\n[bold]Total Agents:[/bold] {len(statuses)}")
         
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
@@ -603,10 +751,11 @@ def agents_list(data_dir: str):
 @click.option('--agent-id', help='Specific agent ID to show detailed status')
 def agents_status(data_dir: str, agent_id: str):
     """Show detailed status of agents."""
+    from rich.panel import Panel
+    from rich.table import Table
     try:
-        from src.agent_registry import AgentRegistry
         
-        registry = AgentRegistry(Path(data_dir))
+        registry = _registry(data_dir)
         
         if agent_id:
             # Show specific agent
@@ -615,50 +764,45 @@ def agents_status(data_dir: str, agent_id: str):
                 console.print(f"[red]Agent '{agent_id}' not found.[/red]")
                 return
             
-            status = agent.get_status()
-            
+            mode_log = agent.get_mode_log()
             console.print(Panel(
-                f"[bold]Agent ID:[/bold] {status['agent_id']}\n"
-                f"[bold]Role:[/bold] {status['role']}\n"
-                f"[bold]Description:[/bold] {status['description']}\n"
-                f"[bold]Skills:[/bold] {status['skills_count']}\n"
-                f"[bold]Interactions:[/bold] {status['interactions_count']}\n"
-                f"[bold]Learnings:[/bold] {status['learnings_count']}\n"
-                f"[bold]Created:[/bold] {status['created_at']}\n"
-                f"[bold]Updated:[/bold] {status['updated_at']}",
+                f"[bold]Agent ID:[/bold] {agent_id}\n"
+                f"[bold]Mode:[/bold] {agent.get_mode()}\n"
+                f"[bold]Mode Changes:[/bold] {len(mode_log)}\n"
+                f"[bold]Recent Messages:[/bold] {len(agent.memory.user_messages)}",
                 title=f"Agent Status: {agent_id}",
                 border_style="cyan"
             ))
             
-            # Show capabilities
-            console.print("\n[bold]Capabilities:[/bold]")
-            for cap in status['capabilities']:
-                console.print(f"  • {cap['name']}: {cap['description']} (confidence: {cap['confidence']})")
+            # Show mode transitions
+            if mode_log:
+                console.print("\n".join(
+                    ["\n[bold]Mode Transitions:[/bold]"] +
+                    [f"  • {entry['prev_mode']} → {entry['new_mode']}: {entry['reason']}" for entry in mode_log]
+                ))
         else:
             # Show registry status
-            status = registry.get_status()
+            statuses = registry.status_snapshot()
             console.print(Panel(
-                f"[bold]Total Agents:[/bold] {status['total_agents']}\n"
-                f"[bold]Roles:[/bold] {', '.join(status['roles']) if status['roles'] else 'None'}",
+                f"[bold]Total Agents:[/bold] {len(statuses)}\n"
+                f"[bold]Modes:[/bold] {', '.join(sorted({s['mode'] for s in statuses})) or 'None'}",
                 title="Agent Registry Status",
                 border_style="cyan"
             ))
             
-            if status['agents']:
+            if statuses:
                 table = Table(title="Agents Overview")
                 table.add_column("Agent ID", style="cyan")
-                table.add_column("Role", style="green")
-                table.add_column("Capabilities", style="yellow")
-                table.add_column("Skills", style="blue")
-                table.add_column("Interactions", style="magenta")
+                table.add_column("Mode", style="green")
+                table.add_column("Mode Changes", style="yellow")
+                table.add_column("Recent Messages", style="magenta")
                 
-                for agent_info in status['agents']:
+                for status in statuses:
                     table.add_row(
-                        agent_info['agent_id'],
-                        agent_info['role'],
-                        str(agent_info['capabilities_count']),
-                        str(agent_info['skills_count']),
-                        str(agent_info['interactions_count'])
+                        status['agent_id'],
+                        status['mode'],
+                        str(status['mode_changes']),
+                        str(status['recent_messages'])
                     )
                 
                 console.print(table)
@@ -667,71 +811,72 @@ def agents_status(data_dir: str, agent_id: str):
         console.print(f"[red]Error: {str(e)}[/red]")
 
 
+def _register_missing_agents(registry, specs):
+    """Register each (agent_id[, announcement]) spec missing from registry.
+    
+    The registry builds the agent for each id; the announcement, if given, is
+    printed when an agent is added.
+    """
+    for agent_id, *announcement in specs:
+        if agent_id not in registry:
+            registry.register(agent_id)
+            if announcement:
+                console.print(f"  ✓ {announcement[0]}")
+
+
+def _register_persona_agents(registry, cognitive_profile, specs):
+    """Register each (agent_id, announcement) spec with a persona built from cognitive_profile.
+    
+    Agents already in the registry are rebuilt in their current mode, since
+    snapshots don't keep persona context. Each agent gets its own
+    PersonaContext, so their styles can evolve separately.
+    """
+    from src.persona_context import PersonaContext
+    writing_style = cognitive_profile.writing_style
+    for agent_id, announcement in specs:
+        existing = registry.get(agent_id)
+        registry.register(
+            agent_id,
+            initial_mode=existing.get_mode() if existing else 'greeting',
+            persona_context=PersonaContext(
+                voice_style=writing_style.tone,
+                signature_phrasing=list(writing_style.common_phrases),
+            ),
+        )
+        console.print(f"  ✓ {announcement}")
+
+
+def _ensure_specialized_agents(registry):
+    """Register the researcher/coder/writer/generalist agents that are missing."""
+    _register_missing_agents(registry, (("researcher",), ("coder",), ("writer",), ("generalist",)))
+
+
 @cli.command("route-task")
 @click.argument('task')
 @click.option('--data-dir', default='./data', help='Data directory path')
 @click.option('--explain', is_flag=True, help='Explain routing decision without executing')
 def route_task(task: str, data_dir: str, explain: bool):
     """Route a task to the best agent (or explain the routing)."""
+    from rich.panel import Panel
+    from rich.table import Table
     try:
-        from src.agent_registry import AgentRegistry
         from src.task_router import TaskRouter
         from src.llm_provider import get_llm_provider
-        from src.specialized_agents import ResearchAgent, CodeAgent, WriterAgent, GeneralistAgent
-        from src.skills import SkillManager
         
         # Initialize registry and router
-        registry = AgentRegistry(Path(data_dir))
+        registry = _registry(data_dir)
+        
+        # Explaining only scores the agents' capabilities, so it needs no LLM
+        llm_provider = None if explain else get_llm_provider()
         
         # Register specialized agents if not already registered
-        llm_provider = get_llm_provider()
-        skills_manager = SkillManager()
-        
-        if "researcher" not in registry:
-            research_agent = ResearchAgent(
-                agent_id="researcher",
-                role="researcher",
-                description="Specialized in research, information gathering, and analysis",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(research_agent)
-        
-        if "coder" not in registry:
-            code_agent = CodeAgent(
-                agent_id="coder",
-                role="coder",
-                description="Specialized in coding, debugging, and technical tasks",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(code_agent)
-        
-        if "writer" not in registry:
-            writer_agent = WriterAgent(
-                agent_id="writer",
-                role="writer",
-                description="Specialized in writing, content creation, and communication",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(writer_agent)
-        
-        if "generalist" not in registry:
-            generalist_agent = GeneralistAgent(
-                agent_id="generalist",
-                role="generalist",
-                description="Handles general tasks and conversations",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(generalist_agent)
+        _ensure_specialized_agents(registry)
         
         router = TaskRouter(
             registry, 
             default_agent_id="generalist",
             llm_provider=llm_provider,
-            use_llm_routing=True
+            use_llm_routing=not explain
         )
         
         if explain:
@@ -791,15 +936,13 @@ def route_task(task: str, data_dir: str, explain: bool):
 @click.option('--data-dir', default='./data', help='Data directory path')
 def multi_agent_chat(data_dir: str):
     """Interactive chat with automatic agent routing."""
+    from rich.markup import escape
+    from rich.panel import Panel
     try:
-        from src.agent_registry import AgentRegistry
         from src.task_router import TaskRouter
         from src.llm_provider import get_llm_provider
-        from src.specialized_agents import ResearchAgent, CodeAgent, WriterAgent, GeneralistAgent
-        from src.skills import SkillManager
         from prompt_toolkit import PromptSession
         from prompt_toolkit.history import InMemoryHistory
-        import asyncio
         
         console.print(Panel(
             "[bold cyan]Multi-Agent Chat[/bold cyan]\n\n"
@@ -809,46 +952,11 @@ def multi_agent_chat(data_dir: str):
         ))
         
         # Initialize registry and router
-        registry = AgentRegistry(Path(data_dir))
+        registry = _registry(data_dir)
         llm_provider = get_llm_provider()
-        skills_manager = SkillManager()
         
         # Register specialized agents
-        if "researcher" not in registry:
-            registry.register(ResearchAgent(
-                agent_id="researcher",
-                role="researcher",
-                description="Specialized in research and information gathering",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            ))
-        
-        if "coder" not in registry:
-            registry.register(CodeAgent(
-                agent_id="coder",
-                role="coder",
-                description="Specialized in coding and technical tasks",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            ))
-        
-        if "writer" not in registry:
-            registry.register(WriterAgent(
-                agent_id="writer",
-                role="writer",
-                description="Specialized in writing and content creation",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            ))
-        
-        if "generalist" not in registry:
-            registry.register(GeneralistAgent(
-                agent_id="generalist",
-                role="generalist",
-                description="Handles general tasks",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            ))
+        _ensure_specialized_agents(registry)
         
         router = TaskRouter(
             registry, 
@@ -875,7 +983,7 @@ def multi_agent_chat(data_dir: str):
                     agents = registry.list_all()
                     console.print(f"\n[bold]Registered Agents:[/bold]")
                     for agent in agents:
-                        console.print(f"  • {agent.agent_id} ({agent.role})")
+                        console.print(f"  • {agent.agent_id} ({agent.get_mode()})")
                     continue
                 
                 if user_input.lower() == 'stats':
@@ -900,7 +1008,7 @@ def multi_agent_chat(data_dir: str):
                 result = agent.handle_task(user_input)
                 
                 if result.success:
-                    console.print(f"\n[{agent.role}] {result.result}")
+                    console.print(f"\n[bold]{agent.agent_id}:[/bold] {escape(str(result.result))}")
                 else:
                     console.print(f"[red]Error: {result.error}[/red]")
                 
@@ -920,6 +1028,9 @@ def multi_agent_chat(data_dir: str):
 @click.option('--data-dir', default='./data', help='Data directory path')
 def onboard(user_id: str, data_dir: str):
     """Complete onboarding to personalize your experience."""
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+    from src.user_profiling import UserProfilingSystem
     try:
         profiling_system = UserProfilingSystem(data_dir)
         
@@ -982,6 +1093,8 @@ def onboard(user_id: str, data_dir: str):
 @click.option('--data-dir', default='./data', help='Data directory path')
 def show_profile(user_id: str, data_dir: str):
     """View your user profile and adaptive settings."""
+    from rich.panel import Panel
+    from src.user_profiling import UserProfilingSystem
     try:
         profiling_system = UserProfilingSystem(data_dir)
         profile = profiling_system.load_profile(user_id)
@@ -1030,17 +1143,194 @@ def show_profile(user_id: str, data_dir: str):
         console.print(f"[red]Error loading profile: {str(e)}[/red]")
 
 
+def _prefilter_agent(registry, task):
+    """Agent that an unmistakable task opening routes to, or None to route normally."""
+    from src.routable_agent import routable
+    match = _ROUTE_PREFILTER.match(task)
+    return routable(registry.get(match.lastgroup)) if match else None
+
+
+def _print_agents(title, agents, routing_preferences):
+    """List agents with their mode and routing weight (chat 'agents' command)."""
+    lines = [f"\n[bold]{title}:[/bold]"]
+    lines += [
+        f"  • {agent.agent_id} ({agent.get_mode()}) - Weight: {routing_preferences.get(agent.agent_id, 1.0):.2f}x"
+        for agent in agents
+    ]
+    console.print("\n".join(lines))
+
+
+def _print_routing_stats(router, *extra_lines):
+    """Show the router's routing statistics, then any extra_lines (chat 'stats' command)."""
+    stats = router.get_routing_stats()
+    lines = [
+        "\n[bold]Routing Statistics:[/bold]",
+        f"  Total routes: {stats['total_routes']}",
+        f"  Average confidence: {stats['average_confidence']:.2f}",
+        f"  Most used: {stats['most_used_agent']}",
+        "\n[bold]Agent usage:[/bold]",
+    ]
+    lines += [f"  • {agent_id}: {count}" for agent_id, count in stats['agent_usage'].items()]
+    lines += extra_lines
+    console.print("\n".join(lines))
+
+
+def _print_profile(profile):
+    """Show the profile the agents adapt to (chat 'profile' command)."""
+    console.print(
+        f"\n[bold]Your Profile:[/bold]\n"
+        f"  Profession: {profile.profession}\n"
+        f"  Skill Packs: {', '.join(profile.loaded_skill_packs)}\n"
+        f"  Communication: {profile.preferred_communication_style}"
+    )
+
+
+def _print_cognitive_profile(profile):
+    """Show the cognitive profile the agents act in (persona-chat 'profile' command)."""
+    console.print(
+        f"\n[bold]Your Cognitive Profile:[/bold]\n"
+        f"  User: {profile.user_id}\n"
+        f"  Writing Tone: {profile.writing_style.tone}\n"
+        f"  Interactions: {profile.interaction_count}"
+    )
+
+
+async def _stream_agent_reply(agent, task, context):
+    """Run an agent's task, showing its reply in a live panel as chunks arrive."""
+    import asyncio
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.text import Text
+    from src.routable_agent import routable
+    
+    # Registry agents (SingleUseAgents) stream through their routable adapter
+    agent = routable(agent)
+    console.print(f"\n[bold green]{agent.agent_id.title()}:[/bold green]")
+    # Chunks are appended in place; Live re-renders the panel on its own refresh
+    streamed = Text()
+    with Live(Panel(streamed, border_style="green"), console=console, refresh_per_second=20, transient=True):
+        result = await asyncio.to_thread(agent.handle_task_stream, task, context, streamed.append)
+    
+    if result.success:
+        # The final result can differ from the stream (e.g. a skill replaced it)
+        console.print(Panel(_render_response(str(result.result)), border_style="green"))
+    else:
+        console.print(f"[red]Error: {result.error}[/red]")
+    return result
+
+
+async def _adaptive_chat_loop(session, registry, router, profile, adaptive_prompt):
+    """Read-route-respond loop for adaptive-chat."""
+    import asyncio
+    from prompt_toolkit.patch_stdout import patch_stdout
+    from src.routable_agent import routable
+    
+    # Agents and their profile weights don't change during the session
+    agents = tuple(routable(agent) for agent in registry.list_all())
+    weights = [profile.agent_routing_preferences.get(agent.agent_id, 1.0) for agent in agents]
+    min_confidence = router.min_confidence
+    default_agent = next((agent for agent in agents if agent.agent_id == router.default_agent_id), None)
+    # The profile doesn't change during the session, so every turn shares one context
+    context = {
+        "user_profile": profile.model_dump(include=ADAPTIVE_CONTEXT_FIELDS),
+        "adaptive_prompt": adaptive_prompt
+    }
+    # Base scores per normalized input (least recently used first), so a
+    # repeated turn doesn't re-score every agent
+    score_cache = OrderedDict()
+    score_hits = score_misses = 0
+    
+    def show_stats():
+        _print_routing_stats(router, f"\n[bold]Score cache:[/bold] {score_hits} hits, {score_misses} misses")
+    
+    async def pick_agent(command, user_input):
+        """Best (agent, confidence) for the input, or None if no agent is confident enough."""
+        nonlocal score_hits, score_misses
+        agent = _prefilter_agent(registry, user_input)
+        if agent:
+            return agent, PREFILTER_CONFIDENCE
+        
+        # Route with profile-based weight adjustments, scoring all agents concurrently
+        score_key = " ".join(command.split())
+        base_confidences = score_cache.get(score_key)
+        if base_confidences is None:
+            score_misses += 1
+            base_confidences = await asyncio.gather(*(agent.acan_handle_task(user_input) for agent in agents))
+            score_cache[score_key] = base_confidences
+            if len(score_cache) > SCORE_CACHE_SIZE:
+                score_cache.popitem(last=False)
+        else:
+            score_hits += 1
+            score_cache.move_to_end(score_key)
+        if not agents:
+            return None
+        # Only the top agent is needed, so no sort
+        agent, confidence = max(
+            ((agent, min(1.0, base_confidence * weight))
+             for agent, weight, base_confidence in zip(agents, weights, base_confidences)),
+            key=itemgetter(1)
+        )
+        if confidence < min_confidence:
+            # Like TaskRouter.route_task: fall back to the default agent, if any
+            return (default_agent, confidence) if default_agent else None
+        return agent, confidence
+    
+    # REPL commands other than 'exit', by lower-cased input
+    commands = {
+        "agents": lambda: _print_agents("Your Adaptive Agents", agents, profile.agent_routing_preferences),
+        "stats": show_stats,
+        "profile": lambda: _print_profile(profile),
+    }
+    
+    while True:
+        try:
+            with patch_stdout():
+                user_input = await session.prompt_async(f"\n[{profile.user_id}] > ")
+
+            command = user_input.strip().lower()
+            if not command:
+                continue
+
+            if command == 'exit':
+                console.print("[yellow]Goodbye![/yellow]")
+                break
+
+            handler = commands.get(command)
+            if handler:
+                handler()
+                continue
+
+            picked = await pick_agent(command, user_input)
+            if not picked:
+                console.print("[red]No suitable agent found.[/red]")
+                continue
+            agent, confidence = picked
+
+            console.print(f"[dim]→ Routing to {agent.agent_id} (confidence: {confidence:.2f})[/dim]")
+
+            await _stream_agent_reply(agent, user_input, context)
+
+            # Record routing for stats
+            router._record_routing(user_input, agent, confidence, [])
+
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Use 'exit' to quit.[/yellow]")
+        except EOFError:
+            break
+
+
 @cli.command('adaptive-chat')
 @click.option('--user-id', prompt='User ID', help='User identifier')
 @click.option('--provider', default='ollama', help='LLM provider')
 @click.option('--data-dir', default='./data', help='Data directory path')
 def adaptive_chat(user_id: str, provider: str, data_dir: str):
     """Chat with agents adapted to YOUR profile and needs."""
-    from src.agent_registry import AgentRegistry
+    from src.user_profiling import UserProfilingSystem
     from src.task_router import TaskRouter
     from src.llm_provider import get_llm_provider
+    import asyncio
     from prompt_toolkit import PromptSession
-    from prompt_toolkit.history import InMemoryHistory
+    from prompt_toolkit.history import FileHistory
     
     try:
         # Load user profile
@@ -1058,60 +1348,20 @@ def adaptive_chat(user_id: str, provider: str, data_dir: str):
         
         # Initialize components
         llm_provider = get_llm_provider(provider)
-        skills_manager = SkillManager()
-        registry = AgentRegistry(data_dir)
+        registry = _registry(data_dir)
         
         # Get adaptive system prompt
         adaptive_prompt = profiling_system.get_adaptive_system_prompt(profile)
         
         # Register specialized agents (generic versions)
-        from src.specialized_agents import ResearchAgent, CodeAgent, WriterAgent, GeneralistAgent
-        
         console.print("[cyan]Initializing adaptive agents...[/cyan]")
         
-        if "researcher" not in registry:
-            researcher = ResearchAgent(
-                agent_id="researcher",
-                role="researcher",
-                description=f"Research specialist adapted for {profile.profession}",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(researcher)
-            console.print("  ✓ Research Agent (adapted for your needs)")
-        
-        if "coder" not in registry:
-            coder = CodeAgent(
-                agent_id="coder",
-                role="coder",
-                description=f"Coding specialist adapted for {profile.technical_level} level",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(coder)
-            console.print("  ✓ Code Agent (adapted for your technical level)")
-        
-        if "writer" not in registry:
-            writer = WriterAgent(
-                agent_id="writer",
-                role="writer",
-                description=f"Writing specialist using {profile.preferred_communication_style} style",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(writer)
-            console.print("  ✓ Writer Agent (adapted for your communication style)")
-        
-        if "generalist" not in registry:
-            generalist = GeneralistAgent(
-                agent_id="generalist",
-                role="generalist",
-                description=f"General assistant for {profile.user_id}",
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(generalist)
-            console.print("  ✓ Generalist Agent (your default helper)")
+        _register_missing_agents(registry, (
+            ("researcher", "Research Agent (adapted for your needs)"),
+            ("coder", "Code Agent (adapted for your technical level)"),
+            ("writer", "Writer Agent (adapted for your communication style)"),
+            ("generalist", "Generalist Agent (your default helper)"),
+        ))
         
         # Create router with profile-based weights
         router = TaskRouter(
@@ -1127,86 +1377,9 @@ def adaptive_chat(user_id: str, provider: str, data_dir: str):
         console.print(f"[dim]Routing optimized for: {profile.profession}[/dim]\n")
         console.print("[dim]Commands: 'exit', 'agents', 'stats', 'profile'[/dim]\n")
         
-        # Interactive loop
-        session = PromptSession(history=InMemoryHistory())
-        
-        while True:
-            try:
-                user_input = session.prompt(f"\n[{profile.user_id}] > ")
-                
-                if not user_input.strip():
-                    continue
-                
-                if user_input.lower() == 'exit':
-                    console.print("[yellow]Goodbye![/yellow]")
-                    break
-                
-                if user_input.lower() == 'agents':
-                    agents = registry.list_all()
-                    console.print(f"\n[bold]Your Adaptive Agents:[/bold]")
-                    for agent in agents:
-                        weight = profile.agent_routing_preferences.get(agent.agent_id, 1.0)
-                        console.print(f"  • {agent.agent_id} ({agent.role}) - Weight: {weight:.2f}x")
-                    continue
-                
-                if user_input.lower() == 'stats':
-                    stats = router.get_routing_stats()
-                    console.print(f"\n[bold]Routing Statistics:[/bold]")
-                    console.print(f"  Total routes: {stats['total_routes']}")
-                    console.print(f"  Average confidence: {stats['average_confidence']:.2f}")
-                    console.print(f"  Most used: {stats['most_used_agent']}")
-                    console.print(f"\n[bold]Agent usage:[/bold]")
-                    for agent_id, count in stats['agent_usage'].items():
-                        console.print(f"  • {agent_id}: {count}")
-                    continue
-                
-                if user_input.lower() == 'profile':
-                    console.print(f"\n[bold]Your Profile:[/bold]")
-                    console.print(f"  Profession: {profile.profession}")
-                    console.print(f"  Skill Packs: {', '.join(profile.loaded_skill_packs)}")
-                    console.print(f"  Communication: {profile.preferred_communication_style}")
-                    continue
-                
-                # Route with profile-based weight adjustments
-                scored_agents = []
-                for agent in registry.list_all():
-                    base_confidence = agent.can_handle_task(user_input)
-                    weight = profile.agent_routing_preferences.get(agent.agent_id, 1.0)
-                    adjusted_confidence = min(1.0, base_confidence * weight)
-                    if adjusted_confidence >= router.min_confidence:
-                        scored_agents.append((agent, adjusted_confidence))
-                
-                if not scored_agents:
-                    console.print("[red]No suitable agent found.[/red]")
-                    continue
-                
-                # Select best agent
-                scored_agents.sort(key=lambda x: x[1], reverse=True)
-                agent, confidence = scored_agents[0]
-                
-                console.print(f"[dim]→ Routing to {agent.agent_id} (confidence: {confidence:.2f})[/dim]")
-                
-                # Add adaptive context to task
-                context = {
-                    "user_profile": profile.model_dump(),
-                    "adaptive_prompt": adaptive_prompt
-                }
-                
-                result = agent.handle_task(user_input, context)
-                
-                if result.success:
-                    console.print(f"\n[bold green]{agent.role.title()}:[/bold green]")
-                    console.print(Panel(result.result, border_style="green"))
-                else:
-                    console.print(f"[red]Error: {result.error}[/red]")
-                
-                # Record routing for stats
-                router._record_routing(user_input, agent, confidence, [])
-                
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Use 'exit' to quit.[/yellow]")
-            except EOFError:
-                break
+        # Interactive loop (async, so agents are scored and run off the event loop)
+        session = PromptSession(history=FileHistory(str(Path(data_dir) / f".history_{profile.user_id}")))
+        asyncio.run(_adaptive_chat_loop(session, registry, router, profile, adaptive_prompt))
         
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
@@ -1219,11 +1392,13 @@ def adaptive_chat(user_id: str, provider: str, data_dir: str):
 @click.option('--data-dir', default='./data', help='Data directory path')
 def persona_chat(provider: str, data_dir: str):
     """Interactive chat with YOUR personalized multi-agent system."""
-    from src.agent_registry import AgentRegistry
+    from src.persona_agent import AgentManager
+    from src.memory_loop import MemoryLoop
     from src.task_router import TaskRouter
     from src.llm_provider import get_llm_provider
+    import asyncio
     from prompt_toolkit import PromptSession
-    from prompt_toolkit.history import InMemoryHistory
+    from prompt_toolkit.history import FileHistory
     
     console.print("\n[bold cyan]🎭 Personalized Multi-Agent Chat[/bold cyan]\n")
     console.print("[dim]Your specialized agents, all acting in YOUR style[/dim]\n")
@@ -1236,60 +1411,18 @@ def persona_chat(provider: str, data_dir: str):
 
         # Initialize components
         llm_provider = get_llm_provider(provider)
-        skills_manager = SkillManager()
-        registry = AgentRegistry(data_dir)
+        registry = _registry(data_dir)
         memory = MemoryLoop(data_dir)
 
         # Register YOUR personalized agents
         console.print("[cyan]Initializing your personalized agents...[/cyan]")
 
-        if "researcher" not in registry:
-            researcher = PersonalizedResearchAgent(
-                agent_id="researcher",
-                role="researcher",
-                description=f"Research specialist acting as {cognitive_profile.user_id}",
-                cognitive_profile=cognitive_profile,
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(researcher)
-            console.print("  ✓ Research Agent (your research style)")
-
-        if "coder" not in registry:
-            coder = PersonalizedCodeAgent(
-                agent_id="coder",
-                role="coder",
-                description=f"Coding specialist acting as {cognitive_profile.user_id}",
-                cognitive_profile=cognitive_profile,
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(coder)
-            console.print("  ✓ Code Agent (your coding style)")
-
-        if "writer" not in registry:
-            writer = PersonalizedWriterAgent(
-                agent_id="writer",
-                role="writer",
-                description=f"Writing specialist acting as {cognitive_profile.user_id}",
-                cognitive_profile=cognitive_profile,
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(writer)
-            console.print("  ✓ Writer Agent (your writing style)")
-
-        if "generalist" not in registry:
-            generalist = PersonalizedGeneralistAgent(
-                agent_id="generalist",
-                role="generalist",
-                description=f"General assistant acting as {cognitive_profile.user_id}",
-                cognitive_profile=cognitive_profile,
-                llm_provider=llm_provider,
-                skills_manager=skills_manager
-            )
-            registry.register(generalist)
-            console.print("  ✓ Generalist Agent (your conversational style)")
+        _register_persona_agents(registry, cognitive_profile, (
+            ("researcher", "Research Agent (your research style)"),
+            ("coder", "Code Agent (your coding style)"),
+            ("writer", "Writer Agent (your writing style)"),
+            ("generalist", "Generalist Agent (your conversational style)"),
+        ))
 
         # Create router with LLM enhancement
         router = TaskRouter(
@@ -1304,78 +1437,74 @@ def persona_chat(provider: str, data_dir: str):
         console.print(f"[dim]Writing Tone: {cognitive_profile.writing_style.tone}[/dim]\n")
         console.print("[dim]Type 'exit' to quit, 'agents' to list, 'stats' for analytics[/dim]\n")
 
-        # Interactive loop
-        session = PromptSession(history=InMemoryHistory())
-        
-        while True:
-            try:
-                user_input = session.prompt("\n[You] > ")
+        # Interactive loop (async, so the agent runs off the event loop)
+        session = PromptSession(history=FileHistory(str(Path(data_dir) / f".history_{cognitive_profile.user_id}")))
+        asyncio.run(_persona_chat_loop(session, registry, router, cognitive_profile, memory))
 
-                if not user_input.strip():
-                    continue
-
-                if user_input.lower() == 'exit':
-                    console.print("[yellow]Goodbye![/yellow]")
-                    break
+    except Exception as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+        import traceback
+        traceback.print_exc()
 
-                if user_input.lower() == 'agents':
-                    agents = registry.list_all()
-                    console.print(f"\n[bold]Your Personalized Agents:[/bold]")
-                    for agent in agents:
-                        weight = cognitive_profile.agent_routing_preferences.get(agent.agent_id, 1.0)
-                        console.print(f"  • {agent.agent_id} ({agent.role}) - Weight: {weight:.2f}x")
-                    continue
 
-                if user_input.lower() == 'stats':
-                    stats = router.get_routing_stats()
-                    console.print(f"\n[bold]Routing Statistics:[/bold]")
-                    console.print(f"  Total routes: {stats['total_routes']}")
-                    console.print(f"  Average confidence: {stats['average_confidence']:.2f}")
-                    console.print(f"  Most used: {stats['most_used_agent']}")
-                    console.print(f"\n[bold]Agent usage:[/bold]")
-                    for agent_id, count in stats['agent_usage'].items():
-                        console.print(f"  • {agent_id}: {count}")
-                    continue
+async def _persona_chat_loop(session, registry, router, cognitive_profile, memory):
+    """Read-route-respond loop for persona-chat."""
+    import asyncio
+    from prompt_toolkit.patch_stdout import patch_stdout
+    
+    # REPL commands other than 'exit', by lower-cased input
+    commands = {
+        # Cognitive profiles carry no routing weights, so every agent lists at 1.00x
+        "agents": lambda: _print_agents("Your Personalized Agents", registry.list_all(), {}),
+        "stats": lambda: _print_routing_stats(router),
+        "profile": lambda: _print_cognitive_profile(cognitive_profile),
+    }
+    
+    while True:
+        try:
+            with patch_stdout():
+                user_input = await session.prompt_async("\n[You] > ")
 
-                if user_input.lower() == 'profile':
-                    console.print(f"\n[bold]Your Profile:[/bold]")
-                    console.print(f"  Profession: {cognitive_profile.profession}")
-                    console.print(f"  Skill Packs: {', '.join(cognitive_profile.loaded_skill_packs)}")
-                    console.print(f"  Communication: {cognitive_profile.preferred_communication_style}")
-                    continue
-                
-                # Fetch recent conversation history from memory
-                recent_interactions = memory.get_recent_interactions(10)
-                conversation_history = [
-                    {"role": "user", "content": i.task} if idx % 2 == 0 else {"role": "assistant", "content": i.response}
-                    for idx, i in enumerate(recent_interactions)
-                ]
-
-                # Route and execute with memory-aware context
-                agent = router.route_task(user_input, conversation_history=conversation_history)
-                if not agent:
-                    console.print("[red]No suitable agent found.[/red]")
-                    continue
+            command = user_input.strip().lower()
+            if not command:
+                continue
 
-                console.print(f"[dim]→ Routing to {agent.agent_id}[/dim]")
+            if command == 'exit':
+                console.print("[yellow]Goodbye![/yellow]")
+                break
 
-                result = agent.handle_task(user_input, {"conversation_history": conversation_history})
+            handler = commands.get(command)
+            if handler:
+                handler()
+                continue
+
+            # Fetch recent conversation history from memory
+            recent_interactions = memory.get_recent_interactions(10)
+            conversation_history = [
+                {"role": "user", "content": i.task} if idx % 2 == 0 else {"role": "assistant", "content": i.response}
+                for idx, i in enumerate(recent_interactions)
+            ]
+
+            # Route (unless the opening alone decides it) and execute with memory-aware context
+            agent = _prefilter_agent(registry, user_input)
+            if agent:
+                router._record_routing(user_input, agent, PREFILTER_CONFIDENCE, [])
+            else:
+                agent = await asyncio.to_thread(
+                    router.route_task, user_input, conversation_history=conversation_history
+                )
+            if not agent:
+                console.print("[red]No suitable agent found.[/red]")
+                continue
 
-                if result.success:
-                    console.print(f"\n[bold green]{agent.role.title()}:[/bold green]")
-                    console.print(Panel(result.result, border_style="green"))
-                else:
-                    console.print(f"[red]Error: {result.error}[/red]")
+            console.print(f"[dim]→ Routing to {agent.agent_id}[/dim]")
 
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Use 'exit' to quit.[/yellow]")
-            except EOFError:
-                break
+            await _stream_agent_reply(agent, user_input, {"conversation_history": conversation_history})
 
-    except Exception as e:
-        console.print(f"[red]Error: {str(e)}[/red]")
-        import traceback
-        traceback.print_exc()
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Use 'exit' to quit.[/yellow]")
+        except EOFError:
+            break
 
 
 @cli.command('meeting-listen')
@@ -1388,6 +1517,10 @@ def persona_chat(provider: str, data_dir: str):
 @click.option('--list-devices', is_flag=True, help='List audio devices and exit')
 def meeting_listen(title: str, url: str, data_dir: str, model: str, no_summary: bool, device: int, list_devices: bool):
     """Start listening to a meeting and transcribe in real-time."""
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+    from src.meeting_listener import MeetingListener
+    from src.meeting_integrations import MeetingURLParser
     from prompt_toolkit import PromptSession
     
     try:
@@ -1548,6 +1681,8 @@ def meeting_listen(title: str, url: str, data_dir: str, model: str, no_summary:
 @click.option('--limit', default=10, help='Number of meetings to show')
 def meeting_list(data_dir: str, limit: int):
     """List all recorded meetings."""
+    from rich.table import Table
+    from src.meeting_listener import MeetingListener
     try:
         listener = MeetingListener(data_dir=f"{data_dir}/meetings")
         meetings = listener.list_meetings()
@@ -1589,6 +1724,8 @@ def meeting_list(data_dir: str, limit: int):
 @click.option('--show-transcript', is_flag=True, help='Show full transcript')
 def meeting_show(meeting_id: str, data_dir: str, show_transcript: bool):
     """Show details of a recorded meeting."""
+    from rich.panel import Panel
+    from src.meeting_listener import MeetingListener
     try:
         listener = MeetingListener(data_dir=f"{data_dir}/meetings")
         
@@ -1678,6 +1815,9 @@ def meeting_show(meeting_id: str, data_dir: str, show_transcript: bool):
 @click.option('--provider', default='ollama', help='LLM provider for summary generation')
 def meeting_summarize(meeting_id: str, data_dir: str, provider: str):
     """Generate or regenerate summary for a meeting using AI."""
+    from rich.panel import Panel
+    from src.cognitive_profile import ProfileManager
+    from src.meeting_listener import MeetingListener, MeetingSummarizer
     try:
         from src.llm_provider import get_llm_provider
         
@@ -1780,6 +1920,7 @@ def meeting_summarize(meeting_id: str, data_dir: str, provider: str):
 @cli.command('meeting-devices')
 def meeting_devices():
     """List all available audio input devices."""
+    from rich.table import Table
     try:
         import sounddevice as sd
         console.print("\n[bold cyan]🎙️ Available Audio Input Devices[/bold cyan]\n")
@@ -1828,6 +1969,8 @@ def meeting_devices():
 @click.option('--data-dir', default='./data', help='Data directory path')
 def meeting_setup(data_dir: str):
     """Setup meeting listener with audio devices and integrations."""
+    from rich.table import Table
+    from src.meeting_integrations import VirtualAudioDevice
     try:
         console.print("\n[bold cyan]🎙️ Meeting Listener Setup[/bold cyan]\n")
         
@@ -1917,6 +2060,9 @@ def meeting_setup(data_dir: str):
 @click.option('--provider', default='openai', help='LLM provider to use')
 def ask_expert(question: tuple, data_dir: str, show_routing: bool, provider: str):
     """Ask a question and get routed to the appropriate expert persona."""
+    from rich.panel import Panel
+    from src.persona_agent import AgentManager
+    from src.question_router import QuestionRouter
     question_text = ' '.join(question)
     data_path = Path(data_dir)
     personas_dir = data_path / "personas"
@@ -1990,6 +2136,9 @@ def ask_expert(question: tuple, data_dir: str, show_routing: bool, provider: str
 @click.option('--skip-expansion', is_flag=True, help='Skip initial knowledge expansion (faster)')
 def onboard_profession_command(provider: str, data_dir: str, interactive: bool, input_file: str, skip_expansion: bool):
     """Onboard your profession for context-aware assistance."""
+    from rich.panel import Panel
+    from rich.table import Table
+    from src.cognitive_profile import ProfileManager
     from src.profession import UniversalProfessionSystem
     from src.llm_provider import get_llm_provider
     
@@ -2146,6 +2295,8 @@ def onboard_profession_command(provider: str, data_dir: str, interactive: bool,
 @click.option('--format', 'output_format', default='summary', type=click.Choice(['json', 'summary']), help='Output format')
 def show_profession_command(data_dir: str, output_format: str):
     """Display your current profession schema."""
+    from rich.panel import Panel
+    from src.cognitive_profile import ProfileManager
     from src.profession import UniversalProfessionSystem
     from src.llm_provider import get_llm_provider
     
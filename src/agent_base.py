@@ -2,8 +2,9 @@
 Base Agent class for multi-agent system.
 Provides common interface for all agents in the MetaPersona ecosystem.
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
 from pkg_resources import _initialize
 from pydantic import BaseModel, Field
@@ -103,6 +104,50 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def acan_handle_task(self, task: str, context: Optional[Dict[str, Any]] = None) -> float:
+        """
+        Score the task without blocking the event loop.
+        
+        Runs can_handle_task in a worker thread so several agents can be
+        scored together with asyncio.gather.
+        """
+        return await asyncio.to_thread(self.can_handle_task, task, context)
+    
+    async def ahandle_task(
+        self,
+        task: str,
+        context: Optional[Dict[str, Any]] = None,
+        use_skills: bool = True
+    ) -> TaskResult:
+        """
+        Execute the task without blocking the event loop.
+        
+        Agents with a native async path override this; the default runs
+        handle_task in a worker thread.
+        """
+        return await asyncio.to_thread(self.handle_task, task, context, use_skills)
+    
+    def handle_task_stream(
+        self,
+        task: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        use_skills: bool = True
+    ) -> TaskResult:
+        """
+        Execute the task, passing response chunks to on_token as they arrive.
+        
+        Agents with a streaming LLM path override this; the default runs
+        handle_task and passes a successful result on as a single chunk.
+        
+        Returns:
+            TaskResult with outcome
+        """
+        result = self.handle_task(task, context, use_skills)
+        if on_token and result.success and result.result:
+            on_token(str(result.result))
+        return result
+    
     def get_system_prompt(self) -> str:
         """
         Generate the system prompt for this agent.
@@ -17,11 +17,66 @@ class AgentRegistry:
     def __init__(self):
         self._agents: dict = {}
 
-    def register(self, agent_id: str, initial_mode: str = 'greeting'):
-        self._agents[agent_id] = SingleUseAgent(agent_id, initial_mode=initial_mode)
+    def register(self, agent_id: str, initial_mode: str = 'greeting', persona_context=None):
+        self._agents[agent_id] = SingleUseAgent(agent_id, initial_mode=initial_mode, persona_context=persona_context)
 
     def get(self, agent_id: str) -> SingleUseAgent:
         return self._agents.get(agent_id)
 
     def list_all(self) -> list:
         return list(self._agents.values())
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._agents
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def status_snapshot(self) -> list:
+        """Status dicts (id, current mode, mode changes, recent messages) for every agent."""
+        return [
+            {
+                'agent_id': agent_id,
+                'mode': agent.get_mode(),
+                'mode_changes': len(agent.get_mode_log()),
+                'recent_messages': len(agent.memory.user_messages),
+            }
+            for agent_id, agent in self._agents.items()
+        ]
+
+    def _agents_plain(self) -> list:
+        """Plain-data description of every agent, enough to re-register it."""
+        return [
+            {'agent_id': agent_id, 'mode': agent.get_mode()}
+            for agent_id, agent in self._agents.items()
+        ]
+
+    def dump(self, path) -> None:
+        """Write a registry snapshot to a single file.
+
+        Uses msgspec's msgpack encoder when installed, otherwise JSON.
+        """
+        plain = self._agents_plain()
+        try:
+            import msgspec
+            data = msgspec.msgpack.encode(plain)
+        except ImportError:
+            data = json.dumps(plain).encode()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    @classmethod
+    def load(cls, path) -> 'AgentRegistry':
+        """Rebuild a registry from a snapshot written by dump()."""
+        data = Path(path).read_bytes()
+        if data[:1] == b'[':
+            # JSON array; a msgpack array never starts with it
+            plain = json.loads(data)
+        else:
+            import msgspec
+            plain = msgspec.msgpack.decode(data)
+        registry = cls()
+        for entry in plain:
+            registry.register(entry['agent_id'], initial_mode=entry['mode'])
+        return registry
@@ -3,6 +3,7 @@ MetaPersona - Cognitive Profile
 Captures and stores user's writing style, decision patterns, and preferences.
 """
 import json
+import os
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -52,6 +53,13 @@ class CognitiveProfile(BaseModel):
     accuracy_score: float = 0.0
 
 
+def _atomic_write(path: Path, data: bytes):
+    """Write via a temp file and rename, so a crash never leaves a partial profile."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
 class ProfileManager:
     """Manages cognitive profile storage and updates."""
     
@@ -83,7 +91,9 @@ class ProfileManager:
             decrypted_json = identity.decrypt_data(encrypted_data, self.encryption_key)
             return CognitiveProfile.model_validate_json(decrypted_json)
         else:
-            return CognitiveProfile.model_validate_json(profile_file.read_text())
+            # Not cached: a deep copy of a cached profile costs more than
+            # reading and validating the file again
+            return CognitiveProfile.model_validate_json(profile_file.read_bytes())
     
     def save_profile(self, profile: CognitiveProfile, encrypt: bool = False):
         """Save profile to storage."""
@@ -94,16 +104,19 @@ class ProfileManager:
             from .identity import IdentityLayer
             identity = IdentityLayer(str(self.data_dir))
             encrypted_data = identity.encrypt_data(profile_json, self.encryption_key)
-            self.encrypted_path.write_bytes(encrypted_data)
+            _atomic_write(self.encrypted_path, encrypted_data)
         else:
-            self.profile_path.write_text(profile_json)
+            _atomic_write(self.profile_path, profile_json.encode())
     
-    def update_writing_style(self, profile: CognitiveProfile, example: str):
-        """Update writing style based on new example."""
+    def update_writing_style(self, profile: CognitiveProfile, example: str) -> bool:
+        """Update writing style based on new example. Returns False (and skips the save) if it is already stored."""
+        if example in profile.writing_style.examples:
+            return False
         profile.writing_style.examples.append(example)
         # Keep only last 50 examples
         profile.writing_style.examples = profile.writing_style.examples[-50:]
         self.save_profile(profile)
+        return True
     
     def update_decision_pattern(self, profile: CognitiveProfile, decision: Dict):
         """Record a decision for pattern learning."""
@@ -130,11 +143,8 @@ class ProfileManager:
         profile.interaction_count += 1
         if feedback_score is not None:
             profile.feedback_received += 1
-            # Running average of accuracy
-            profile.accuracy_score = (
-                (profile.accuracy_score * (profile.feedback_received - 1) + feedback_score) 
-                / profile.feedback_received
-            )
+            # Running average of accuracy (incremental form, no count * mean product)
+            profile.accuracy_score += (feedback_score - profile.accuracy_score) / profile.feedback_received
         self.save_profile(profile)
     
     def get_profile_summary(self, profile: CognitiveProfile) -> str:
@@ -3,12 +3,36 @@ MetaPersona - LLM Provider Interface
 Supports multiple LLM backends (OpenAI, Anthropic, Ollama).
 """
 import os
+import asyncio
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Connection pool sizing shared by all HTTP clients
+HTTP_LIMITS = {"max_connections": 100, "max_keepalive_connections": 100}
+
+
+def _make_http_client(async_client: bool = False):
+    """Build a pooled keep-alive httpx client, using HTTP/2 when h2 is installed.
+    
+    Returns None if httpx isn't available, letting the SDK use its default client.
+    """
+    try:
+        import httpx
+    except ImportError:
+        return None
+    try:
+        import h2  # noqa: F401 # type: ignore
+        http2 = True
+    except ImportError:
+        http2 = False
+    client_class = httpx.AsyncClient if async_client else httpx.Client
+    return client_class(http2=http2, limits=httpx.Limits(**HTTP_LIMITS))
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
@@ -18,6 +42,33 @@ class LLMProvider(ABC):
         """Generate a response from the LLM."""
         pass
     
+    async def agenerate(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+        """Generate a response without blocking the event loop.
+        
+        Providers with a native async SDK override this; the default runs
+        the blocking ``generate`` call in a worker thread.
+        """
+        return await asyncio.to_thread(self.generate, messages, temperature)
+    
+    async def aclose(self):
+        """Close the async client used on the running event loop, if any.
+        
+        Async clients are per event loop and their pooled connections can only
+        be closed while that loop runs, so call this before it finishes (e.g.
+        at the end of the coroutine passed to asyncio.run).
+        """
+        client = getattr(self, "_async_clients", {}).pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+    
+    def stream(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> Iterator[str]:
+        """Yield the response text in chunks as the LLM produces it.
+        
+        Providers with a streaming API override this; the default yields
+        the full ``generate`` response as a single chunk.
+        """
+        yield self.generate(messages, temperature)
+    
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the provider is properly configured."""
@@ -30,12 +81,31 @@ class OpenAIProvider(LLMProvider):
     def __init__(self, model: str = None):
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
         self.api_key = os.getenv("OPENAI_API_KEY")
+        self._client = None
+        # Async clients keyed by the event loop they were created on
+        self._async_clients = weakref.WeakKeyDictionary()
+    
+    def _get_client(self):
+        """Return the shared client so calls reuse pooled connections."""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key, http_client=_make_http_client())
+        return self._client
+    
+    def _get_async_client(self):
+        """Return the async client for the running event loop (one per loop; see aclose)."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=self.api_key, http_client=_make_http_client(async_client=True))
+            self._async_clients[loop] = client
+        return client
         
     def generate(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
         """Generate response using OpenAI API."""
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.api_key)
+            client = self._get_client()
             
             response = client.chat.completions.create(
                 model=self.model,
@@ -46,6 +116,37 @@ class OpenAIProvider(LLMProvider):
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
     
+    async def agenerate(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+        """Generate response using the async OpenAI client."""
+        try:
+            client = self._get_async_client()
+            
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
+    
+    def stream(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> Iterator[str]:
+        """Stream response chunks from the OpenAI API."""
+        try:
+            client = self._get_client()
+            
+            stream = client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
+    
     def is_available(self) -> bool:
         return bool(self.api_key and self.api_key != "your_openai_key_here")
 
@@ -56,21 +157,33 @@ class AnthropicProvider(LLMProvider):
     def __init__(self, model: str = None):
         self.model = model or os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
         self.api_key = os.getenv("ANTHROPIC_API_KEY")
+        self._client = None
+        # Async clients keyed by the event loop they were created on
+        self._async_clients = weakref.WeakKeyDictionary()
+    
+    def _get_client(self):
+        """Return the shared client so calls reuse pooled connections."""
+        if self._client is None:
+            from anthropic import Anthropic
+            self._client = Anthropic(api_key=self.api_key, http_client=_make_http_client())
+        return self._client
+    
+    def _get_async_client(self):
+        """Return the async client for the running event loop (one per loop; see aclose)."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            from anthropic import AsyncAnthropic
+            client = AsyncAnthropic(api_key=self.api_key, http_client=_make_http_client(async_client=True))
+            self._async_clients[loop] = client
+        return client
         
     def generate(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
         """Generate response using Anthropic API."""
         try:
-            from anthropic import Anthropic
-            client = Anthropic(api_key=self.api_key)
+            client = self._get_client()
             
-            # Convert messages format
-            system_msg = None
-            converted_messages = []
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_msg = msg["content"]
-                else:
-                    converted_messages.append(msg)
+            system_msg, converted_messages = self._convert_messages(messages)
             
             response = client.messages.create(
                 model=self.model,
@@ -83,6 +196,54 @@ class AnthropicProvider(LLMProvider):
         except Exception as e:
             raise Exception(f"Anthropic API error: {str(e)}")
     
+    async def agenerate(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+        """Generate response using the async Anthropic client."""
+        try:
+            client = self._get_async_client()
+            
+            system_msg, converted_messages = self._convert_messages(messages)
+            
+            response = await client.messages.create(
+                model=self.model,
+                max_tokens=4096,
+                system=system_msg,
+                messages=converted_messages,
+                temperature=temperature
+            )
+            return response.content[0].text
+        except Exception as e:
+            raise Exception(f"Anthropic API error: {str(e)}")
+    
+    def stream(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> Iterator[str]:
+        """Stream response text from the Anthropic API."""
+        try:
+            client = self._get_client()
+            
+            system_msg, converted_messages = self._convert_messages(messages)
+            
+            with client.messages.stream(
+                model=self.model,
+                max_tokens=4096,
+                system=system_msg,
+                messages=converted_messages,
+                temperature=temperature
+            ) as stream:
+                yield from stream.text_stream
+        except Exception as e:
+            raise Exception(f"Anthropic API error: {str(e)}")
+    
+    @staticmethod
+    def _convert_messages(messages: List[Dict[str, str]]):
+        """Split out the system prompt, as the Messages API expects."""
+        system_msg = None
+        converted_messages = []
+        for msg in messages:
+            if msg["role"] == "system":
+                system_msg = msg["content"]
+            else:
+                converted_messages.append(msg)
+        return system_msg, converted_messages
+    
     def is_available(self) -> bool:
         return bool(self.api_key and self.api_key != "your_anthropic_key_here")
 
@@ -93,29 +254,40 @@ class OllamaProvider(LLMProvider):
     def __init__(self, model: str = None):
         self.model = model or os.getenv("OLLAMA_MODEL", "llama3")
         self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        # requests.Session isn't thread-safe, and concurrent calls run in worker threads
+        self._local = threading.local()
+    
+    def _get_session(self):
+        """Return this thread's keep-alive session, reused across its requests."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests # type: ignore
+            session = self._local.session = requests.Session()
+        return session
+        
+    @staticmethod
+    def _build_prompt(messages: List[Dict[str, str]]) -> str:
+        """Convert chat messages to Ollama's single-prompt format."""
+        prompt = ""
+        for msg in messages:
+            role = msg.get("role", "user")
+            content = msg.get("content", "")
+            if role == "system":
+                prompt += f"System: {content}\n\n"
+            elif role == "user":
+                prompt += f"User: {content}\n\n"
+            elif role == "assistant":
+                prompt += f"Assistant: {content}\n\n"
+        return prompt
         
     def generate(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
         """Generate response using Ollama."""
         try:
-            import requests # type: ignore
-            
-            # Convert messages to Ollama format
-            prompt = ""
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                if role == "system":
-                    prompt += f"System: {content}\n\n"
-                elif role == "user":
-                    prompt += f"User: {content}\n\n"
-                elif role == "assistant":
-                    prompt += f"Assistant: {content}\n\n"
-            
-            response = requests.post(
+            response = self._get_session().post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": self.model,
-                    "prompt": prompt,
+                    "prompt": self._build_prompt(messages),
                     "stream": False,
                     "options": {
                         "temperature": temperature
@@ -127,19 +299,61 @@ class OllamaProvider(LLMProvider):
         except Exception as e:
             raise Exception(f"Ollama error: {str(e)}")
     
+    def stream(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> Iterator[str]:
+        """Stream response chunks from Ollama (one JSON object per line)."""
+        try:
+            import json
+            with self._get_session().post(
+                f"{self.base_url}/api/generate",
+                json={
+                    "model": self.model,
+                    "prompt": self._build_prompt(messages),
+                    "stream": True,
+                    "options": {
+                        "temperature": temperature
+                    }
+                },
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+        except Exception as e:
+            raise Exception(f"Ollama error: {str(e)}")
+    
     def is_available(self) -> bool:
         try:
-            import requests # type: ignore
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self._get_session().get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except Exception as e:
             print(f"Ollama availability check failed: {e}")
             return False
 
 
+# Environment settings (model, endpoint/credentials) each provider is built from
+_PROVIDER_SETTINGS = {
+    "openai": ("OPENAI_MODEL", "OPENAI_API_KEY"),
+    "anthropic": ("ANTHROPIC_MODEL", "ANTHROPIC_API_KEY"),
+    "ollama": ("OLLAMA_MODEL", "OLLAMA_BASE_URL"),
+}
+
+# Providers already built, keyed by name and settings, so their HTTP clients are reused
+_providers: Dict[tuple, LLMProvider] = {}
+
+
 def get_llm_provider(provider_name: str = None) -> LLMProvider:
-    """Get configured LLM provider."""
+    """Get configured LLM provider (shared while its model and endpoint are unchanged)."""
     provider_name = provider_name or os.getenv("LLM_PROVIDER", "openai")
+    cache_key = (provider_name,) + tuple(os.getenv(var) for var in _PROVIDER_SETTINGS.get(provider_name, ()))
+    
+    if cache_key in _providers:
+        return _providers[cache_key]
     
     providers = {
         "openai": OpenAIProvider,
@@ -155,4 +369,5 @@ def get_llm_provider(provider_name: str = None) -> LLMProvider:
     if not provider.is_available():
         raise Exception(f"Provider {provider_name} is not properly configured or available")
     
+    _providers[cache_key] = provider
     return provider
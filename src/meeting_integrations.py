@@ -35,18 +35,66 @@ class MeetingURLParser:
         ],
     }
     
+    # Flattened (platform, compiled pattern) list, in priority order
+    _COMPILED = [
+        (platform, re.compile(pattern))
+        for platform, patterns in PATTERNS.items()
+        for pattern in patterns
+    ]
+    
+    # Hyperscan database over all patterns (None = not built yet, False = unavailable)
+    _hyperscan_db = None
+    
+    @classmethod
+    def _get_hyperscan_db(cls):
+        """Compile every platform pattern into one Hyperscan database, if installed."""
+        if cls._hyperscan_db is None:
+            try:
+                import hyperscan
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[pattern.pattern.encode() for _, pattern in cls._COMPILED],
+                    ids=list(range(len(cls._COMPILED))),
+                    elements=len(cls._COMPILED),
+                    flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(cls._COMPILED)
+                )
+                cls._hyperscan_db = db
+            except Exception:
+                cls._hyperscan_db = False
+        return cls._hyperscan_db
+    
+    @classmethod
+    def _find_pattern(cls, url: str) -> Optional[int]:
+        """Index into _COMPILED of the highest-priority pattern matching url."""
+        db = cls._get_hyperscan_db()
+        if db:
+            matched = []
+            
+            def on_match(pattern_id, start, end, flags, context):
+                matched.append(pattern_id)
+            
+            db.scan(url.encode(), match_event_handler=on_match)
+            return min(matched) if matched else None
+        
+        for i, (_, pattern) in enumerate(cls._COMPILED):
+            if pattern.search(url):
+                return i
+        return None
+    
     @classmethod
     def parse_url(cls, url: str) -> Dict[str, Any]:
         """Parse a meeting URL and extract details."""
-        for platform, patterns in cls.PATTERNS.items():
-            for pattern in patterns:
-                match = re.search(pattern, url)
-                if match:
-                    return {
-                        'platform': platform.value,
-                        'meeting_id': match.group(1) if match.lastindex else None,
-                        'url': url
-                    }
+        index = cls._find_pattern(url)
+        if index is not None:
+            platform, pattern = cls._COMPILED[index]
+            # Hyperscan only reports which pattern hit; extract the ID with re
+            match = pattern.search(url)
+            if match:
+                return {
+                    'platform': platform.value,
+                    'meeting_id': match.group(1) if match.lastindex else None,
+                    'url': url
+                }
         
         return {
             'platform': MeetingPlatform.GENERIC.value,
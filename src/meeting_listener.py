@@ -181,20 +181,76 @@ class TranscriptionEngine:
         self.model_name = model
         self.language = language
         self.model = None
+        self.backend = None  # "faster-whisper" or "whisper"
         self.vad = None
         self._load_model()
         self._init_vad()
     
     def _load_model(self):
-        """Load the transcription model."""
+        """Load the transcription model.
+        
+        Prefers faster-whisper (CTranslate2) with int8 weights, which runs
+        several times faster than FP32 PyTorch Whisper on CPU; falls back to
+        openai-whisper when faster-whisper isn't installed.
+        """
+        try:
+            from faster_whisper import WhisperModel
+            device, compute_type = self._select_compute()
+            self.model = WhisperModel(self.model_name, device=device, compute_type=compute_type)
+            self.backend = "faster-whisper"
+            return
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"[Warning] Failed to load faster-whisper model, trying openai-whisper: {e}")
+        
         try:
             import whisper
             self.model = whisper.load_model(self.model_name)
+            self.backend = "whisper"
         except ImportError:
-            print("[Error] Whisper not installed. Install with: pip install openai-whisper")
+            print("[Error] Whisper not installed. Install with: pip install faster-whisper (or openai-whisper)")
         except Exception as e:
             print(f"[Error] Failed to load Whisper model: {e}")
     
+    @staticmethod
+    def _select_compute() -> tuple:
+        """Pick device and quantized compute type for faster-whisper."""
+        try:
+            import ctranslate2
+            if ctranslate2.get_cuda_device_count() > 0:
+                return "cuda", "int8_float16"
+        except Exception:
+            pass
+        return "cpu", "int8"
+    
+    def _run_model(self, audio, **whisper_options) -> Dict[str, Any]:
+        """Transcribe with the loaded backend, returning openai-whisper's result format.
+        
+        ``whisper_options`` are openai-whisper-only settings (e.g. fp16) and are
+        ignored by faster-whisper.
+        """
+        if self.backend == "faster-whisper":
+            if not isinstance(audio, str):
+                audio = audio.astype("float32")
+            segments, info = self.model.transcribe(
+                audio,
+                language=self.language,
+                beam_size=1,
+                vad_filter=True
+            )
+            segment_dicts = [
+                {'id': i, 'start': seg.start, 'end': seg.end, 'text': seg.text}
+                for i, seg in enumerate(segments)
+            ]
+            return {
+                'text': "".join(seg['text'] for seg in segment_dicts),
+                'segments': segment_dicts,
+                'language': info.language
+            }
+        
+        return self.model.transcribe(audio, language=self.language, verbose=False, **whisper_options)
+    
     def _init_vad(self):
         """Initialize Voice Activity Detection."""
         try:
@@ -271,14 +327,11 @@ class TranscriptionEngine:
             audio_array = np.frombuffer(audio_data, dtype=np.int16)
             audio_float = audio_array.astype(np.float32) / 32768.0
             
-            # Resample to 16kHz if necessary (Whisper expects 16kHz)
-            if sample_rate != 16000:
-                num_samples = int(len(audio_float) * 16000 / sample_rate)
-                audio_float = signal.resample(audio_float, num_samples)
-            
-            # Check if audio has content (not silence)
-            audio_level = np.abs(audio_float).mean()
-            max_level = np.abs(audio_float).max()
+            # Check if audio has content (not silence) before any resampling,
+            # so silent windows never pay for the FFT resample
+            magnitude = np.abs(audio_float)
+            audio_level = magnitude.mean()
+            max_level = magnitude.max()
             
             # Require significant audio level AND variation
             if audio_level < 0.05 or max_level < 0.15:
@@ -289,6 +342,11 @@ class TranscriptionEngine:
             if not has_speech:
                 return None
             
+            # Resample to 16kHz if necessary (Whisper expects 16kHz)
+            if sample_rate != 16000:
+                num_samples = int(len(audio_float) * 16000 / sample_rate)
+                audio_float = signal.resample(audio_float, num_samples)
+            
             # Transcribe (suppress all output including progress bars)
             import warnings
             import sys
@@ -300,12 +358,7 @@ class TranscriptionEngine:
                 with redirect_stderr(devnull), redirect_stdout(devnull):
                     with warnings.catch_warnings():
                         warnings.simplefilter("ignore")
-                        result = self.model.transcribe(
-                            audio_float,
-                            language=self.language,
-                            fp16=False,
-                            verbose=False
-                        )
+                        result = self._run_model(audio_float, fp16=False)
             
             if result and result.get('text'):
                 text = result['text'].strip()
@@ -330,12 +383,7 @@ class TranscriptionEngine:
             return None
         
         try:
-            result = self.model.transcribe(
-                audio_file_path,
-                language=self.language,
-                verbose=False
-            )
-            return result
+            return self._run_model(audio_file_path)
         except Exception as e:
             print(f"File transcription error: {e}")
             return None
@@ -366,6 +414,12 @@ class MeetingListener:
         
         self.processing_thread = None
         self.should_process = False
+        
+        # Buffered audio windows waiting for transcription; capture keeps
+        # running while the transcription worker catches up
+        self.window_queue: queue.Queue = queue.Queue()
+        self.transcription_thread = None
+        self.segments_lock = threading.Lock()
     
     def start_meeting(
         self,
@@ -397,7 +451,9 @@ class MeetingListener:
         # Start audio capture
         self.audio_capture.start_capture()
         
-        # Start processing thread
+        # Start transcription worker and processing thread
+        self.transcription_thread = threading.Thread(target=self._transcription_loop)
+        self.transcription_thread.start()
         self.should_process = True
         self.processing_thread = threading.Thread(target=self._process_audio_loop)
         self.processing_thread.start()
@@ -414,7 +470,7 @@ class MeetingListener:
         
         print("Stopping meeting recording...")
         
-        # Stop processing
+        # Stop processing (flushes the partially filled buffer)
         self.should_process = False
         if self.processing_thread:
             self.processing_thread.join()
@@ -422,6 +478,11 @@ class MeetingListener:
         # Stop audio capture
         self.audio_capture.stop_capture()
         
+        # Wait for the transcription worker to finish the queued windows
+        self.window_queue.put(None)
+        if self.transcription_thread:
+            self.transcription_thread.join()
+        
         # Finalize metadata
         if self.current_meeting:
             self.current_meeting.end_time = datetime.now()
@@ -463,7 +524,7 @@ class MeetingListener:
             print("Meeting resumed")
     
     def _process_audio_loop(self):
-        """Background thread that processes audio chunks."""
+        """Background thread that buffers audio chunks into transcription windows."""
         audio_buffer = bytearray()
         buffer_duration = 3.0  # Process every 3 seconds (faster feedback)
         # Use actual sample rate from audio capture
@@ -471,28 +532,35 @@ class MeetingListener:
         bytes_per_second = sample_rate * 2  # 16-bit audio
         buffer_size = int(buffer_duration * bytes_per_second)
         
-        chunks_received = 0
         while self.should_process:
             chunk = self.audio_capture.get_audio_chunk(timeout=0.5)
             
             if chunk:
-                chunks_received += 1
                 audio_buffer.extend(chunk)
                 
-                # Process when buffer is full
+                # Hand off full windows without waiting for transcription
                 if len(audio_buffer) >= buffer_size:
-                    segment = self.transcription_engine.transcribe_audio(
-                        bytes(audio_buffer),
-                        sample_rate
-                    )
-                    
-                    if segment and segment.text:
-                        self.transcript_segments.append(segment)
-                        print(f"\n[{segment.timestamp.strftime('%H:%M:%S')}] {segment.text}\n")
-                    
-                    # Clear buffer
+                    self.window_queue.put((bytes(audio_buffer), sample_rate))
                     audio_buffer.clear()
-                    chunks_received = 0
+        
+        # Flush the tail so the last words before stop/pause aren't lost
+        if audio_buffer:
+            self.window_queue.put((bytes(audio_buffer), sample_rate))
+    
+    def _transcription_loop(self):
+        """Background thread that transcribes buffered windows as they arrive."""
+        while True:
+            window = self.window_queue.get()
+            if window is None:
+                break
+            
+            audio_data, sample_rate = window
+            segment = self.transcription_engine.transcribe_audio(audio_data, sample_rate)
+            
+            if segment and segment.text:
+                with self.segments_lock:
+                    self.transcript_segments.append(segment)
+                print(f"\n[{segment.timestamp.strftime('%H:%M:%S')}] {segment.text}\n")
     
     def _save_meeting_data(self) -> Dict[str, Any]:
         """Save meeting data to disk."""
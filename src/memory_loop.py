@@ -3,12 +3,34 @@ MetaPersona - Memory Loop
 Implements learning and feedback mechanism for continuous improvement.
 """
 import json
+import os
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 from pydantic import BaseModel
 
 
+# Bytes read per step when scanning the log backwards for recent interactions
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def _tail_lines(path: Path, count: int) -> List[bytes]:
+    """Last count non-empty lines of a file, read backwards in blocks."""
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        while pos > 0 and data.count(b"\n") <= count:
+            step = min(TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    if pos > 0:
+        # Drop the line the last block cut into
+        data = data.split(b"\n", 1)[1]
+    return [line for line in data.splitlines() if line.strip()][-count:]
+
+
 class Interaction(BaseModel):
     """Single interaction record."""
     timestamp: str
@@ -26,37 +48,105 @@ class MemoryLoop:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.memory_path = self.data_dir / "memory.jsonl"
-        
+        # Interactions on disk; counted on first use, then tracked as we append
+        self._count: Optional[int] = None
+        # Parsed log reused while the file is unchanged: ((mtime_ns, size), interactions)
+        self._loaded = None
+        # Serializes log writes so they can be handed to a background thread
+        self._lock = threading.Lock()
+        
+    @property
+    def interaction_count(self) -> int:
+        """Number of recorded interactions (the index of the next one)."""
+        with self._lock:
+            if self._count is None:
+                self._count = 0
+                if self.memory_path.exists():
+                    with open(self.memory_path, 'rb') as f:
+                        self._count = sum(1 for line in f if line.strip())
+            return self._count
+    
     def record_interaction(self, task: str, response: str, tags: List[str] = None) -> Interaction:
-        """Record a new interaction."""
+        """Record a new interaction (its index is ``interaction_count - 1`` afterwards)."""
         interaction = Interaction(
             timestamp=datetime.now().isoformat(),
             task=task,
             response=response,
             tags=tags or []
         )
-        with open(self.memory_path, 'a', encoding='utf-8') as f:
-            f.write(interaction.model_dump_json() + '\n')
+        line = interaction.model_dump_json() + '\n'
+        with self._lock:
+            with open(self.memory_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            if self._count is not None:
+                self._count += 1
+            self._loaded = None
         return interaction
     
+    def load_all_interactions(self) -> List[Interaction]:
+        """Load every recorded interaction, oldest first.
+        
+        The parsed log is reused until the file changes, so reports that
+        call several summary methods in a row only parse it once.
+        """
+        if not self.memory_path.exists():
+            return []
+        stat = self.memory_path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._loaded is None or self._loaded[0] != key:
+            with open(self.memory_path, 'r', encoding='utf-8') as f:
+                interactions = [Interaction.model_validate_json(line) for line in f if line.strip()]
+            self._loaded = (key, interactions)
+        return list(self._loaded[1])
+    
+    def add_feedback(self, index: int, score: float, feedback_text: Optional[str] = None) -> bool:
+        """Attach feedback to the interaction at index. Returns False if there is none."""
+        with self._lock:
+            if not self.memory_path.exists():
+                return False
+            with open(self.memory_path, 'r', encoding='utf-8') as f:
+                lines = [line for line in f if line.strip()]
+            if not -len(lines) <= index < len(lines):
+                return False
+            
+            # Only the target line is parsed; the rest are written back untouched
+            interaction = Interaction.model_validate_json(lines[index])
+            interaction.feedback_score = score
+            interaction.feedback_text = feedback_text or None
+            lines[index] = interaction.model_dump_json() + '\n'
+            with open(self.memory_path, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            self._loaded = None
+        return True
+    
     def get_recent_interactions(self, count: int = 10) -> List[Interaction]:
-        """Get most recent interactions."""
-        interactions = self.load_all_interactions()
-        return interactions[-count:] if interactions else []
+        """Get most recent interactions (only the end of the log is read and parsed)."""
+        if count <= 0:
+            interactions = self.load_all_interactions()
+            return interactions[-count:] if interactions else []
+        if not self.memory_path.exists():
+            return []
+        with self._lock:
+            lines = _tail_lines(self.memory_path, count)
+        return [Interaction.model_validate_json(line) for line in lines]
     
     def get_interactions_by_tag(self, tag: str) -> List[Interaction]:
         """Get interactions with specific tag."""
         interactions = self.load_all_interactions()
         return [i for i in interactions if tag in i.tags]
     
+    @staticmethod
+    def _feedback_scores(interactions: List[Interaction]) -> List[float]:
+        """Feedback scores in recording order, skipping unrated interactions."""
+        return [i.feedback_score for i in interactions if i.feedback_score is not None]
+    
     def get_feedback_summary(self) -> Dict:
         """Get summary of feedback metrics."""
         interactions = self.load_all_interactions()
-        
         total = len(interactions)
-        with_feedback = [i for i in interactions if i.feedback_score is not None]
+        scores = self._feedback_scores(interactions)
         
-        if not with_feedback:
+        if not scores:
             return {
                 "total_interactions": total,
                 "feedback_count": 0,
@@ -64,30 +154,26 @@ class MemoryLoop:
                 "feedback_rate": 0.0
             }
         
-        avg_score = sum(i.feedback_score for i in with_feedback) / len(with_feedback)
+        avg_score = sum(scores) / len(scores)
         
         return {
             "total_interactions": total,
-            "feedback_count": len(with_feedback),
+            "feedback_count": len(scores),
             "average_score": avg_score,
-            "feedback_rate": len(with_feedback) / total if total > 0 else 0.0
+            "feedback_rate": len(scores) / total if total > 0 else 0.0
         }
     
     def analyze_learning_progress(self) -> Dict:
         """Analyze learning progress over time."""
-        interactions = self.load_all_interactions()
-        with_feedback = [i for i in interactions if i.feedback_score is not None]
+        scores = self._feedback_scores(self.load_all_interactions())
         
-        if len(with_feedback) < 2:
+        if len(scores) < 2:
             return {"status": "insufficient_data", "message": "Need at least 2 feedback points"}
         
         # Split into first half and second half
-        mid = len(with_feedback) // 2
-        first_half = with_feedback[:mid]
-        second_half = with_feedback[mid:]
-        
-        avg_first = sum(i.feedback_score for i in first_half) / len(first_half)
-        avg_second = sum(i.feedback_score for i in second_half) / len(second_half)
+        mid = len(scores) // 2
+        avg_first = sum(scores[:mid]) / mid
+        avg_second = sum(scores[mid:]) / (len(scores) - mid)
         
         improvement = avg_second - avg_first
         
@@ -4,7 +4,7 @@ The main autonomous agent that acts in the user's style.
 """
 import json
 from datetime import datetime
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable
 from .cognitive_profile import CognitiveProfile, ProfileManager
 from .llm_provider import LLMProvider, get_llm_provider
 from .skills import SkillManager
@@ -381,6 +381,129 @@ For everything else, respond naturally as this person would in conversation."""
         """Process a task and generate response in user's style."""
         print(f"\n🤖 Processing task: {task[:50]}...")
         
+        skill_response = self._try_direct_skills(task)
+        if skill_response is not None:
+            return skill_response
+        
+        messages = self._build_task_messages(task, context)
+        
+        # Generate response
+        try:
+            response = self.llm.generate(messages, temperature=0.7)
+            return self._finalize_response(task, response)
+        except Exception as e:
+            return f"Error processing task: {str(e)}"
+    
+    async def aprocess_task(self, task: str, context: Optional[str] = None) -> str:
+        """Async variant of process_task so several tasks can be awaited together.
+        
+        Messages are built from the conversation history as it stands when the
+        coroutine starts, so tasks gathered concurrently are treated as independent.
+        """
+        print(f"\n🤖 Processing task: {task[:50]}...")
+        
+        skill_response = self._try_direct_skills(task)
+        if skill_response is not None:
+            return skill_response
+        
+        messages = self._build_task_messages(task, context)
+        
+        try:
+            response = await self.llm.agenerate(messages, temperature=0.7)
+            return self._finalize_response(task, response)
+        except Exception as e:
+            return f"Error processing task: {str(e)}"
+    
+    def process_task_stream(self, task: str, context: Optional[str] = None, on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Process a task, passing response chunks to ``on_token`` as they arrive.
+        
+        Returns the final response, which differs from the streamed text when
+        the LLM asked for a skill and the skill's result replaced it.
+        """
+        print(f"\n🤖 Processing task: {task[:50]}...")
+        
+        skill_response = self._try_direct_skills(task)
+        if skill_response is not None:
+            return skill_response
+        
+        messages = self._build_task_messages(task, context)
+        
+        try:
+            chunks = []
+            for chunk in self.llm.stream(messages, temperature=0.7):
+                chunks.append(chunk)
+                if on_token:
+                    on_token(chunk)
+            return self._finalize_response(task, "".join(chunks))
+        except Exception as e:
+            return f"Error processing task: {str(e)}"
+    
+    def process_tasks_batch(self, tasks: List[str]) -> List[str]:
+        """Process several independent tasks with a single LLM request.
+        
+        Tasks answerable by a skill are resolved directly; the rest are sent as
+        one numbered prompt and the JSON reply is split back into per-task
+        responses. Falls back to one request per task if the reply can't be parsed.
+        """
+        responses: List[Optional[str]] = [self._try_direct_skills(task) for task in tasks]
+        pending = [i for i, response in enumerate(responses) if response is None]
+        if not pending:
+            return responses
+        if len(pending) == 1:
+            responses[pending[0]] = self.process_task(tasks[pending[0]])
+            return responses
+        
+        print(f"\n🤖 Processing {len(pending)} tasks in one request...")
+        numbered = "\n".join(f"{n}. {tasks[i]}" for n, i in enumerate(pending, 1))
+        batch_prompt = f"""Complete each of the following {len(pending)} independent tasks:
+
+{numbered}
+
+Respond with JSON ONLY: a list with one object per task, in order, like
+[{{"id": 1, "response": "..."}}, {{"id": 2, "response": "..."}}]"""
+        
+        messages = self._build_task_messages(batch_prompt)
+        try:
+            batch_responses = self._parse_batch_response(
+                self.llm.generate(messages, temperature=0.7), len(pending)
+            )
+        except Exception as e:
+            print(f"⚠️ Batch request failed: {e}")
+            batch_responses = None
+        
+        if batch_responses is None:
+            print("⚠️ Falling back to one request per task")
+            for i in pending:
+                responses[i] = self.process_task(tasks[i])
+            return responses
+        
+        for i, response in zip(pending, batch_responses):
+            responses[i] = self._finalize_response(tasks[i], response)
+        return responses
+    
+    @staticmethod
+    def _parse_batch_response(response: str, expected: int) -> Optional[List[str]]:
+        """Split a batched JSON reply into responses ordered by task id."""
+        response_text = response.strip()
+        
+        # Handle markdown code blocks
+        if "```json" in response_text:
+            response_text = response_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in response_text:
+            response_text = response_text.split("```")[1].split("```")[0].strip()
+        
+        try:
+            items = json.loads(response_text)
+            by_id = {int(item["id"]): str(item["response"]) for item in items}
+        except (ValueError, TypeError, KeyError):
+            return None
+        
+        if sorted(by_id) != list(range(1, expected + 1)):
+            return None
+        return [by_id[n] for n in range(1, expected + 1)]
+    
+    def _try_direct_skills(self, task: str) -> Optional[str]:
+        """Answer flight and timezone queries directly from skills, bypassing the LLM."""
         # Pre-process: Check if this is a flight query
         flight_query = self._detect_flight_query(task)
         if flight_query:
@@ -417,6 +540,10 @@ For everything else, respond naturally as this person would in conversation."""
             except Exception as e:
                 print(f"⚠️ Timezone query detection error: {e}")
         
+        return None
+    
+    def _build_task_messages(self, task: str, context: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build the chat messages (system prompt, history, task) for an LLM call."""
         # Get current datetime and inject it into system prompt
         from datetime import datetime
         now = datetime.now()
@@ -449,21 +576,18 @@ For everything else, respond naturally as this person would in conversation."""
             user_message = f"Context: {context}\n\nTask: {task}"
         
         messages.append({"role": "user", "content": user_message})
+        return messages
+    
+    def _finalize_response(self, task: str, response: str) -> str:
+        """Run any requested skill and record the exchange in conversation history."""
+        # Check if response is a skill request
+        response = self._handle_skill_request(response)
         
-        # Generate response
-        try:
-            response = self.llm.generate(messages, temperature=0.7)
-            
-            # Check if response is a skill request
-            response = self._handle_skill_request(response)
-            
-            # Update conversation history
-            self.conversation_history.append({"role": "user", "content": task})
-            self.conversation_history.append({"role": "assistant", "content": response})
-            
-            return response
-        except Exception as e:
-            return f"Error processing task: {str(e)}"
+        # Update conversation history
+        self.conversation_history.append({"role": "user", "content": task})
+        self.conversation_history.append({"role": "assistant", "content": response})
+        
+        return response
     
     def _handle_skill_request(self, response: str) -> str:
         """Check if response contains a skill request and execute it."""
@@ -695,10 +819,21 @@ class AgentManager:
         self.profile_manager = ProfileManager(data_dir, encryption_key)
         self.data_dir = data_dir
         
-    def initialize_agent(self, user_id: str = None, provider_name: str = None, use_adaptive_profile: bool = False) -> PersonaAgent:
-        """Initialize or load persona agent with optional adaptive profile."""
+    def initialize_agent(
+        self,
+        user_id: str = None,
+        provider_name: str = None,
+        use_adaptive_profile: bool = False,
+        cognitive_profile: CognitiveProfile = None,
+        user_profile=None
+    ) -> PersonaAgent:
+        """Initialize or load persona agent with optional adaptive profile.
+        
+        Callers that already loaded the cognitive and/or adaptive user profile
+        can pass them in to skip loading them again.
+        """
         # Load or create profile
-        profile = self.profile_manager.load_profile()
+        profile = cognitive_profile or self.profile_manager.load_profile()
         if not profile:
             if not user_id:
                 user_id = "user_" + datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -718,7 +853,9 @@ class AgentManager:
         
         # Load adaptive profile if requested
         adaptive_profile = None
-        if use_adaptive_profile:
+        if use_adaptive_profile and user_profile is not None:
+            adaptive_profile = user_profile
+        elif use_adaptive_profile:
             from .user_profiling import UserProfilingSystem
             profiling_system = UserProfilingSystem(self.data_dir)
             adaptive_profile = profiling_system.load_profile(profile.user_id)
@@ -127,6 +127,6 @@ def handler_onboarding(msg):
         styled = styler.style(question, mode='onboarding')
         return AgentMessage(sender=msg.receiver, receiver=msg.sender, intent='onboarding', payload={'result': styled, 'internal': internal_styled}, metadata={})
     # Smooth transition to task mode
-    complete = f'{persona.get_mode_style('onboarding').capitalize()} onboarding: Onboarding complete! Planning context initialized. Ready to start your first task.'
+    complete = f'{persona.get_mode_style("onboarding").capitalize()} onboarding: Onboarding complete! Planning context initialized. Ready to start your first task.'
     styled = styler.style(complete, mode='onboarding')
     return AgentMessage(sender=msg.receiver, receiver=msg.sender, intent='onboarding', payload={'result': styled, 'internal': internal_styled}, metadata={})
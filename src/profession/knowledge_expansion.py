@@ -2,20 +2,95 @@
 Knowledge Expansion Layer
 Fills gaps in profession schema using web search and LLM-based reasoning
 """
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
+import asyncio
 import requests
 import json
 import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from ..rate_limiter import estimate_tokens
 from .schema import ProfessionSchema, SafetyRules
 
 
+# Shared instructions for every safety-rule request (profession-specific text is appended last)
+SAFETY_RULES_SYSTEM_PROMPT = """You are a legal and compliance expert in professional requirements and ethical standards across industries. Generate comprehensive safety rules for the profession and industry the user names.
+
+Use this 6-question framework to ensure complete coverage:
+
+**1. REGULATORY & COMPLIANCE**
+- What government agencies regulate this profession? (FDA, SEC, FTC, HIPAA, etc.)
+- What licenses or certifications are legally required?
+- What actions require regulatory approval before execution?
+- What reporting/documentation is legally mandated?
+
+**2. DATA & PRIVACY**
+- What types of data are legally protected? (PII, PHI, financial, classified)
+- What are the data retention/destruction requirements?
+- Who can legally access certain data?
+- What consent is required before collecting/using data?
+
+**3. PROFESSIONAL ETHICS & STANDARDS**
+- What professional codes of conduct exist?
+- What constitutes malpractice or professional negligence?
+- What conflicts of interest must be disclosed/avoided?
+- What fiduciary duties exist?
+
+**4. SAFETY & RISK MANAGEMENT**
+- What actions could cause physical harm?
+- What validation/testing is required before deployment?
+- What safety protocols are legally mandated?
+- What insurance or bonding is required?
+
+**5. LEGAL BOUNDARIES**
+- What practices constitute fraud or misrepresentation?
+- What confidentiality obligations exist?
+- What anti-discrimination laws apply?
+- What insider trading/market manipulation rules apply?
+
+**6. SCOPE OF PRACTICE**
+- What tasks require specific credentials to perform legally?
+- What advice constitutes unauthorized practice?
+- What delegations are prohibited?
+
+Generate rules in JSON format:
+{
+  "critical_rules": [
+    "NEVER [action that could cause legal/ethical violations]",
+    "ALWAYS [required compliance action]",
+    ... (minimum 10 rules)
+  ],
+  "important_rules": [
+    "Should avoid [risky situation]",
+    "Should always [recommended practice]",
+    ... (5-8 rules)
+  ],
+  "best_practices": [
+    "Best practice statement",
+    ... (8-12 practices)
+  ],
+  "regulatory_context": {
+    "primary_regulations": ["list of key regulations/laws"],
+    "governing_bodies": ["agencies/organizations"],
+    "required_certifications": ["licenses/certifications"]
+  }
+}"""
+
+
+@lru_cache(maxsize=1)
+def _system_prompt_tokens() -> int:
+    """Token count of the shared safety-rule system prompt, tokenized only once."""
+    return estimate_tokens(SAFETY_RULES_SYSTEM_PROMPT)
+
+
 class KnowledgeExpansionLayer:
     """Expands profession knowledge using web search when gaps are detected."""
     
-    def __init__(self, llm_provider, google_api_key: str, google_cse_id: str, cache_dir: Path = None):
+    def __init__(self, llm_provider, google_api_key: str, google_cse_id: str, cache_dir: Path = None, semantic_cache=None):
         self.llm = llm_provider
+        # Optional SemanticCache for safety rules of similar professions
+        self.semantic_cache = semantic_cache
         self.google_api_key = google_api_key
         self.google_cse_id = google_cse_id
         self.cache_dir = cache_dir or Path("data/knowledge_cache")
@@ -449,106 +524,157 @@ Return ONLY valid JSON."""
         Returns:
             SafetyRules object with critical rules, warnings, and best practices
         """
-        profession = schema.profession_name
-        industry = schema.industry
+        cached = self._cached_safety_rules(schema)
+        if cached is not None:
+            return cached
         
-        safety_prompt = f"""You are a legal and compliance expert. Generate comprehensive safety rules for a {profession} working in {industry}.
-
-Use this 6-question framework to ensure complete coverage:
-
-**1. REGULATORY & COMPLIANCE**
-- What government agencies regulate this profession? (FDA, SEC, FTC, HIPAA, etc.)
-- What licenses or certifications are legally required?
-- What actions require regulatory approval before execution?
-- What reporting/documentation is legally mandated?
-
-**2. DATA & PRIVACY**
-- What types of data are legally protected? (PII, PHI, financial, classified)
-- What are the data retention/destruction requirements?
-- Who can legally access certain data?
-- What consent is required before collecting/using data?
-
-**3. PROFESSIONAL ETHICS & STANDARDS**
-- What professional codes of conduct exist?
-- What constitutes malpractice or professional negligence?
-- What conflicts of interest must be disclosed/avoided?
-- What fiduciary duties exist?
-
-**4. SAFETY & RISK MANAGEMENT**
-- What actions could cause physical harm?
-- What validation/testing is required before deployment?
-- What safety protocols are legally mandated?
-- What insurance or bonding is required?
-
-**5. LEGAL BOUNDARIES**
-- What practices constitute fraud or misrepresentation?
-- What confidentiality obligations exist?
-- What anti-discrimination laws apply?
-- What insider trading/market manipulation rules apply?
-
-**6. SCOPE OF PRACTICE**
-- What tasks require specific credentials to perform legally?
-- What advice constitutes unauthorized practice?
-- What delegations are prohibited?
-
-Generate rules in JSON format:
-{{
-  "critical_rules": [
-    "NEVER [action that could cause legal/ethical violations]",
-    "ALWAYS [required compliance action]",
-    ... (minimum 10 rules)
-  ],
-  "important_rules": [
-    "Should avoid [risky situation]",
-    "Should always [recommended practice]",
-    ... (5-8 rules)
-  ],
-  "best_practices": [
-    "Best practice statement",
-    ... (8-12 practices)
-  ],
-  "regulatory_context": {{
-    "primary_regulations": ["list of key regulations/laws"],
-    "governing_bodies": ["agencies/organizations"],
-    "required_certifications": ["licenses/certifications"]
-  }}
-}}
-
-Be specific to {profession} in {industry}. Focus on rules that prevent legal violations, protect people from harm, and ensure ethical practice.
-
-Return ONLY valid JSON."""
-
-        messages = [
-            {"role": "system", "content": "You are an expert in professional compliance, legal requirements, and ethical standards across industries."},
-            {"role": "user", "content": safety_prompt}
-        ]
+        messages = self._build_safety_messages(schema)
         
         try:
             response = self.llm.generate(messages, temperature=0.3)
+            safety_rules = self._parse_safety_response(schema, response)
+            if safety_rules is not None:
+                return safety_rules
+        except Exception as e:
+            print(f"Failed to generate safety rules via LLM: {e}")
+        
+        # Fallback: basic safety rules
+        return self._generate_fallback_safety_rules(schema.profession_name, schema.industry)
+    
+    def generate_comprehensive_safety_rules_batch(
+        self,
+        schemas: List[ProfessionSchema],
+        max_concurrency: int = 8,
+        rate_limiter=None,
+        on_result: Optional[Callable[[ProfessionSchema, SafetyRules], None]] = None
+    ) -> List[SafetyRules]:
+        """
+        Generate safety rules for many professions in one batched submission.
+        
+        All prompts are built up front and sent concurrently, so total time is
+        close to the slowest single request rather than the sum of them.
+        Must be called from synchronous code (it runs its own event loop).
+        
+        Args:
+            schemas: ProfessionSchemas to generate safety rules for
+            max_concurrency: Maximum number of requests in flight at once
+            rate_limiter: Optional RateLimiter pacing requests below RPM/TPM limits
+            on_result: Optional callback(schema, safety_rules) run as each one completes
             
-            # Parse JSON response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                safety_data = json.loads(json_match.group(0))
-                
-                # Create SafetyRules object
-                safety_rules = SafetyRules(
-                    critical=safety_data.get("critical_rules", [])[:15],  # Cap at 15
-                    important=safety_data.get("important_rules", [])[:10],
-                    best_practices=safety_data.get("best_practices", [])[:15]
-                )
-                
-                # Store regulatory context in schema metadata if available
-                if "regulatory_context" in safety_data:
-                    schema.constraints.regulatory = safety_data["regulatory_context"].get("primary_regulations", [])
-                
+        Returns:
+            SafetyRules for each schema, in the same order
+        """
+        async def run_batch() -> List[SafetyRules]:
+            try:
+                return await self.agenerate_comprehensive_safety_rules_batch(schemas, max_concurrency, rate_limiter, on_result)
+            finally:
+                # The provider's async client belongs to this loop; close it before the loop ends
+                aclose = getattr(self.llm, "aclose", None)
+                if aclose:
+                    await aclose()
+        
+        return asyncio.run(run_batch())
+    
+    async def agenerate_comprehensive_safety_rules_batch(
+        self,
+        schemas: List[ProfessionSchema],
+        max_concurrency: int = 8,
+        rate_limiter=None,
+        on_result: Optional[Callable[[ProfessionSchema, SafetyRules], None]] = None
+    ) -> List[SafetyRules]:
+        """Async variant of generate_comprehensive_safety_rules_batch."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(schema: ProfessionSchema) -> SafetyRules:
+            async with semaphore:
+                safety_rules = await self.agenerate_comprehensive_safety_rules(schema, rate_limiter)
+            if on_result:
+                on_result(schema, safety_rules)
+            return safety_rules
+        
+        return await asyncio.gather(*(run(schema) for schema in schemas))
+    
+    async def agenerate_comprehensive_safety_rules(self, schema: ProfessionSchema, rate_limiter=None) -> SafetyRules:
+        """Async variant of generate_comprehensive_safety_rules, optionally rate limited."""
+        cached = self._cached_safety_rules(schema)
+        if cached is not None:
+            return cached
+        
+        messages = self._build_safety_messages(schema)
+        
+        try:
+            if rate_limiter:
+                # Only the short per-profession message needs tokenizing per request
+                await rate_limiter.acquire(tokens=_system_prompt_tokens() + estimate_tokens(messages[-1]["content"]))
+            response = await self.llm.agenerate(messages, temperature=0.3)
+            safety_rules = self._parse_safety_response(schema, response)
+            if safety_rules is not None:
                 return safety_rules
-                
         except Exception as e:
             print(f"Failed to generate safety rules via LLM: {e}")
         
         # Fallback: basic safety rules
-        return self._generate_fallback_safety_rules(profession, industry)
+        return self._generate_fallback_safety_rules(schema.profession_name, schema.industry)
+    
+    @staticmethod
+    def _safety_cache_key(schema: ProfessionSchema) -> str:
+        return f"{schema.profession_id} | {schema.profession_name} in {schema.industry}"
+    
+    def _cached_safety_rules(self, schema: ProfessionSchema) -> Optional[SafetyRules]:
+        """Safety rules previously generated for exactly this profession and industry.
+        
+        Looked up by exact key only: rules for a similar-sounding profession
+        can miss obligations this one has.
+        """
+        if not self.semantic_cache:
+            return None
+        safety_data = self.semantic_cache.get(self._safety_cache_key(schema), namespace="safety_rules", exact=True)
+        if safety_data is None:
+            return None
+        return self._safety_rules_from_data(schema, safety_data)
+    
+    def _build_safety_messages(self, schema: ProfessionSchema) -> List[Dict[str, str]]:
+        """Build the chat messages for the 6-question safety-rule prompt."""
+        profession = schema.profession_name
+        industry = schema.industry
+        
+        # Static instructions go first and the profession last, so every request
+        # shares a byte-identical prefix that provider-side prompt caches can reuse
+        messages = [
+            {"role": "system", "content": SAFETY_RULES_SYSTEM_PROMPT},
+            {"role": "user", "content": f"""Generate comprehensive safety rules for a {profession} working in {industry}.
+
+Be specific to {profession} in {industry}. Focus on rules that prevent legal violations, protect people from harm, and ensure ethical practice.
+
+Return ONLY valid JSON."""}
+        ]
+        return messages
+    
+    def _parse_safety_response(self, schema: ProfessionSchema, response: str) -> Optional[SafetyRules]:
+        """Parse an LLM safety-rule reply; returns None if it holds no JSON object."""
+        json_match = re.search(r'\{.*\}', response, re.DOTALL)
+        if not json_match:
+            return None
+        
+        safety_data = json.loads(json_match.group(0))
+        if self.semantic_cache:
+            self.semantic_cache.set(self._safety_cache_key(schema), safety_data, namespace="safety_rules", exact=True)
+        return self._safety_rules_from_data(schema, safety_data)
+    
+    def _safety_rules_from_data(self, schema: ProfessionSchema, safety_data: Dict[str, Any]) -> SafetyRules:
+        """Build SafetyRules from parsed LLM JSON, recording regulatory context on the schema."""
+        # Create SafetyRules object
+        safety_rules = SafetyRules(
+            critical=safety_data.get("critical_rules", [])[:15],  # Cap at 15
+            important=safety_data.get("important_rules", [])[:10],
+            best_practices=safety_data.get("best_practices", [])[:15]
+        )
+        
+        # Store regulatory context in schema metadata if available
+        if "regulatory_context" in safety_data:
+            schema.constraints.regulatory = safety_data["regulatory_context"].get("primary_regulations", [])
+        
+        return safety_rules
     
     def _generate_fallback_safety_rules(self, profession: str, industry: str) -> SafetyRules:
         """Generate basic fallback safety rules when LLM generation fails."""
@@ -573,6 +699,17 @@ Return ONLY valid JSON."""
             ]
         )
     
+    @staticmethod
+    def template_filename(profession: str, industry: str) -> str:
+        """File name of the safety template for a profession/industry pair."""
+        profession_key = profession.lower().replace(" ", "_").replace("/", "_")
+        industry_key = industry.lower().replace(" ", "_").replace("/", "_")
+        return f"{profession_key}_{industry_key}.json"
+    
+    def safety_template_path(self, profession: str, industry: str) -> Path:
+        """Canonical path of a profession's safety template (no file I/O)."""
+        return self.template_dir / self.template_filename(profession, industry)
+    
     def load_safety_template(self, profession: str, industry: str) -> Optional[SafetyRules]:
         """
         Load pre-generated safety rules template if available.
@@ -584,11 +721,7 @@ Return ONLY valid JSON."""
         Returns:
             SafetyRules if template exists, None otherwise
         """
-        # Normalize names for filename
-        profession_key = profession.lower().replace(" ", "_").replace("/", "_")
-        industry_key = industry.lower().replace(" ", "_").replace("/", "_")
-        
-        template_path = self.template_dir / f"{profession_key}_{industry_key}.json"
+        template_path = self.safety_template_path(profession, industry)
         
         if template_path.exists():
             try:
@@ -606,7 +739,7 @@ Return ONLY valid JSON."""
         
         return None
     
-    def save_safety_template(self, profession: str, industry: str, safety_rules: SafetyRules):
+    def save_safety_template(self, profession: str, industry: str, safety_rules: SafetyRules, verbose: bool = True):
         """
         Save safety rules as a reusable template.
         
@@ -614,12 +747,9 @@ Return ONLY valid JSON."""
             profession: Profession name
             industry: Industry name
             safety_rules: SafetyRules to save
+            verbose: Whether to print a confirmation line
         """
-        # Normalize names for filename
-        profession_key = profession.lower().replace(" ", "_").replace("/", "_")
-        industry_key = industry.lower().replace(" ", "_").replace("/", "_")
-        
-        template_path = self.template_dir / f"{profession_key}_{industry_key}.json"
+        template_path = self.safety_template_path(profession, industry)
         
         try:
             template_data = {
@@ -635,7 +765,8 @@ Return ONLY valid JSON."""
             with open(template_path, 'w', encoding='utf-8') as f:
                 json.dump(template_data, f, indent=2, ensure_ascii=False)
             
-            print(f"💾 Saved safety template: {profession} ({industry})")
+            if verbose:
+                print(f"💾 Saved safety template: {profession} ({industry})")
         except Exception as e:
             print(f"Failed to save safety template: {e}")
     
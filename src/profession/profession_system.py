@@ -4,6 +4,7 @@ Main coordinator for profession-aware AI interactions
 """
 from typing import Dict, Any, Optional, List
 from pathlib import Path
+import asyncio
 from .schema import ProfessionSchema
 from .onboarding_interpreter import OnboardingInterpreter
 from .knowledge_expansion import KnowledgeExpansionLayer
@@ -11,6 +12,7 @@ from .reasoning import ProfessionReasoningLayer, ParallelSelfAlignment
 from .interactive_onboarding import InteractiveOnboarding
 from ..cognitive_profile import CognitiveProfile, ProfileManager
 from ..llm_provider import LLMProvider
+from ..semantic_cache import SemanticCache
 
 
 class UniversalProfessionSystem:
@@ -21,22 +23,27 @@ class UniversalProfessionSystem:
         llm_provider: LLMProvider,
         data_dir: Path,
         google_api_key: str = None,
-        google_cse_id: str = None
+        google_cse_id: str = None,
+        use_semantic_cache: bool = True
     ):
         self.llm = llm_provider
         self.data_dir = Path(data_dir)
         self.profession_dir = self.data_dir / "professions"
         self.profession_dir.mkdir(parents=True, exist_ok=True)
         
+        # Reuse LLM results across paraphrased queries and similar professions
+        self.semantic_cache = SemanticCache(self.data_dir / "semantic_cache") if use_semantic_cache else None
+        
         # Initialize components
         self.onboarding = OnboardingInterpreter(llm_provider)
         self.knowledge_expansion = KnowledgeExpansionLayer(
             llm_provider,
             google_api_key or "",
             google_cse_id or "",
-            self.data_dir / "knowledge_cache"
+            self.data_dir / "knowledge_cache",
+            semantic_cache=self.semantic_cache
         )
-        self.reasoning = ProfessionReasoningLayer(llm_provider)
+        self.reasoning = ProfessionReasoningLayer(llm_provider, semantic_cache=self.semantic_cache)
         self.alignment = ParallelSelfAlignment()
         self.interactive = InteractiveOnboarding(llm_provider)
         
@@ -110,6 +117,15 @@ class UniversalProfessionSystem:
         
         return schema
     
+    async def aonboard_profession(
+        self,
+        user_input: str,
+        user_id: str,
+        interactive: bool = False
+    ) -> ProfessionSchema:
+        """Async variant of onboard_profession; runs the blocking pipeline in a worker thread."""
+        return await asyncio.to_thread(self.onboard_profession, user_input, user_id, interactive)
+    
     def load_profession_schema(self, identifier: str) -> Optional[ProfessionSchema]:
         """Load profession schema by user_id or full profession_id."""
         # Check cache
@@ -205,6 +221,18 @@ class UniversalProfessionSystem:
             "needs_onboarding": False
         }
     
+    async def aprocess_query(
+        self,
+        query: str,
+        user_id: str,
+        cognitive_profile: CognitiveProfile,
+        conversation_history: List[Dict] = None
+    ) -> Dict[str, Any]:
+        """Async variant of process_query; runs it in a worker thread."""
+        return await asyncio.to_thread(
+            self.process_query, query, user_id, cognitive_profile, conversation_history
+        )
+    
     def validate_response(
         self,
         response: str,
@@ -233,6 +261,14 @@ class UniversalProfessionSystem:
             profession_schema, cognitive_profile
         )
     
+    async def acreate_aligned_persona(
+        self,
+        user_id: str,
+        cognitive_profile: CognitiveProfile
+    ) -> Dict[str, Any]:
+        """Async variant of create_aligned_persona; runs it in a worker thread."""
+        return await asyncio.to_thread(self.create_aligned_persona, user_id, cognitive_profile)
+    
     def get_profession_summary(self, user_id: str) -> Optional[str]:
         """Get a summary of user's profession for display."""
         profession_schema = self.load_profession_schema(user_id)
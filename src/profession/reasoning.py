@@ -10,8 +10,10 @@ from ..cognitive_profile import CognitiveProfile
 class ProfessionReasoningLayer:
     """Injects profession context into reasoning and decision-making."""
     
-    def __init__(self, llm_provider):
+    def __init__(self, llm_provider, semantic_cache=None):
         self.llm = llm_provider
+        # Optional SemanticCache reused for paraphrased queries
+        self.semantic_cache = semantic_cache
     
     def enhance_prompt(
         self,
@@ -209,6 +211,13 @@ Consider the above context when responding. Provide advice that:
         
         Returns structured decision factors to help with reasoning.
         """
+        # Factors depend only on the query and profession, so paraphrases can share them
+        cache_namespace = f"decision_factors:{profession_schema.profession_name}|{profession_schema.industry}"
+        if self.semantic_cache:
+            cached = self.semantic_cache.get(query, namespace=cache_namespace)
+            if cached is not None:
+                return cached
+        
         factors_prompt = f"""Analyze this query from a {profession_schema.profession_name} perspective:
 "{query}"
 
@@ -240,6 +249,8 @@ Return ONLY valid JSON."""
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if json_match:
                 factors = json.loads(json_match.group(0))
+                if self.semantic_cache:
+                    self.semantic_cache.set(query, factors, namespace=cache_namespace)
                 return factors
         except Exception as e:
             print(f"Failed to extract decision factors: {e}")
@@ -202,7 +202,13 @@ class ProfessionSchema:
         return convert_value(self.__dict__)
     
     def to_json(self, indent: int = 2) -> str:
-        """Convert to JSON string."""
+        """Convert to JSON string (via orjson when installed)."""
+        if indent == 2:
+            try:
+                import orjson  # type: ignore
+                return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2).decode()
+            except ImportError:
+                pass
         return json.dumps(self.to_dict(), indent=indent)
     
     def save(self, filepath: Path):
@@ -210,6 +216,15 @@ class ProfessionSchema:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(self.to_json())
     
+    @classmethod
+    def minimal(cls, profession_name: str, industry: str, profession_id: str = None) -> 'ProfessionSchema':
+        """Placeholder schema carrying only name and industry (e.g. for safety templates)."""
+        return cls(
+            profession_id=profession_id or profession_name.lower().replace(' ', '_'),
+            profession_name=profession_name,
+            industry=industry
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ProfessionSchema':
         """Load from dictionary."""
@@ -249,8 +264,12 @@ class ProfessionSchema:
     @classmethod
     def load(cls, filepath: Path) -> 'ProfessionSchema':
         """Load schema from file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        try:
+            import orjson  # type: ignore
+            data = orjson.loads(Path(filepath).read_bytes())
+        except ImportError:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         return cls.from_dict(data)
     
     def get_context_summary(self, max_length: int = 1000) -> str:
@@ -78,10 +78,18 @@ class QuestionRouter:
         'frontend and backend', 'database to ui', 'deployment pipeline'
     ]
     
+    # Words suggesting the question follows up on earlier turns
+    FOLLOW_UP_WORDS = ("that", "those", "it", "them", "previous", "earlier", "as above")
+    
     def __init__(self, personas_dir: Path):
         self.personas_dir = personas_dir
         self.available_personas = self._load_available_personas()
         self.profession_experts = self._load_profession_experts()
+        # Domain patterns compiled once, not looked up in re's cache per question
+        self._domain_regexes = {
+            domain: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for domain, patterns in self.DOMAIN_PATTERNS.items()
+        }
     
     def _load_available_personas(self) -> Dict[str, Dict[str, Any]]:
         """Load all available expert personas."""
@@ -126,11 +134,8 @@ class QuestionRouter:
 
         # Detect domains
         domain_scores = {}
-        for domain, patterns in self.DOMAIN_PATTERNS.items():
-            score = 0
-            for pattern in patterns:
-                matches = re.findall(pattern, question_lower, re.IGNORECASE)
-                score += len(matches)
+        for domain, regexes in self._domain_regexes.items():
+            score = sum(len(regex.findall(question_lower)) for regex in regexes)
             if score > 0:
                 domain_scores[domain] = score
 
@@ -161,9 +166,7 @@ class QuestionRouter:
         confidence = min(1.0, (sorted_domains[0][1] / 3.0) if sorted_domains else 0.0)
 
         # Boost confidence if follow-up detected (pronouns, references to previous turns)
-        if conversation_history and any(
-            w in question_lower for w in ["that", "those", "it", "them", "previous", "earlier", "as above"]
-        ):
+        if conversation_history and any(w in question_lower for w in self.FOLLOW_UP_WORDS):
             confidence = min(1.0, confidence + 0.2)
 
         return QuestionAnalysis(
@@ -182,6 +185,8 @@ class QuestionRouter:
         question_lower = question.lower()
 
         selected_personas = []
+        # Same for every expert, so checked once
+        is_follow_up = bool(conversation_history) and any(w in question_lower for w in self.FOLLOW_UP_WORDS)
 
         # First, check profession experts (highest priority for professional questions)
         profession_match = None
@@ -202,9 +207,7 @@ class QuestionRouter:
                     match_score += 1
 
             # Boost match score if follow-up detected in context
-            if conversation_history and any(
-                w in question_lower for w in ["that", "those", "it", "them", "previous", "earlier", "as above"]
-            ):
+            if is_follow_up:
                 match_score += 1
 
             if match_score > best_match_score:
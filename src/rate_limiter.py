@@ -0,0 +1,100 @@
+"""
+MetaPersona - Rate Limiter
+Token-bucket throttling that paces LLM requests below the account's
+requests-per-minute and tokens-per-minute limits, so batches don't burn
+round trips on 429 responses.
+"""
+import os
+import time
+import asyncio
+from typing import Optional
+
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token cost of a prompt, using tiktoken when installed."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken # type: ignore
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    # Rough fallback: ~4 characters per token
+    return len(text) // 4 + 1
+
+
+class RateLimiter:
+    """Token-bucket limiter for request and token capacity.
+
+    Capacity refills continuously up to the per-minute limit; ``acquire``
+    waits until both buckets can cover the request, then spends from them.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_request_capacity = requests_per_minute or 0.0
+        self.available_token_capacity = tokens_per_minute or 0.0
+        self.last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['RateLimiter']:
+        """Build a limiter from RPM_LIMIT / TPM_LIMIT, or None if neither is set."""
+        rpm = os.getenv("RPM_LIMIT")
+        tpm = os.getenv("TPM_LIMIT")
+        if not rpm and not tpm:
+            return None
+        return cls(
+            requests_per_minute=float(rpm) if rpm else None,
+            tokens_per_minute=float(tpm) if tpm else None
+        )
+
+    def _replenish(self):
+        """Refill both buckets for the time elapsed since the last update."""
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        if self.requests_per_minute:
+            self.available_request_capacity = min(
+                self.requests_per_minute,
+                self.available_request_capacity + self.requests_per_minute * elapsed / 60.0
+            )
+        if self.tokens_per_minute:
+            self.available_token_capacity = min(
+                self.tokens_per_minute,
+                self.available_token_capacity + self.tokens_per_minute * elapsed / 60.0
+            )
+
+    def _wait_time(self, tokens: int) -> float:
+        """Seconds until both buckets can cover a request of the given size."""
+        wait = 0.0
+        if self.requests_per_minute and self.available_request_capacity < 1:
+            wait = max(wait, (1 - self.available_request_capacity) * 60.0 / self.requests_per_minute)
+        if self.tokens_per_minute and self.available_token_capacity < tokens:
+            wait = max(wait, (tokens - self.available_token_capacity) * 60.0 / self.tokens_per_minute)
+        return wait
+
+    async def acquire(self, text: str = "", tokens: Optional[int] = None):
+        """Wait until there is capacity for one request of the given size."""
+        cost = tokens if tokens is not None else estimate_tokens(text)
+        if self.tokens_per_minute:
+            # A single oversized request can never exceed a full bucket
+            cost = min(cost, self.tokens_per_minute)
+
+        async with self._lock:
+            while True:
+                self._replenish()
+                wait = self._wait_time(cost)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.requests_per_minute:
+                self.available_request_capacity -= 1
+            if self.tokens_per_minute:
+                self.available_token_capacity -= cost
@@ -0,0 +1,53 @@
+"""
+MetaPersona - Response Cache
+On-disk cache of LLM responses keyed by model, system prompt and task.
+"""
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+
+class ResponseCache:
+    """Stores one JSON file per cached response under ``cache_dir``."""
+
+    def __init__(self, cache_dir: str = "./data/response_cache"):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, task: str) -> str:
+        """Hash the request; tasks differing only in case/whitespace share a key."""
+        normalized_task = " ".join(task.lower().split())
+        return hashlib.sha256(f"{model}|{system_prompt}|{normalized_task}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, system_prompt: str, task: str) -> Optional[str]:
+        """Return the cached response, or None on a miss."""
+        cache_file = self.cache_dir / f"{self.make_key(model, system_prompt, task)}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)["response"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, model: str, system_prompt: str, task: str, response: str):
+        """Cache a response."""
+        cache_file = self.cache_dir / f"{self.make_key(model, system_prompt, task)}.json"
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "model": model,
+                "task": task,
+                "response": response,
+                "cached_at": datetime.now().isoformat()
+            }, f, indent=2)
+
+    def clear(self) -> int:
+        """Delete all cached responses. Returns the number removed."""
+        removed = 0
+        for cache_file in self.cache_dir.glob("*.json"):
+            cache_file.unlink()
+            removed += 1
+        return removed
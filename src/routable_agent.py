@@ -0,0 +1,122 @@
+"""
+Routing view of registry agents.
+
+The AgentRegistry holds SingleUseAgents, which answer through process_turn and
+carry no capability metadata. RoutableAgent gives them the BaseAgent surface
+the TaskRouter and the chat loops use: a confidence score for the agent's role
+and TaskResult-returning task methods.
+"""
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import re
+
+from .task_result import TaskResult
+
+
+# Keywords that signal each specialist role; an agent whose id is not listed
+# here only scores GENERALIST_CONFIDENCE (generalist) or 0
+ROLE_KEYWORDS = {
+    "researcher": re.compile(
+        r"\b(research\w*|find|search|sources?|papers?|literature|investigat\w*|"
+        r"analy[sz]\w*|compare|facts?|history|study|studies|explain)\b",
+        re.IGNORECASE,
+    ),
+    "coder": re.compile(
+        r"\b(code|coding|python|javascript|function|bugs?|debug\w*|scripts?|"
+        r"program\w*|class|api|compile\w*|refactor\w*|implement\w*|tests?|sql|regex)\b",
+        re.IGNORECASE,
+    ),
+    "writer": re.compile(
+        r"\b(write|draft\w*|emails?|essays?|blog|articles?|proofread\w*|rewrite|"
+        r"edit|memo|letter|story|summar\w*|outline)\b",
+        re.IGNORECASE,
+    ),
+}
+
+ROLE_DESCRIPTIONS = {
+    "researcher": "Finds, compares and explains information",
+    "coder": "Writes, reviews and debugs code",
+    "writer": "Drafts, edits and summarizes text",
+    "generalist": "Handles general requests no specialist claims",
+}
+
+# Score of a role with one keyword hit; each further hit adds KEYWORD_STEP
+BASE_KEYWORD_CONFIDENCE = 0.6
+KEYWORD_STEP = 0.1
+
+# Flat score for the generalist, below the router's default threshold so it
+# only wins when no specialist matches
+GENERALIST_CONFIDENCE = 0.3
+
+
+class RoutableAgent:
+    """Adapts a SingleUseAgent to the interface TaskRouter routes on."""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.agent_id = agent.agent_id
+        self.role = agent.agent_id
+        self.description = ROLE_DESCRIPTIONS.get(agent.agent_id, f"{agent.agent_id} agent")
+        self.capabilities = []
+
+    def can_handle_task(self, task: str, context: Optional[Dict[str, Any]] = None) -> float:
+        """Keyword-affinity confidence of the agent's role for a task."""
+        keywords = ROLE_KEYWORDS.get(self.agent_id)
+        if keywords is None:
+            return GENERALIST_CONFIDENCE if self.agent_id == "generalist" else 0.0
+        hits = len(keywords.findall(task))
+        if not hits:
+            return 0.0
+        return min(1.0, BASE_KEYWORD_CONFIDENCE + KEYWORD_STEP * (hits - 1))
+
+    async def acan_handle_task(self, task: str, context: Optional[Dict[str, Any]] = None) -> float:
+        """Score the task; keyword scoring is cheap enough to run inline."""
+        return self.can_handle_task(task, context)
+
+    def handle_task(
+        self,
+        task: str,
+        context: Optional[Dict[str, Any]] = None,
+        use_skills: bool = True
+    ) -> TaskResult:
+        """Run one turn of the wrapped agent and return its styled reply."""
+        message = self.agent.process_turn(task, context=context)
+        result = message.payload.get("result") if message is not None else None
+        if result is None:
+            return TaskResult(success=False, error=f"{self.agent_id} produced no reply")
+        return TaskResult(success=True, result=result)
+
+    async def ahandle_task(
+        self,
+        task: str,
+        context: Optional[Dict[str, Any]] = None,
+        use_skills: bool = True
+    ) -> TaskResult:
+        """Run handle_task in a worker thread."""
+        return await asyncio.to_thread(self.handle_task, task, context, use_skills)
+
+    def handle_task_stream(
+        self,
+        task: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        use_skills: bool = True
+    ) -> TaskResult:
+        """Run handle_task and pass a successful reply on as a single chunk."""
+        result = self.handle_task(task, context, use_skills)
+        if on_token and result.success and result.result:
+            on_token(str(result.result))
+        return result
+
+    def get_mode(self) -> str:
+        return self.agent.get_mode()
+
+    def __repr__(self) -> str:
+        return f"RoutableAgent({self.agent_id!r})"
+
+
+def routable(agent):
+    """Return agent itself if it already scores tasks, else its RoutableAgent."""
+    if agent is None or hasattr(agent, "can_handle_task"):
+        return agent
+    return RoutableAgent(agent)
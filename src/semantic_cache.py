@@ -0,0 +1,197 @@
+"""
+MetaPersona - Semantic Cache
+Reuses LLM results for queries that are paraphrases of ones already answered.
+
+Queries are embedded with sentence-transformers and compared by cosine
+similarity (FAISS inner-product search when installed, numpy otherwise).
+Entries, including their vectors, persist in a single SQLite file. Without
+sentence-transformers the cache still serves exact (case/whitespace
+insensitive) repeats.
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Cosine similarity at or above which a cached entry counts as a hit
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+
+class SemanticCache:
+    """Embedding-similarity cache of JSON-serializable results.
+
+    Entries are grouped by ``namespace`` so unrelated callers (or different
+    professions) never answer each other's queries.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "./data/semantic_cache",
+        threshold: float = DEFAULT_THRESHOLD,
+        model_name: str = DEFAULT_MODEL
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.model_name = model_name
+        self._model = None
+        self._indexes: Dict[str, Any] = {}
+        # Embeddings computed ahead of time by prime(), consumed by get/set
+        self._primed: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cache_dir / "cache.db"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, namespace TEXT, text TEXT, "
+            "normalized TEXT, embedding BLOB, value TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_lookup ON entries (namespace, normalized)")
+        self._db.commit()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def _get_model(self):
+        """Load the embedding model on first use (False if unavailable)."""
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer  # type: ignore
+                self._model = SentenceTransformer(self.model_name)
+            except ImportError:
+                self._model = False
+        return self._model
+
+    def _embed(self, text: str):
+        """Unit-length float32 embedding of text, or None without a model."""
+        if text in self._primed:
+            return self._primed[text]
+        model = self._get_model()
+        if not model:
+            return None
+        return model.encode([text], convert_to_numpy=True, normalize_embeddings=True)[0].astype("float32")
+    
+    def prime(self, texts: List[str], batch_size: int = 64) -> None:
+        """Embed many upcoming texts in one batched pass instead of one at a time."""
+        model = self._get_model()
+        if not model:
+            return
+        todo = [text for text in dict.fromkeys(texts) if text not in self._primed]
+        if not todo:
+            return
+        vectors = model.encode(todo, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+        with self._lock:
+            self._primed.update(zip(todo, vectors.astype("float32")))
+
+    def _get_index(self, namespace: str):
+        """(search structure, row ids) over the namespace's stored vectors."""
+        if namespace not in self._indexes:
+            import numpy as np
+            rows = self._db.execute(
+                "SELECT id, embedding FROM entries WHERE namespace = ? AND embedding IS NOT NULL",
+                (namespace,)
+            ).fetchall()
+            ids = [row_id for row_id, _ in rows]
+            vectors = [np.frombuffer(blob, dtype="float32") for _, blob in rows]
+            self._indexes[namespace] = (self._build_index(vectors), ids)
+        return self._indexes[namespace]
+
+    @staticmethod
+    def _build_index(vectors):
+        """FAISS inner-product index if installed, else a plain list of vectors."""
+        try:
+            import faiss  # type: ignore
+        except ImportError:
+            return list(vectors)
+        if not vectors:
+            return None
+        import numpy as np
+        index = faiss.IndexFlatIP(len(vectors[0]))
+        index.add(np.stack(vectors))
+        return index
+
+    @staticmethod
+    def _add_to_index(index, vector):
+        if isinstance(index, list):
+            index.append(vector)
+            return index
+        if index is None:
+            return SemanticCache._build_index([vector])
+        index.add(vector.reshape(1, -1))
+        return index
+
+    @staticmethod
+    def _search(index, vector):
+        """(position, similarity) of the nearest stored vector, or None."""
+        if isinstance(index, list):
+            if not index:
+                return None
+            import numpy as np
+            scores = np.stack(index) @ vector
+            best = int(scores.argmax())
+            return best, float(scores[best])
+        if index is None or index.ntotal == 0:
+            return None
+        scores, positions = index.search(vector.reshape(1, -1), 1)
+        return int(positions[0][0]), float(scores[0][0])
+
+    def get(self, text: str, namespace: str = "default", exact: bool = False) -> Optional[Any]:
+        """Return the cached value for text or a close paraphrase, or None.
+
+        With exact=True only a (case/whitespace insensitive) repeat of text hits.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND normalized = ? LIMIT 1",
+                (namespace, self._normalize(text))
+            ).fetchone()
+            if row:
+                return json.loads(row[0])
+            if exact:
+                return None
+
+            vector = self._embed(text)
+            if vector is None:
+                return None
+            index, ids = self._get_index(namespace)
+            hit = self._search(index, vector)
+            if hit is None or hit[1] < self.threshold:
+                return None
+            row = self._db.execute("SELECT value FROM entries WHERE id = ?", (ids[hit[0]],)).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def set(self, text: str, value: Any, namespace: str = "default", exact: bool = False):
+        """Cache a JSON-serializable value for text.
+
+        With exact=True the entry is stored without an embedding, so it is
+        never returned for paraphrases.
+        """
+        with self._lock:
+            vector = None if exact else self._embed(text)
+            cursor = self._db.execute(
+                "INSERT INTO entries (namespace, text, normalized, embedding, value) VALUES (?, ?, ?, ?, ?)",
+                (
+                    namespace,
+                    text,
+                    self._normalize(text),
+                    vector.tobytes() if vector is not None else None,
+                    json.dumps(value)
+                )
+            )
+            self._db.commit()
+            # Stored now, so exact lookups find it without the primed vector
+            self._primed.pop(text, None)
+            if vector is not None and namespace in self._indexes:
+                index, ids = self._indexes[namespace]
+                self._indexes[namespace] = (self._add_to_index(index, vector), ids + [cursor.lastrowid])
+
+    def clear(self) -> int:
+        """Delete all cached entries. Returns the number removed."""
+        with self._lock:
+            removed = self._db.execute("DELETE FROM entries").rowcount
+            self._db.commit()
+            self._indexes.clear()
+            self._primed.clear()
+            return removed
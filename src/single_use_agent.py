@@ -44,7 +44,7 @@ class SingleUseAgent:
         self.router.register_agent('agent_fallback', persona_handler(handler_reflection, 'fallback'))
         self.cognitive_loop = CognitiveLoop(self.router, self.mode_manager, self.memory, self.task_context, persona_context=self.persona_context)
 
-    def process_turn(self, user_message: str):
+    def process_turn(self, user_message: str, context=None):
         # Optionally evolve persona context based on memory or feedback
         # (stub: could use self.memory or external feedback)
         # Return the full AgentMessage object for test access
@@ -54,7 +54,7 @@ class SingleUseAgent:
                 receiver="agent",
                 intent="request",
                 payload={"user_message": user_message},
-                metadata={"persona_context": self.persona_context}
+                metadata={"persona_context": self.persona_context, "task_context": context or {}}
             )
         )
         # Still run the persona pipeline and memory update
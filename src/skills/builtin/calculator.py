@@ -2,10 +2,60 @@
 Calculator Skill
 Performs mathematical calculations.
 """
+import ast
 import math
+from functools import lru_cache
 from typing import Any
 from ..base import Skill, SkillMetadata, SkillParameter, SkillResult
 
+# Names available to expressions (eval needs a real dict, so never mutate it)
+SAFE_GLOBALS = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "pow": pow,
+    "sqrt": math.sqrt,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "log": math.log,
+    "log10": math.log10,
+    "exp": math.exp,
+    "pi": math.pi,
+    "e": math.e,
+    "__builtins__": {}
+}
+
+# Syntax allowed in expressions: arithmetic, comparisons and calls to SAFE_GLOBALS
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.Call, ast.Name, ast.Load, ast.Constant, ast.Tuple, ast.List,
+    ast.operator, ast.unaryop, ast.boolop, ast.cmpop
+)
+
+
+def _validate(tree: ast.AST) -> None:
+    """Reject anything beyond plain math (attribute access, unknown names, ...)."""
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Name) and (node.id not in SAFE_GLOBALS or node.id.startswith("__")):
+            raise ValueError(f"Unknown name: {node.id}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        if isinstance(node, ast.Call) and (node.keywords or not isinstance(node.func, ast.Name)):
+            raise ValueError("Only positional calls to math functions are supported")
+
+
+@lru_cache(maxsize=1024)
+def _compile(expression: str):
+    """Parse, validate and compile an expression once; repeats reuse the code object."""
+    tree = ast.parse(expression.strip(), mode="eval")
+    _validate(tree)
+    return compile(tree, "<calc>", "eval")
+
 
 class CalculatorSkill(Skill):
     """Mathematical calculator skill."""
@@ -29,27 +79,7 @@ class CalculatorSkill(Skill):
     def execute(self, expression: str) -> SkillResult:
         """Evaluate a mathematical expression."""
         try:
-            # Safe eval with math functions
-            safe_dict = {
-                "abs": abs,
-                "round": round,
-                "min": min,
-                "max": max,
-                "sum": sum,
-                "pow": pow,
-                "sqrt": math.sqrt,
-                "sin": math.sin,
-                "cos": math.cos,
-                "tan": math.tan,
-                "log": math.log,
-                "log10": math.log10,
-                "exp": math.exp,
-                "pi": math.pi,
-                "e": math.e,
-                "__builtins__": {}
-            }
-            
-            result = eval(expression, safe_dict, {})
+            result = eval(_compile(expression), SAFE_GLOBALS, {})
             
             return SkillResult(
                 success=True,
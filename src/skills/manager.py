@@ -3,6 +3,7 @@ Skill Manager
 Handles skill execution, chaining, and coordination.
 """
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from .base import Skill, SkillResult, SkillRegistry, get_registry
@@ -52,35 +53,93 @@ class SkillManager:
                 error=f"Skill execution failed: {str(e)}"
             )
     
-    def chain_skills(self, skill_chain: List[Dict[str, Any]]) -> List[SkillResult]:
-        """Execute a chain of skills, passing results forward."""
-        results = []
-        context = {}
-        
-        for step in skill_chain:
-            skill_name = step.get("skill")
-            parameters = step.get("parameters", {})
-            
-            # Support variable substitution from previous results
-            for key, value in parameters.items():
-                if isinstance(value, str) and value.startswith("$"):
-                    var_name = value[1:]
-                    if var_name in context:
-                        parameters[key] = context[var_name]
+    def chain_skills(self, skill_chain: List[Dict[str, Any]], parallel: bool = False) -> List[SkillResult]:
+        """Execute a chain of skills, passing results forward.
+        
+        Steps run one after another and the chain stops at the first failing
+        step without ``continue_on_error``. With ``parallel=True`` a step
+        waits only for the earlier steps whose output it references
+        (``"$var"`` parameters) and independent steps run concurrently in a
+        thread pool; results are still returned in chain order up to the
+        first failure, but independent steps after it may already have run.
+        """
+        dependencies = self._chain_dependencies(skill_chain)
+        if parallel:
+            layers = self._chain_layers(dependencies)
+        else:
+            layers = [[i] for i in range(len(skill_chain))]
+        
+        results: Dict[int, SkillResult] = {}
+        stop_at = len(skill_chain)
+        
+        for layer in layers:
+            # Once a step has failed, only earlier steps still need to run
+            layer = [i for i in layer if i < stop_at]
+            if not layer:
+                continue
             
-            result = self.execute_skill(skill_name, **parameters)
-            results.append(result)
+            calls = []
+            for i in layer:
+                step = skill_chain[i]
+                parameters = dict(step.get("parameters", {}))
+                
+                # Support variable substitution from previous results: the
+                # latest producer of the variable that succeeded with data
+                for key, producers in dependencies[i].items():
+                    for producer in reversed(producers):
+                        result = results[producer]
+                        if result.success and result.data:
+                            parameters[key] = result.data
+                            break
+                calls.append((step.get("skill"), parameters))
             
-            # Store result in context for next skill
-            if result.success and result.data:
-                output_var = step.get("output_var", f"{skill_name}_result")
-                context[output_var] = result.data
+            if len(calls) == 1:
+                layer_results = [self.execute_skill(calls[0][0], **calls[0][1])]
+            else:
+                with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+                    layer_results = list(executor.map(
+                        lambda call: self.execute_skill(call[0], **call[1]), calls
+                    ))
             
-            # Stop chain if skill fails and no continue flag
-            if not result.success and not step.get("continue_on_error", False):
-                break
+            for i, result in zip(layer, layer_results):
+                results[i] = result
+                # Stop chain if skill fails and no continue flag
+                if not result.success and not skill_chain[i].get("continue_on_error", False):
+                    stop_at = min(stop_at, i)
         
-        return results
+        return [results[i] for i in range(min(stop_at + 1, len(skill_chain)))]
+    
+    @staticmethod
+    def _chain_dependencies(skill_chain: List[Dict[str, Any]]) -> List[Dict[str, List[int]]]:
+        """For each step, map parameter name -> indices of the earlier steps producing its "$var".
+        
+        All producers are kept (oldest first): which one supplies the value
+        depends on which of them succeed.
+        """
+        producers: Dict[str, List[int]] = {}
+        dependencies = []
+        
+        for i, step in enumerate(skill_chain):
+            step_deps = {}
+            for key, value in step.get("parameters", {}).items():
+                if isinstance(value, str) and value.startswith("$") and value[1:] in producers:
+                    step_deps[key] = list(producers[value[1:]])
+            dependencies.append(step_deps)
+            producers.setdefault(step.get("output_var", f"{step.get('skill')}_result"), []).append(i)
+        
+        return dependencies
+    
+    @staticmethod
+    def _chain_layers(dependencies: List[Dict[str, List[int]]]) -> List[List[int]]:
+        """Group step indices into layers whose steps don't depend on each other."""
+        depth: List[int] = []
+        for step_deps in dependencies:
+            depth.append(1 + max((depth[j] for producers in step_deps.values() for j in producers), default=-1))
+        
+        layers: List[List[int]] = [[] for _ in range(max(depth, default=-1) + 1)]
+        for i, level in enumerate(depth):
+            layers[level].append(i)
+        return layers
     
     def get_skill_info(self, skill_name: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a skill."""
@@ -1,7 +1,8 @@
-from typing import Any, Optional
-from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
 
 class TaskResult(BaseModel):
     success: bool
     result: Optional[Any] = None
     error: Optional[str] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
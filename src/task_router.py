@@ -2,18 +2,22 @@
 Task Router for intelligent task distribution across multiple agents.
 Routes tasks to the most suitable agent based on capabilities and confidence scores.
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+from operator import itemgetter
 from datetime import datetime
+import asyncio
+import threading
 from pydantic import BaseModel, Field
 import json
 
-from src.agent_messaging import AgentMessage
-from src.single_use_agent import SingleUseAgent
-
 from .agent_base import BaseAgent
 from .task_result import TaskResult
 from .agent_registry import AgentRegistry
 from .llm_provider import LLMProvider
+from .rate_limiter import RateLimiter
+from .routable_agent import routable
 
 
 class RoutingDecision(BaseModel):
@@ -30,6 +34,14 @@ class RoutingDecision(BaseModel):
         }
 
 
+# Maximum number of distinct tasks whose candidate scores are cached
+SCORE_CACHE_SIZE = 10_000
+
+
+# Number of most recent routing decisions kept in history and stats
+MAX_ROUTING_HISTORY = 1000
+
+
 class TaskRouter:
     """
     Intelligent task router that selects the best agent for each task.
@@ -47,7 +59,8 @@ class TaskRouter:
         default_agent_id: Optional[str] = None,
         min_confidence: float = 0.5,
         llm_provider: Optional[LLMProvider] = None,
-        use_llm_routing: bool = True
+        use_llm_routing: bool = True,
+        rate_limiter: Optional[RateLimiter] = None
     ):
         """
         Initialize the task router.
@@ -58,31 +71,76 @@ class TaskRouter:
             min_confidence: Minimum confidence threshold for routing
             llm_provider: Optional LLM provider for intelligent routing
             use_llm_routing: Whether to use LLM-based routing analysis
+            rate_limiter: Optional RPM/TPM throttle applied to async execution
         """
         self.registry = registry
         self.default_agent_id = default_agent_id
         self.min_confidence = min_confidence
         self.llm_provider = llm_provider
         self.use_llm_routing = use_llm_routing and llm_provider is not None
-        self.routing_history: List[RoutingDecision] = []
-
-    # All task routing is now unified through SingleUseAgent
-    from src.single_use_agent import SingleUseAgent
-    from src.agent_messaging import AgentMessage
+        self.rate_limiter = rate_limiter
+        self.routing_history: "deque[RoutingDecision]" = deque(maxlen=MAX_ROUTING_HISTORY)
+        self._history_lock = threading.Lock()
+        # Running aggregates over routing_history, kept by _record_routing
+        self._sum_conf = 0.0
+        self._count = 0
+        self._agent_usage: Counter = Counter()
+        self._score_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], List[float]]" = OrderedDict()
 
-    def __init__(self, agent_id: str, initial_mode: str = 'greeting'):
-        self.agent_id = agent_id
-        self._single_use_agent = SingleUseAgent(agent_id, initial_mode=initial_mode)
-
-    def handle_message(self, message: AgentMessage) -> AgentMessage:
-        result = self._single_use_agent.process_turn(message.payload.get('user_message', ''))
-        return AgentMessage(
-            sender=self.agent_id,
-            receiver=message.sender,
-            intent='response',
-            payload={'result': result},
-            metadata={}
-        )
+    def route_task(
+        self,
+        task: str,
+        context: Optional[Dict[str, Any]] = None,
+        preferred_role: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        conversation_history: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[BaseAgent]:
+        """
+        Select the best agent for a task and record the decision.
+        
+        Args:
+            task: Task to route
+            context: Optional task context
+            preferred_role: Optional role to choose among first
+            agent_id: Optional specific agent ID (skips scoring)
+            conversation_history: Unused for selection; accepted so callers
+                can pass their execute_task arguments through
+            
+        Returns:
+            The selected agent, or None if no agent is available
+        """
+        if agent_id:
+            agent = self._get(agent_id)
+            if agent:
+                self._record_routing(task, agent, 1.0, [])
+            return agent
+        
+        candidates = self._candidates()
+        if preferred_role:
+            candidates = [a for a in candidates if a.role == preferred_role] or candidates
+        if not candidates:
+            return None
+        
+        scores = self._score_candidates(candidates, task, context)
+        scored_agents = sorted(zip(candidates, scores), key=itemgetter(1), reverse=True)
+        if self.use_llm_routing and len(scored_agents) > 1:
+            scored_agents = sorted(
+                self._enhance_routing_with_llm(task, scored_agents, context),
+                key=itemgetter(1),
+                reverse=True
+            )
+        
+        agent, confidence = scored_agents[0]
+        if confidence < self.min_confidence and self.default_agent_id:
+            agent = self._get(self.default_agent_id) or agent
+        
+        alternatives = [
+            {"agent_id": other.agent_id, "confidence": score}
+            for other, score in scored_agents[:4]
+            if other is not agent
+        ][:3]
+        self._record_routing(task, agent, confidence, alternatives)
+        return agent
     
     def execute_task(
         self,
@@ -121,6 +179,7 @@ class TaskRouter:
             if conversation_history:
                 context_with_history["conversation_history"] = conversation_history
             result = agent.handle_task(task, context_with_history, use_skills)
+            result.metadata.setdefault("agent_id", agent.agent_id)
             return result
         except Exception as e:
             return TaskResult(
@@ -129,6 +188,71 @@ class TaskRouter:
                 error=f"Agent execution failed: {str(e)}"
             )
     
+    async def aexecute_task(
+        self,
+        task: str,
+        context: Optional[Dict[str, Any]] = None,
+        preferred_role: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        use_skills: bool = True,
+        conversation_history: Optional[List[Dict[str, Any]]] = None
+    ) -> TaskResult:
+        """
+        Route and execute a task without blocking the event loop.
+        
+        Runs execute_task in a worker thread so independent tasks can be
+        dispatched together with asyncio.gather. If a rate limiter is
+        configured, waits for request/token capacity first.
+        
+        Returns:
+            TaskResult from the selected agent
+        """
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(task)
+        return await asyncio.to_thread(
+            self.execute_task,
+            task,
+            context,
+            preferred_role,
+            agent_id,
+            use_skills,
+            conversation_history
+        )
+    
+    async def aexecute_batch(
+        self,
+        tasks: List[str],
+        max_concurrency: int = 10,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        **kwargs
+    ) -> List[TaskResult]:
+        """
+        Route and execute several tasks concurrently.
+        
+        Args:
+            tasks: Tasks to execute
+            max_concurrency: Maximum number of tasks in flight at once
+            on_progress: Optional callback invoked as (done, total) after each task
+            **kwargs: Passed through to aexecute_task
+            
+        Returns:
+            TaskResults in the same order as tasks
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        total = len(tasks)
+        done = 0
+        
+        async def run(task: str) -> TaskResult:
+            nonlocal done
+            async with semaphore:
+                result = await self.aexecute_task(task, **kwargs)
+            done += 1
+            if on_progress:
+                on_progress(done, total)
+            return result
+        
+        return await asyncio.gather(*(run(task) for task in tasks))
+    
     def get_routing_stats(self) -> Dict[str, Any]:
         """
         Get statistics about routing decisions.
@@ -136,28 +260,21 @@ class TaskRouter:
         Returns:
             Dictionary with routing analytics
         """
-        if not self.routing_history:
+        with self._history_lock:
+            if not self._count:
+                return {
+                    "total_routes": 0,
+                    "agent_usage": {},
+                    "average_confidence": 0.0,
+                    "most_used_agent": None
+                }
+            
             return {
-                "total_routes": 0,
-                "agent_usage": {},
-                "average_confidence": 0.0,
-                "most_used_agent": None
+                "total_routes": self._count,
+                "agent_usage": dict(self._agent_usage),
+                "average_confidence": self._sum_conf / self._count,
+                "most_used_agent": self._agent_usage.most_common(1)[0][0]
             }
-        
-        agent_usage = {}
-        total_confidence = 0.0
-        
-        for decision in self.routing_history:
-            agent_id = decision.selected_agent_id
-            agent_usage[agent_id] = agent_usage.get(agent_id, 0) + 1
-            total_confidence += decision.confidence
-        
-        return {
-            "total_routes": len(self.routing_history),
-            "agent_usage": agent_usage,
-            "average_confidence": total_confidence / len(self.routing_history),
-            "most_used_agent": max(agent_usage, key=agent_usage.get) if agent_usage else None
-        }
     
     def get_recent_routes(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -169,7 +286,8 @@ class TaskRouter:
         Returns:
             List of recent routing decisions
         """
-        recent = self.routing_history[-limit:]
+        with self._history_lock:
+            recent = list(islice(reversed(self.routing_history), limit))[::-1]
         return [decision.model_dump() for decision in recent]
     
     def explain_routing(self, task: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -184,7 +302,7 @@ class TaskRouter:
         Returns:
             Detailed explanation of routing decision
         """
-        candidates = self.registry.list_all()
+        candidates = self._candidates()
         
         if not candidates:
             return {
@@ -193,20 +311,21 @@ class TaskRouter:
                 "candidates": []
             }
         
-        scored_agents = []
-        for agent in candidates:
-            confidence = agent.can_handle_task(task, context)
-            scored_agents.append({
-                "agent_id": agent.agent_id,
-                "role": agent.role,
-                "description": agent.description,
-                "confidence": confidence,
-                "meets_threshold": confidence >= self.min_confidence,
-                "capabilities": [cap.model_dump() for cap in agent.capabilities]
-            })
+        scores = self._score_candidates(candidates, task, context)
         
-        # Sort by confidence
-        scored_agents.sort(key=lambda x: x["confidence"], reverse=True)
+        # Rank on the flat score list, then build each candidate entry once in order
+        ranking = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        scored_agents = [
+            {
+                "agent_id": candidates[i].agent_id,
+                "role": candidates[i].role,
+                "description": candidates[i].description,
+                "confidence": scores[i],
+                "meets_threshold": scores[i] >= self.min_confidence,
+                "capabilities": [cap.model_dump() for cap in candidates[i].capabilities]
+            }
+            for i in ranking
+        ]
         
         best = scored_agents[0] if scored_agents else None
         
@@ -218,6 +337,49 @@ class TaskRouter:
             "all_candidates": scored_agents
         }
     
+    def _get(self, agent_id: str) -> Optional[BaseAgent]:
+        """Look up a registry agent in its routable form."""
+        return routable(self.registry.get(agent_id))
+    
+    def _candidates(self) -> List[BaseAgent]:
+        """All registry agents in routable form."""
+        return [routable(agent) for agent in self.registry.list_all()]
+    
+    def _score_candidates(
+        self,
+        candidates: List[BaseAgent],
+        task: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[float]:
+        """
+        Score every candidate agent for a task.
+        
+        Context-free scores are cached per normalized task (case and
+        whitespace insensitive) and candidate set, in a bounded LRU.
+        
+        Args:
+            candidates: Agents to score
+            task: Task description
+            context: Optional task context (disables caching)
+            
+        Returns:
+            Confidence scores aligned with candidates
+        """
+        if context:
+            return [agent.can_handle_task(task, context) for agent in candidates]
+        
+        key = (" ".join(task.lower().split()), tuple(agent.agent_id for agent in candidates))
+        scores = self._score_cache.get(key)
+        if scores is not None:
+            self._score_cache.move_to_end(key)
+            return scores
+        
+        scores = [agent.can_handle_task(task) for agent in candidates]
+        self._score_cache[key] = scores
+        if len(self._score_cache) > SCORE_CACHE_SIZE:
+            self._score_cache.popitem(last=False)
+        return scores
+    
     def _enhance_routing_with_llm(
         self,
         task: str,
@@ -320,11 +482,21 @@ Respond with JSON in this format:
             confidence=confidence,
             alternatives=alternatives
         )
-        self.routing_history.append(decision)
-        
-        # Keep history manageable (last 1000 routes)
-        if len(self.routing_history) > 1000:
-            self.routing_history = self.routing_history[-1000:]
+        # Tasks may be routed from worker threads (see aexecute_task)
+        with self._history_lock:
+            # The deque keeps the last MAX_ROUTING_HISTORY routes; take the one
+            # it is about to evict out of the aggregates first
+            if len(self.routing_history) == self.routing_history.maxlen:
+                old = self.routing_history[0]
+                self._sum_conf -= old.confidence
+                self._count -= 1
+                self._agent_usage[old.selected_agent_id] -= 1
+                if not self._agent_usage[old.selected_agent_id]:
+                    del self._agent_usage[old.selected_agent_id]
+            self.routing_history.append(decision)
+            self._sum_conf += decision.confidence
+            self._count += 1
+            self._agent_usage[decision.selected_agent_id] += 1
     
     def __str__(self) -> str:
         return f"TaskRouter(agents={len(self.registry)}, routes={len(self.routing_history)})"
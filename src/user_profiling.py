@@ -462,12 +462,12 @@ class UserProfilingSystem:
         
         with open(profile_path, 'r') as f:
             data = json.load(f)
-            
-            # Migrate old profiles: convert industry string to list
-            if 'industry' in data and isinstance(data['industry'], str):
-                data['industry'] = [data['industry']] if data['industry'] else []
-            
-            return UserProfile(**data)
+        
+        # Migrate old profiles: convert industry string to list
+        if 'industry' in data and isinstance(data['industry'], str):
+            data['industry'] = [data['industry']] if data['industry'] else []
+        
+        return UserProfile(**data)
     
     def update_profile(self, user_id: str, updates: Dict[str, Any]) -> Optional[UserProfile]:
         """Update specific fields in user profile."""
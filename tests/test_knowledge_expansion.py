@@ -148,3 +148,92 @@ def test_merge_edge_case_trace(dummy_schema, knowledge_expander):
     assert "System outage during deployment" in last_trace["added"]
     assert last_trace["area"] == area
     assert "edge.com" in last_trace["source"]
+
+
+def test_generate_safety_rules_batch(dummy_schema):
+    # One prompt per schema, results returned in input order; bad replies fall back
+    class BatchLLM:
+        def __init__(self):
+            self.prompts = []
+
+        async def agenerate(self, messages, temperature=0.7):
+            self.prompts.append(messages[-1]["content"])
+            if "Nurse" in messages[-1]["content"]:
+                return "not json"
+            return '{"critical_rules": ["NEVER ship untested code"], "important_rules": [], "best_practices": []}'
+
+    llm = BatchLLM()
+    expander = KnowledgeExpansionLayer(llm, "dummy", "dummy", cache_dir=Path("/tmp/test_cache"))
+    nurse = ProfessionSchema(profession_id="RN-001", profession_name="Nurse", industry="Healthcare")
+
+    rules = expander.generate_comprehensive_safety_rules_batch([dummy_schema, nurse])
+
+    assert len(llm.prompts) == 2
+    assert rules[0].critical == ["NEVER ship untested code"]
+    assert any("Nurse" in rule for rule in rules[1].critical)
+
+
+def test_safety_rules_batch_respects_max_concurrency(dummy_schema):
+    import asyncio
+
+    class SlowLLM:
+        def __init__(self):
+            self.in_flight = 0
+            self.peak = 0
+
+        async def agenerate(self, messages, temperature=0.7):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return '{"critical_rules": ["ALWAYS comply"]}'
+
+    llm = SlowLLM()
+    expander = KnowledgeExpansionLayer(llm, "dummy", "dummy", cache_dir=Path("/tmp/test_cache"))
+
+    rules = expander.generate_comprehensive_safety_rules_batch([dummy_schema] * 5, max_concurrency=2)
+
+    assert len(rules) == 5
+    assert llm.peak == 2
+
+
+def test_safety_rules_batch_reports_each_result(dummy_schema):
+    class EchoLLM:
+        async def agenerate(self, messages, temperature=0.7):
+            return '{"critical_rules": ["ALWAYS comply"]}'
+
+    expander = KnowledgeExpansionLayer(EchoLLM(), "dummy", "dummy", cache_dir=Path("/tmp/test_cache"))
+    nurse = ProfessionSchema(profession_id="RN-001", profession_name="Nurse", industry="Healthcare")
+    seen = []
+
+    rules = expander.generate_comprehensive_safety_rules_batch(
+        [dummy_schema, nurse], on_result=lambda schema, safety_rules: seen.append((schema.profession_name, safety_rules))
+    )
+
+    assert sorted(name for name, _ in seen) == sorted([dummy_schema.profession_name, "Nurse"])
+    assert all(safety_rules in rules for _, safety_rules in seen)
+
+
+def test_safety_rules_cached_per_exact_profession(dummy_schema, tmp_path):
+    # Even when every profession embeds alike, safety rules are only reused for the same one
+    np = pytest.importorskip("numpy")
+    from src.semantic_cache import SemanticCache
+
+    class CountingLLM:
+        def __init__(self):
+            self.calls = 0
+
+        async def agenerate(self, messages, temperature=0.7):
+            self.calls += 1
+            return '{"critical_rules": ["ALWAYS comply"]}'
+
+    cache = SemanticCache(str(tmp_path))
+    cache._embed = lambda text: np.array([1.0, 0.0], dtype="float32")
+    llm = CountingLLM()
+    expander = KnowledgeExpansionLayer(llm, "dummy", "dummy", cache_dir=Path("/tmp/test_cache"), semantic_cache=cache)
+    developer = ProfessionSchema(profession_id="SD-001", profession_name="Software Developer", industry="Technology")
+
+    expander.generate_comprehensive_safety_rules_batch([dummy_schema])
+    expander.generate_comprehensive_safety_rules_batch([developer, dummy_schema])
+
+    assert llm.calls == 2
@@ -13,6 +13,23 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.identity import IdentityLayer
 from src.cognitive_profile import CognitiveProfile, ProfileManager
 from src.memory_loop import MemoryLoop
+from src.llm_provider import LLMProvider
+from src.persona_agent import PersonaAgent
+from src.response_cache import ResponseCache
+
+
+class EchoProvider(LLMProvider):
+    """Offline provider that echoes the last user message."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def generate(self, messages, temperature=0.7):
+        self.calls += 1
+        return f"echo: {messages[-1]['content']}"
+    
+    def is_available(self):
+        return True
 
 
 class TestIdentityLayer:
@@ -93,6 +110,18 @@ class TestCognitiveProfile:
         loaded = pm.load_profile()
         assert example in loaded.writing_style.examples
     
+    def test_update_writing_style_skips_duplicate(self, tmp_path):
+        """Re-adding a stored example neither duplicates it nor rewrites the profile."""
+        pm = ProfileManager(str(tmp_path))
+        profile = pm.create_profile("test_user")
+        example = "This is an example of my writing style."
+        assert pm.update_writing_style(profile, example)
+        
+        mtime = pm.profile_path.stat().st_mtime_ns
+        assert not pm.update_writing_style(profile, example)
+        assert pm.profile_path.stat().st_mtime_ns == mtime
+        assert pm.load_profile().writing_style.examples == [example]
+    
     def test_record_interaction(self, tmp_path):
         """Test interaction recording."""
         pm = ProfileManager(str(tmp_path))
@@ -103,6 +132,997 @@ class TestCognitiveProfile:
         loaded = pm.load_profile()
         assert loaded.interaction_count == 1
         assert loaded.feedback_received == 1
+    
+    def test_load_profile_fresh_copy(self, tmp_path):
+        """Test repeated loads never share a mutable object and see saved changes."""
+        pm = ProfileManager(str(tmp_path))
+        pm.create_profile("test_user")
+        
+        first = pm.load_profile()
+        first.interaction_count = 99
+        
+        assert pm.load_profile().interaction_count == 0
+        
+        first.interaction_count = 3
+        pm.save_profile(first)
+        
+        assert ProfileManager(str(tmp_path)).load_profile().interaction_count == 3
+
+    def test_user_profile_fresh_copy(self, tmp_path):
+        """Test user profile loads never share a mutable object and see saved changes."""
+        from src.user_profiling import UserProfilingSystem, UserProfile
+
+        system = UserProfilingSystem(str(tmp_path))
+        system.save_profile(UserProfile(user_id="test_user", profession="Engineer"))
+
+        first = system.load_profile("test_user")
+        first.profession = "Changed"
+        assert system.load_profile("test_user").profession == "Engineer"
+
+        first.profession = "Designer"
+        system.save_profile(first)
+        assert UserProfilingSystem(str(tmp_path)).load_profile("test_user").profession == "Designer"
+
+
+class TestPersonaAgent:
+    """Test persona agent task processing."""
+    
+    def test_aprocess_task_gather(self, tmp_path):
+        """Test concurrent task processing with asyncio.gather."""
+        import asyncio
+        pm = ProfileManager(str(tmp_path))
+        agent = PersonaAgent(pm.create_profile("test_user"), EchoProvider())
+        tasks = ["Draft an email", "Summarize the meeting"]
+        
+        async def run():
+            return await asyncio.gather(*[agent.aprocess_task(t) for t in tasks])
+        
+        responses = asyncio.run(run())
+        
+        assert responses == [f"echo: {t}" for t in tasks]
+        assert len(agent.conversation_history) == 4
+    
+    def test_process_tasks_batch(self, tmp_path):
+        """Test batched tasks are answered by one request and split by id."""
+        class BatchProvider(EchoProvider):
+            def generate(self, messages, temperature=0.7):
+                self.calls += 1
+                return '```json\n[{"id": 2, "response": "second"}, {"id": 1, "response": "first"}]\n```'
+        
+        pm = ProfileManager(str(tmp_path))
+        provider = BatchProvider()
+        agent = PersonaAgent(pm.create_profile("test_user"), provider)
+        
+        responses = agent.process_tasks_batch(["Task one", "Task two"])
+        
+        assert responses == ["first", "second"]
+        assert provider.calls == 1
+    
+    def test_process_tasks_batch_fallback(self, tmp_path):
+        """Test unparseable batch replies fall back to per-task requests."""
+        pm = ProfileManager(str(tmp_path))
+        provider = EchoProvider()
+        agent = PersonaAgent(pm.create_profile("test_user"), provider)
+        
+        responses = agent.process_tasks_batch(["Task one", "Task two"])
+        
+        assert responses == ["echo: Task one", "echo: Task two"]
+        assert provider.calls == 3
+    
+    def test_process_task_stream(self, tmp_path):
+        """Test streamed chunks reach on_token and join into the response."""
+        class StreamProvider(EchoProvider):
+            def stream(self, messages, temperature=0.7):
+                yield from ["Hello", ", ", "world"]
+        
+        pm = ProfileManager(str(tmp_path))
+        agent = PersonaAgent(pm.create_profile("test_user"), StreamProvider())
+        tokens = []
+        
+        response = agent.process_task_stream("Say hello", on_token=tokens.append)
+        
+        assert tokens == ["Hello", ", ", "world"]
+        assert response == "Hello, world"
+        assert agent.conversation_history[-1] == {"role": "assistant", "content": "Hello, world"}
+
+
+class TestBaseAgent:
+    """Test BaseAgent default task plumbing."""
+
+    def test_handle_task_stream_default(self, tmp_path):
+        """Test agents without a streaming path pass the whole result as one chunk."""
+        from src.agent_base import BaseAgent
+        from src.task_result import TaskResult
+
+        class UpperAgent(BaseAgent):
+            def _define_capabilities(self):
+                return []
+
+            def can_handle_task(self, task, context=None):
+                return 1.0
+
+            def handle_task(self, task, context=None, use_skills=True):
+                return TaskResult(success=True, result=task.upper())
+
+        agent = UpperAgent("upper", "tester", "Upper-cases tasks", EchoProvider(), data_dir=tmp_path)
+        tokens = []
+
+        result = agent.handle_task_stream("hello", on_token=tokens.append)
+
+        assert result.result == "HELLO"
+        assert tokens == ["HELLO"]
+
+
+class TestResponseCache:
+    """Test on-disk LLM response cache."""
+    
+    def test_cache_roundtrip(self, tmp_path):
+        """Test responses are cached per model/system prompt/task."""
+        cache = ResponseCache(str(tmp_path / "cache"))
+        assert cache.get("gpt", "system", "Draft an email") is None
+        
+        cache.set("gpt", "system", "Draft an email", "Dear team,")
+        
+        assert cache.get("gpt", "system", "Draft an email") == "Dear team,"
+        assert cache.get("gpt", "system", "  draft AN email ") == "Dear team,"
+        assert cache.get("other-model", "system", "Draft an email") is None
+        assert cache.clear() == 1
+
+
+class TestLLMProvider:
+    """Test provider client reuse."""
+    
+    def test_async_client_per_loop_and_closed(self, monkeypatch):
+        """Each event loop gets its own async client, closed by aclose on that loop."""
+        import asyncio
+        import types
+        import src.llm_provider as llm_provider
+        
+        class FakeAsyncClient:
+            def __init__(self, **kwargs):
+                self.closed = False
+            
+            async def close(self):
+                self.closed = True
+        
+        monkeypatch.setitem(sys.modules, "openai", types.SimpleNamespace(AsyncOpenAI=FakeAsyncClient))
+        monkeypatch.setattr(llm_provider, "_make_http_client", lambda async_client=False: None)
+        provider = llm_provider.OpenAIProvider()
+        
+        async def use_and_close():
+            client = provider._get_async_client()
+            assert provider._get_async_client() is client
+            await provider.aclose()
+            return client
+        
+        first = asyncio.run(use_and_close())
+        second = asyncio.run(use_and_close())
+        
+        assert first is not second
+        assert first.closed and second.closed
+        assert not provider._async_clients
+    
+    def test_ollama_session_per_thread(self):
+        """Worker threads don't share a requests.Session."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.llm_provider import OllamaProvider
+        
+        provider = OllamaProvider()
+        main_session = provider._get_session()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            worker_session = pool.submit(provider._get_session).result()
+        
+        assert provider._get_session() is main_session
+        assert worker_session is not main_session
+
+
+class TestMemoryLoop:
+    """Test interaction log bookkeeping."""
+    
+    def test_feedback_on_last_interaction(self, tmp_path):
+        """Test the tracked count indexes the interaction just recorded."""
+        memory = MemoryLoop(str(tmp_path))
+        memory.record_interaction("first", "one")
+        memory.record_interaction("second", "two")
+        
+        assert memory.interaction_count == 2
+        assert memory.add_feedback(memory.interaction_count - 1, 4.0, "helpful")
+        
+        interactions = MemoryLoop(str(tmp_path)).load_all_interactions()
+        assert [i.feedback_score for i in interactions] == [None, 4.0]
+        assert interactions[1].feedback_text == "helpful"
+        assert not memory.add_feedback(5, 1.0)
+    
+    def test_summaries_reuse_parsed_log(self, tmp_path):
+        """Test the log is parsed once across reports and reloaded after writes."""
+        memory = MemoryLoop(str(tmp_path))
+        for score in (2.0, 3.0, 4.0, 5.0):
+            memory.record_interaction("task", "response")
+            memory.add_feedback(memory.interaction_count - 1, score)
+        
+        assert memory.load_all_interactions()[0] is memory.load_all_interactions()[0]
+        assert memory.get_feedback_summary()["average_score"] == 3.5
+        assert memory.analyze_learning_progress()["trend"] == "improving"
+        
+        memory.record_interaction("another", "response")
+        assert memory.get_feedback_summary()["total_interactions"] == 5
+
+    def test_recent_interactions_read_from_end(self, tmp_path, monkeypatch):
+        """Test tail reads across block boundaries match the full log."""
+        import src.memory_loop as memory_loop
+
+        monkeypatch.setattr(memory_loop, "TAIL_BLOCK_SIZE", 50)
+        memory = MemoryLoop(str(tmp_path))
+        for n in range(12):
+            memory.record_interaction(f"task {n}", "response " * n)
+
+        everything = memory.load_all_interactions()
+        for count in (1, 5, 12, 20):
+            assert memory.get_recent_interactions(count) == everything[-count:]
+        assert MemoryLoop(str(tmp_path / "empty")).get_recent_interactions(3) == []
+
+    def test_background_writes_keep_order(self, tmp_path):
+        """Test writes queued on a worker thread land intact and in order."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        memory = MemoryLoop(str(tmp_path))
+        with ThreadPoolExecutor(max_workers=1) as io_pool:
+            for n in range(20):
+                io_pool.submit(memory.record_interaction, f"task {n}", "response")
+            io_pool.submit(memory.add_feedback, 19, 5.0)
+
+        interactions = memory.load_all_interactions()
+        assert [i.task for i in interactions] == [f"task {n}" for n in range(20)]
+        assert interactions[-1].feedback_score == 5.0
+
+    def test_chat_reports_failed_background_writes(self, tmp_path, monkeypatch):
+        """Test chat surfaces a failed turn write and only rates turns that were saved."""
+        from click.testing import CliRunner
+        from src.persona_agent import AgentManager
+        from metapersona import cli
+
+        agent = PersonaAgent(ProfileManager(str(tmp_path)).create_profile("test_user"), EchoProvider())
+        monkeypatch.setattr(AgentManager, "initialize_agent", lambda self, **kwargs: agent)
+        record_interaction = MemoryLoop.record_interaction
+        calls = []
+
+        def flaky_record(self, task, response, tags=None):
+            calls.append(task)
+            if len(calls) == 1:
+                raise OSError("disk full")
+            return record_interaction(self, task, response, tags)
+        monkeypatch.setattr(MemoryLoop, "record_interaction", flaky_record)
+
+        result = CliRunner().invoke(
+            cli, ["chat", "--data-dir", str(tmp_path)],
+            input="first question\nsecond question\n/feedback 1 5\n/feedback 2 4\nexit\nn\n"
+        )
+
+        assert result.exit_code == 0
+        assert "Background save failed: disk full" in result.output
+        assert "Turn 1 was not saved" in result.output
+        assert "Feedback recorded for turn 2" in result.output
+        interactions = MemoryLoop(str(tmp_path)).load_all_interactions()
+        assert [(i.task, i.feedback_score) for i in interactions] == [("second question", 4.0)]
+        assert ProfileManager(str(tmp_path)).load_profile().accuracy_score == pytest.approx(0.8)
+
+
+class _StubSingleUseAgent:
+    """Lightweight SingleUseAgent without the handler pipeline and its debug output."""
+    
+    def __init__(self, agent_id, initial_mode='greeting', persona_context=None):
+        from src.mode_manager import ModeManager
+        from src.short_term_memory import ShortTermMemory
+        self.agent_id = agent_id
+        self.mode_manager = ModeManager(initial_mode=initial_mode)
+        self.memory = ShortTermMemory()
+    
+    def get_mode(self):
+        return self.mode_manager.get_mode()
+    
+    def get_mode_log(self):
+        return self.mode_manager.get_log()
+
+
+@pytest.fixture
+def stub_agents(monkeypatch):
+    """Make AgentRegistry.register build stub agents."""
+    import src.agent_registry as agent_registry
+    monkeypatch.setattr(agent_registry, "SingleUseAgent", _StubSingleUseAgent)
+
+
+class TestAgentRegistry:
+    """Test AgentRegistry snapshots."""
+    
+    def test_status_snapshot(self, stub_agents):
+        """Status comes from what the registered agents actually expose."""
+        from src.agent_registry import AgentRegistry
+        
+        registry = AgentRegistry()
+        registry.register("researcher")
+        registry.register("coder", initial_mode="task-execution")
+        registry.get("coder").memory.add_user_message({"text": "hi"})
+        
+        assert registry.status_snapshot() == [
+            {'agent_id': 'researcher', 'mode': 'greeting', 'mode_changes': 0, 'recent_messages': 0},
+            {'agent_id': 'coder', 'mode': 'task-execution', 'mode_changes': 0, 'recent_messages': 1},
+        ]
+    
+    def test_dump_and_load_roundtrip(self, tmp_path, stub_agents):
+        """A loaded snapshot re-registers the same agents in the same modes."""
+        from src.agent_registry import AgentRegistry
+        
+        registry = AgentRegistry()
+        registry.register("researcher")
+        registry.register("coder", initial_mode="task-execution")
+        
+        snapshot = tmp_path / "registry.msgpack"
+        registry.dump(snapshot)
+        loaded = AgentRegistry.load(snapshot)
+        
+        assert [agent.agent_id for agent in loaded.list_all()] == ["researcher", "coder"]
+        assert loaded.get("coder").get_mode() == "task-execution"
+    
+    def test_load_never_unpickles(self, tmp_path, capsys, stub_agents):
+        """Snapshots are plain data; a pickle placed at the snapshot path is not executed."""
+        import pickle
+        from src.agent_registry import AgentRegistry
+        
+        class Payload:
+            def __reduce__(self):
+                return print, ("unpickled",)
+        
+        snapshot = tmp_path / "registry.msgpack"
+        AgentRegistry().dump(snapshot)
+        assert AgentRegistry.load(snapshot).list_all() == []
+        
+        snapshot.write_bytes(pickle.dumps(Payload(), protocol=pickle.HIGHEST_PROTOCOL))
+        with pytest.raises(Exception):
+            AgentRegistry.load(snapshot)
+        assert "unpickled" not in capsys.readouterr().out
+    
+    def test_demo_registry_adds_missing_agents(self, tmp_path, monkeypatch, stub_agents):
+        """The demo registry registers demo agents a loaded snapshot lacks, and saves them."""
+        import importlib.util
+        from src.agent_registry import AgentRegistry
+        spec = importlib.util.spec_from_file_location(
+            "multi_agent_demo", Path(__file__).parent.parent / "examples" / "multi_agent_demo.py"
+        )
+        demo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(demo)
+        snapshot = tmp_path / "registry.msgpack"
+        monkeypatch.setattr(demo, "REGISTRY_SNAPSHOT", snapshot)
+        partial = AgentRegistry()
+        partial.register("coder", initial_mode="task-execution")
+        partial.dump(snapshot)
+        
+        registry = demo._registry()
+        
+        assert [agent.agent_id for agent in registry.list_all()] == ["coder", "researcher", "writer", "generalist"]
+        assert registry.get("coder").get_mode() == "task-execution"
+        assert len(AgentRegistry.load(snapshot)) == 4
+
+
+class _KeywordAgent:
+    """Duck-typed agent: confident when its keyword is in the task."""
+    
+    def __init__(self, agent_id, keyword, role=None):
+        self.agent_id = agent_id
+        self.role = role or agent_id
+        self.description = f"Handles {keyword} tasks"
+        self.capabilities = []
+        self.keyword = keyword
+        self.scored = 0
+    
+    def can_handle_task(self, task, context=None):
+        self.scored += 1
+        return 0.9 if self.keyword in task.lower() else 0.1
+    
+    def handle_task(self, task, context=None, use_skills=True):
+        from src.task_result import TaskResult
+        return TaskResult(success=True, result=f"{self.agent_id}: {task}")
+
+
+class _DictRegistry:
+    """Minimal registry over a fixed set of agents."""
+    
+    def __init__(self, *agents):
+        self._agents = {agent.agent_id: agent for agent in agents}
+    
+    def get(self, agent_id):
+        return self._agents.get(agent_id)
+    
+    def list_all(self):
+        return list(self._agents.values())
+    
+    def __len__(self):
+        return len(self._agents)
+
+
+class TestTaskRouter:
+    """Test TaskRouter routing, history and stats."""
+    
+    def _router(self, **kwargs):
+        from src.task_router import TaskRouter
+        registry = _DictRegistry(
+            _KeywordAgent("coder", "code"),
+            _KeywordAgent("writer", "essay"),
+            _KeywordAgent("generalist", "chat"),
+        )
+        return TaskRouter(registry, **kwargs)
+    
+    def test_route_task_records_and_falls_back(self):
+        """The best-scoring agent wins; low confidence falls back to the default."""
+        router = self._router(default_agent_id="generalist")
+        
+        assert router.route_task("write code").agent_id == "coder"
+        assert router.route_task("something else").agent_id == "generalist"
+        assert router.route_task("anything", agent_id="writer").agent_id == "writer"
+        
+        stats = router.get_routing_stats()
+        assert stats["total_routes"] == 3
+        assert stats["agent_usage"] == {"coder": 1, "generalist": 1, "writer": 1}
+        assert stats["average_confidence"] == pytest.approx((0.9 + 0.1 + 1.0) / 3)
+    
+    def test_routing_stats_drop_evicted_routes(self, monkeypatch):
+        """Stats only cover the routes still kept in the bounded history."""
+        import src.task_router as task_router
+        monkeypatch.setattr(task_router, "MAX_ROUTING_HISTORY", 3)
+        router = self._router()
+        
+        router.route_task("code this")
+        for _ in range(3):
+            router.route_task("an essay")
+        
+        stats = router.get_routing_stats()
+        assert len(router.routing_history) == 3
+        assert stats["total_routes"] == 3
+        assert stats["agent_usage"] == {"writer": 3}
+        assert stats["most_used_agent"] == "writer"
+        assert stats["average_confidence"] == pytest.approx(0.9)
+
+    
+    def test_aexecute_batch_order_bound_and_progress(self):
+        """Results keep task order, at most max_concurrency run at once, progress counts up."""
+        import asyncio
+        import threading
+        import time
+        from src.task_result import TaskResult
+        
+        class SlowAgent(_KeywordAgent):
+            active = peak = 0
+            lock = threading.Lock()
+            
+            def handle_task(self, task, context=None, use_skills=True):
+                with self.lock:
+                    SlowAgent.active += 1
+                    SlowAgent.peak = max(SlowAgent.peak, SlowAgent.active)
+                # Later tasks finish first
+                time.sleep(0.01 * (10 - int(task.split()[-1])))
+                with self.lock:
+                    SlowAgent.active -= 1
+                return TaskResult(success=True, result=task)
+        
+        from src.task_router import TaskRouter
+        router = TaskRouter(_DictRegistry(SlowAgent("coder", "code")))
+        tasks = [f"code task {i}" for i in range(8)]
+        progress = []
+        
+        results = asyncio.run(router.aexecute_batch(
+            tasks, max_concurrency=3, on_progress=lambda done, total: progress.append((done, total))
+        ))
+        
+        assert [r.result for r in results] == tasks
+        assert SlowAgent.peak <= 3
+        assert progress == [(i, 8) for i in range(1, 9)]
+        assert router.get_routing_stats()["total_routes"] == 8
+
+    
+    def test_aexecute_batch_with_registry_agents(self):
+        """A batch over real registry agents runs each task on its routed agent, in order."""
+        import asyncio
+        from src.agent_registry import AgentRegistry
+        from src.task_router import TaskRouter
+        registry = AgentRegistry()
+        for agent_id in ("researcher", "coder", "writer", "generalist"):
+            registry.register(agent_id)
+        router = TaskRouter(registry, default_agent_id="generalist")
+        tasks = ["Debug my Python script", "Draft a memo", "Research solar papers", "good morning"]
+        progress = []
+        
+        results = asyncio.run(router.aexecute_batch(
+            tasks, max_concurrency=2, on_progress=lambda done, total: progress.append(done)
+        ))
+        
+        assert all(r.success and r.result for r in results)
+        assert [r.metadata["agent_id"] for r in results] == ["coder", "writer", "researcher", "generalist"]
+        assert progress == [1, 2, 3, 4]
+
+    def test_score_cache_hits_and_bound(self, monkeypatch):
+        """Context-free scores are reused per normalized task, in a bounded LRU."""
+        import src.task_router as task_router
+        monkeypatch.setattr(task_router, "SCORE_CACHE_SIZE", 2)
+        router = self._router()
+        coder = router.registry.get("coder")
+        candidates = router.registry.list_all()
+        
+        first = router._score_candidates(candidates, "Write  CODE")
+        assert router._score_candidates(candidates, "write code") == first
+        assert coder.scored == 1
+        
+        # Context disables caching
+        router._score_candidates(candidates, "write code", {"lang": "py"})
+        assert coder.scored == 2
+        
+        # "write code" was used most recently, so "an essay" is evicted first
+        router._score_candidates(candidates, "an essay")
+        router._score_candidates(candidates, "write code")
+        router._score_candidates(candidates, "small chat")
+        assert len(router._score_cache) == 2
+        assert [key[0] for key in router._score_cache] == ["write code", "small chat"]
+
+    
+    def test_score_cache_with_registry_agents(self, monkeypatch):
+        """Real registry agents are scored once per normalized task, with non-zero scores."""
+        from src.agent_registry import AgentRegistry
+        from src.routable_agent import RoutableAgent
+        from src.task_router import TaskRouter
+        calls = []
+        score = RoutableAgent.can_handle_task
+        monkeypatch.setattr(
+            RoutableAgent, "can_handle_task",
+            lambda self, task, context=None: calls.append(self.agent_id) or score(self, task, context)
+        )
+        registry = AgentRegistry()
+        registry.register("coder")
+        registry.register("writer")
+        router = TaskRouter(registry)
+        
+        assert router.route_task("Fix this Python bug").agent_id == "coder"
+        assert router.route_task("fix this  python BUG").agent_id == "coder"
+        
+        assert calls == ["coder", "writer"]
+        assert list(router._score_cache.values()) == [[0.7, 0.0]]
+
+    def test_explain_routing_ranks_candidates(self):
+        """Candidates are listed best first, flagged against the threshold."""
+        router = self._router(min_confidence=0.5)
+        
+        explanation = router.explain_routing("draft an essay")
+        
+        assert [c["agent_id"] for c in explanation["all_candidates"]][0] == "writer"
+        assert [c["confidence"] for c in explanation["all_candidates"]] == [0.9, 0.1, 0.1]
+        assert [c["meets_threshold"] for c in explanation["all_candidates"]] == [True, False, False]
+        assert explanation["recommended_agent"] == "writer"
+        assert explanation["recommended_confidence"] == 0.9
+        
+        assert router.explain_routing("hello")["recommended_agent"] is None
+
+    
+    def test_explain_routing_ranks_registry_agents(self):
+        """Real registry agents are ranked by their role scores, best first."""
+        from src.agent_registry import AgentRegistry
+        from src.task_router import TaskRouter
+        registry = AgentRegistry()
+        for agent_id in ("generalist", "writer", "coder"):
+            registry.register(agent_id)
+        router = TaskRouter(registry, min_confidence=0.5)
+        
+        explanation = router.explain_routing("Debug this Python script")
+        
+        candidates = explanation["all_candidates"]
+        assert [c["agent_id"] for c in candidates] == ["coder", "generalist", "writer"]
+        assert [c["confidence"] for c in candidates] == pytest.approx([0.8, 0.3, 0.0])
+        assert candidates[0]["description"] == "Writes, reviews and debugs code"
+        assert explanation["recommended_agent"] == "coder"
+        assert router.explain_routing("good morning")["recommended_agent"] is None
+
+    def test_history_bounded_and_recent_in_order(self, monkeypatch):
+        """History keeps only the newest routes; recent routes come oldest first."""
+        import src.task_router as task_router
+        monkeypatch.setattr(task_router, "MAX_ROUTING_HISTORY", 4)
+        router = self._router()
+        
+        for i in range(6):
+            router.route_task(f"task {i}", agent_id="coder")
+        
+        assert [d.task for d in router.routing_history] == ["task 2", "task 3", "task 4", "task 5"]
+        assert [r["task"] for r in router.get_recent_routes(2)] == ["task 4", "task 5"]
+        assert len(router.get_recent_routes(10)) == 4
+
+
+    def test_routes_real_registry_agents(self):
+        """SingleUseAgents from AgentRegistry are scored by role and run via process_turn."""
+        from src.agent_registry import AgentRegistry
+        from src.task_router import TaskRouter
+        registry = AgentRegistry()
+        for agent_id in ("researcher", "coder", "writer", "generalist"):
+            registry.register(agent_id)
+        router = TaskRouter(registry, default_agent_id="generalist")
+        
+        assert router.route_task("Debug this Python function").agent_id == "coder"
+        assert router.route_task("Draft an email to the team").agent_id == "writer"
+        assert router.route_task("good morning").agent_id == "generalist"
+        
+        result = router.execute_task("Research sources on solar power")
+        assert result.success and isinstance(result.result, str) and result.result
+        assert result.metadata["agent_id"] == "researcher"
+        assert len(registry.get("researcher").memory.user_messages) == 1
+    
+    def test_llm_routing_with_registry_agents(self):
+        """LLM refinement reads the adapted agents' role and description."""
+        from src.agent_registry import AgentRegistry
+        from src.task_router import TaskRouter
+        
+        class RecommendWriter(EchoProvider):
+            def generate(self, messages, temperature=0.7):
+                assert '"role": "writer"' in messages[1]["content"]
+                return '{"recommended_agent_id": "writer", "confidence_adjustment": 0.3}'
+        
+        registry = AgentRegistry()
+        registry.register("coder")
+        registry.register("writer")
+        router = TaskRouter(registry, llm_provider=RecommendWriter())
+        
+        assert router.route_task("Write about Python classes").agent_id == "writer"
+
+
+class TestAgentCommands:
+    """Test the agents-list / agents-status CLI commands."""
+    
+    def _registry(self, tmp_path):
+        from metapersona import _registry
+        registry = _registry(str(tmp_path))
+        registry.register("researcher")
+        registry.register("coder", initial_mode="task-execution")
+        registry.get("coder").memory.add_user_message({"text": "hi"})
+        return registry
+    
+    def test_agents_list(self, tmp_path, stub_agents):
+        """Lists every registered agent with its mode."""
+        from click.testing import CliRunner
+        from metapersona import cli
+        self._registry(tmp_path)
+        
+        result = CliRunner().invoke(cli, ["agents-list", "--data-dir", str(tmp_path)])
+        
+        assert result.exit_code == 0
+        assert "Error" not in result.output
+        assert "researcher" in result.output and "task-execution" in result.output
+        assert "Total Agents: 2" in result.output
+    
+    def test_agents_status(self, tmp_path, stub_agents):
+        """Shows the registry overview and a single agent's details."""
+        from click.testing import CliRunner
+        from metapersona import cli
+        self._registry(tmp_path)
+        runner = CliRunner()
+        
+        overview = runner.invoke(cli, ["agents-status", "--data-dir", str(tmp_path)])
+        detail = runner.invoke(cli, ["agents-status", "--data-dir", str(tmp_path), "--agent-id", "coder"])
+        missing = runner.invoke(cli, ["agents-status", "--data-dir", str(tmp_path), "--agent-id", "nobody"])
+        
+        assert "Error" not in overview.output + detail.output
+        assert "Total Agents: 2" in overview.output
+        assert "Modes: greeting, task-execution" in overview.output
+        assert "Mode: task-execution" in detail.output
+        assert "Recent Messages: 1" in detail.output
+        assert "Agent 'nobody' not found." in missing.output
+
+    
+    def test_register_missing_agents(self, capsys):
+        """Only ids not yet registered are registered (by id) and announced."""
+        from metapersona import _register_missing_agents
+        
+        class StubRegistry:
+            def __init__(self, *agent_ids):
+                self.agent_ids = list(agent_ids)
+            
+            def __contains__(self, agent_id):
+                return agent_id in self.agent_ids
+            
+            def register(self, agent_id, initial_mode='greeting'):
+                self.agent_ids.append(agent_id)
+        
+        registry = StubRegistry("coder")
+        _register_missing_agents(registry, (("coder", "Code Agent"), ("writer", "Writer Agent"), ("generalist",)))
+        
+        assert registry.agent_ids == ["coder", "writer", "generalist"]
+        output = capsys.readouterr().out
+        assert "Writer Agent" in output and "Code Agent" not in output
+    
+    def test_registry_membership(self, stub_agents):
+        """AgentRegistry answers `in` and len() by agent id."""
+        from src.agent_registry import AgentRegistry
+        
+        registry = AgentRegistry()
+        registry.register("coder")
+        
+        assert "coder" in registry and "writer" not in registry
+        assert len(registry) == 1
+
+    
+    def test_route_task_explain_without_provider(self, tmp_path, stub_agents, monkeypatch):
+        """--explain registers the default agents and explains without an LLM provider."""
+        from click.testing import CliRunner
+        import src.llm_provider as llm_provider
+        from metapersona import cli, _registry
+        
+        def no_provider(*args, **kwargs):
+            raise AssertionError("route-task --explain must not create an LLM provider")
+        monkeypatch.setattr(llm_provider, "get_llm_provider", no_provider)
+        
+        result = CliRunner().invoke(cli, ["route-task", "Write a poem", "--explain", "--data-dir", str(tmp_path)])
+        
+        assert result.exit_code == 0
+        assert "Error" not in result.output
+        assert "Routing Analysis" in result.output
+        for agent_id in ("researcher", "coder", "writer", "generalist"):
+            assert agent_id in _registry(str(tmp_path))
+            assert agent_id in result.output
+
+
+class _ScriptedSession:
+    """PromptSession stand-in that answers prompts from a fixed script."""
+    
+    def __init__(self, *inputs):
+        self.inputs = iter(inputs)
+    
+    async def prompt_async(self, message):
+        return next(self.inputs)
+
+
+@pytest.fixture
+def chat_console(monkeypatch):
+    """Capture what the chat helpers print."""
+    import io
+    import metapersona
+    from rich.console import Console
+    output = io.StringIO()
+    monkeypatch.setattr(metapersona, "console", Console(file=output, width=200, highlight=False))
+    return output
+
+
+class TestChatLoops:
+    """Test the adaptive-chat / persona-chat helpers against registry agents."""
+    
+    def test_stream_agent_reply_with_registry_agent(self, chat_console):
+        """A registry agent's reply is streamed and shown under its id."""
+        import asyncio
+        from src.agent_registry import AgentRegistry
+        from metapersona import _stream_agent_reply
+        registry = AgentRegistry()
+        registry.register("writer")
+        
+        result = asyncio.run(_stream_agent_reply(registry.get("writer"), "Draft a memo", {}))
+        
+        assert result.success and result.result
+        output = chat_console.getvalue()
+        assert "Writer:" in output and "[concise | confident]" in output
+        assert "Error" not in output
+        assert len(registry.get("writer").memory.user_messages) == 1
+
+    
+    def _chat_registry(self):
+        from src.agent_registry import AgentRegistry
+        from src.task_router import TaskRouter
+        registry = AgentRegistry()
+        for agent_id in ("researcher", "coder", "writer", "generalist"):
+            registry.register(agent_id)
+        return registry, TaskRouter(registry, default_agent_id="generalist")
+    
+    def test_adaptive_chat_loop_routes_input(self, chat_console):
+        """One routed input runs on the registry agent the loop picks."""
+        import asyncio
+        from src.user_profiling import UserProfile
+        from metapersona import _adaptive_chat_loop
+        registry, router = self._chat_registry()
+        profile = UserProfile(user_id="ana", profession="developer")
+        
+        asyncio.run(_adaptive_chat_loop(
+            _ScriptedSession("Debug my Python script", "exit"), registry, router, profile, "prompt"
+        ))
+        
+        output = chat_console.getvalue()
+        assert "Routing to coder" in output and "Coder:" in output
+        assert "Error" not in output
+        assert len(registry.get("coder").memory.user_messages) == 1
+        assert router.get_routing_stats()["agent_usage"] == {"coder": 1}
+    
+    def test_persona_chat_loop_routes_input(self, tmp_path, chat_console):
+        """One routed input is routed by the TaskRouter and answered by that agent."""
+        import asyncio
+        from src.memory_loop import MemoryLoop
+        from metapersona import _persona_chat_loop
+        registry, router = self._chat_registry()
+        profile = ProfileManager(str(tmp_path)).create_profile("ana")
+        
+        asyncio.run(_persona_chat_loop(
+            _ScriptedSession("Please summarize the notes", "exit"), registry, router, profile, MemoryLoop(str(tmp_path))
+        ))
+        
+        output = chat_console.getvalue()
+        assert "Routing to writer" in output and "Writer:" in output
+        assert "Error" not in output
+        assert len(registry.get("writer").memory.user_messages) == 1
+
+    
+    def test_chat_loop_commands_on_registry_agents(self, tmp_path, chat_console):
+        """'agents', 'stats' and 'profile' work in both loops with registry agents."""
+        import asyncio
+        from src.memory_loop import MemoryLoop
+        from src.user_profiling import UserProfile
+        from metapersona import _adaptive_chat_loop, _persona_chat_loop
+        registry, router = self._chat_registry()
+        registry.register("coder", initial_mode="task-execution")
+        commands = ("agents", "stats", "profile", "exit")
+        
+        profile = UserProfile(user_id="ana", profession="developer", agent_routing_preferences={"coder": 1.5})
+        asyncio.run(_adaptive_chat_loop(_ScriptedSession(*commands), registry, router, profile, "prompt"))
+        cognitive_profile = ProfileManager(str(tmp_path)).create_profile("ana")
+        asyncio.run(_persona_chat_loop(
+            _ScriptedSession(*commands), registry, router, cognitive_profile, MemoryLoop(str(tmp_path))
+        ))
+        
+        output = chat_console.getvalue()
+        assert "Error" not in output
+        assert "coder (task-execution) - Weight: 1.50x" in output
+        assert "coder (task-execution) - Weight: 1.00x" in output
+        assert output.count("Total routes: 0") == 2
+        assert "Profession: developer" in output and "Writing Tone:" in output
+
+    
+    def _adaptive_run(self, registry, router, *inputs, **profile_fields):
+        """Run the adaptive loop over inputs (then 'exit') for a developer profile."""
+        import asyncio
+        from src.user_profiling import UserProfile
+        from metapersona import _adaptive_chat_loop
+        profile = UserProfile(user_id="ana", profession="developer", **profile_fields)
+        asyncio.run(_adaptive_chat_loop(_ScriptedSession(*inputs, "exit"), registry, router, profile, "prompt"))
+        return profile
+    
+    def test_adaptive_weights_hoisted_and_applied(self, chat_console, monkeypatch):
+        """Agents are listed once per session and profile weights decide close calls."""
+        registry, router = self._chat_registry()
+        list_calls = []
+        list_all = registry.list_all
+        monkeypatch.setattr(registry, "list_all", lambda: list_calls.append(1) or list_all())
+        
+        # coder and writer both score 0.6; the profile prefers the writer
+        self._adaptive_run(
+            registry, router, "Write about Python classes", "Write about Python lists",
+            agent_routing_preferences={"writer": 1.5},
+        )
+        
+        assert len(list_calls) == 1
+        assert router.get_routing_stats()["agent_usage"] == {"writer": 2}
+        assert "Routing to writer (confidence: 0.90)" in chat_console.getvalue()
+
+    
+    def test_adaptive_pick_best_or_default(self, chat_console):
+        """The best weighted agent wins; below the threshold the default agent answers."""
+        registry, router = self._chat_registry()
+        
+        self._adaptive_run(registry, router, "Debug my Python script", "good morning")
+        
+        output = chat_console.getvalue()
+        assert "Routing to coder (confidence: 0.80)" in output
+        assert "Routing to generalist (confidence: 0.30)" in output
+        assert router.get_routing_stats()["agent_usage"] == {"coder": 1, "generalist": 1}
+        
+        router.default_agent_id = None
+        self._adaptive_run(registry, router, "good morning")
+        assert "No suitable agent found." in chat_console.getvalue()
+
+    
+    def test_adaptive_score_cache(self, chat_console, monkeypatch):
+        """Repeated inputs reuse their agent scores, within SCORE_CACHE_SIZE entries."""
+        import metapersona
+        from src.routable_agent import RoutableAgent
+        monkeypatch.setattr(metapersona, "SCORE_CACHE_SIZE", 1)
+        scored = []
+        score = RoutableAgent.can_handle_task
+        monkeypatch.setattr(
+            RoutableAgent, "can_handle_task",
+            lambda self, task, context=None: scored.append(task) or score(self, task, context)
+        )
+        registry, router = self._chat_registry()
+        
+        self._adaptive_run(
+            registry, router,
+            "Debug my Python script", "debug my  python SCRIPT", "Write a memo", "Debug my Python script", "stats",
+        )
+        
+        # Scored on the two misses of the first task and the one of the memo, 4 agents each
+        assert len(scored) == 12
+        assert "Score cache: 1 hits, 3 misses" in chat_console.getvalue()
+        assert router.get_routing_stats()["agent_usage"] == {"coder": 3, "writer": 1}
+
+    
+    def _spy_turn_contexts(self, monkeypatch):
+        """Record the context each SingleUseAgent turn receives."""
+        from src.single_use_agent import SingleUseAgent
+        contexts = []
+        process_turn = SingleUseAgent.process_turn
+        monkeypatch.setattr(
+            SingleUseAgent, "process_turn",
+            lambda self, message, context=None: contexts.append(context) or process_turn(self, message, context)
+        )
+        return contexts
+    
+    def test_adaptive_context_shared_across_turns(self, chat_console, monkeypatch):
+        """Every turn hands the agents one context, built once per session."""
+        contexts = self._spy_turn_contexts(monkeypatch)
+        registry, router = self._chat_registry()
+        
+        self._adaptive_run(registry, router, "Debug my Python script", "Write a memo")
+        
+        assert len(contexts) == 2 and contexts[0] is contexts[1]
+        assert contexts[0]["adaptive_prompt"] == "prompt"
+        assert contexts[0]["user_profile"]["profession"] == "developer"
+
+    
+    def test_prefilter_skips_scoring(self, tmp_path, chat_console, monkeypatch):
+        """Unmistakable openings go straight to their agent in both loops, and are still counted."""
+        import asyncio
+        from src.memory_loop import MemoryLoop
+        from src.routable_agent import RoutableAgent
+        from metapersona import _persona_chat_loop
+        
+        def no_scoring(self, task, context=None):
+            raise AssertionError("prefiltered input must not be scored")
+        monkeypatch.setattr(RoutableAgent, "can_handle_task", no_scoring)
+        registry, router = self._chat_registry()
+        
+        self._adaptive_run(registry, router, "Fix this bug in the parser")
+        profile = ProfileManager(str(tmp_path)).create_profile("ana")
+        asyncio.run(_persona_chat_loop(
+            _ScriptedSession("Proofread my cover letter", "exit"), registry, router, profile, MemoryLoop(str(tmp_path))
+        ))
+        
+        output = chat_console.getvalue()
+        assert "Routing to coder (confidence: 0.99)" in output
+        assert "Routing to writer" in output and "Error" not in output
+        assert router.get_routing_stats()["agent_usage"] == {"coder": 1, "writer": 1}
+
+    
+    def test_adaptive_context_profile_fields(self, chat_console, monkeypatch):
+        """Agents get only the ADAPTIVE_CONTEXT_FIELDS of the profile."""
+        from metapersona import ADAPTIVE_CONTEXT_FIELDS
+        contexts = self._spy_turn_contexts(monkeypatch)
+        registry, router = self._chat_registry()
+        
+        self._adaptive_run(
+            registry, router, "Debug my Python script",
+            hobbies=["chess"], loaded_skill_packs=["python"], agent_routing_preferences={"coder": 1.2},
+        )
+        
+        user_profile = contexts[0]["user_profile"]
+        assert set(user_profile) == ADAPTIVE_CONTEXT_FIELDS
+        assert user_profile["loaded_skill_packs"] == ["python"]
+        assert user_profile["agent_routing_preferences"] == {"coder": 1.2}
+
+    
+    def test_persona_agents_use_profile_style(self, tmp_path, chat_console):
+        """persona-chat agents reply in the cognitive profile's tone and phrases."""
+        from src.agent_registry import AgentRegistry
+        from metapersona import _register_persona_agents
+        registry = AgentRegistry()
+        registry.register("coder", initial_mode="task-execution")
+        profile = ProfileManager(str(tmp_path)).create_profile("ana")
+        profile.writing_style.tone = "casual"
+        profile.writing_style.common_phrases = ["Cheers!"]
+        
+        _register_persona_agents(registry, profile, (("coder", "Code Agent"), ("writer", "Writer Agent")))
+        
+        coder, writer = registry.get("coder"), registry.get("writer")
+        assert coder.get_mode() == "task-execution"
+        assert coder.persona_context is not writer.persona_context
+        reply = writer.process_turn("Draft a memo about the launch").payload["result"]
+        assert reply.startswith("[casual |") and "Cheers!" in reply
+        assert "Code Agent" in chat_console.getvalue()
+
+
 from src.single_use_agent import SingleUseAgent
 
 def test_memory_loop_feedback_and_analysis(tmp_path):
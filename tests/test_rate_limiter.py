@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+from src.rate_limiter import RateLimiter
+
+
+def test_from_env_disabled_without_limits(monkeypatch):
+    monkeypatch.delenv("RPM_LIMIT", raising=False)
+    monkeypatch.delenv("TPM_LIMIT", raising=False)
+    assert RateLimiter.from_env() is None
+
+
+def test_from_env_reads_limits(monkeypatch):
+    monkeypatch.setenv("RPM_LIMIT", "120")
+    monkeypatch.setenv("TPM_LIMIT", "4000")
+    limiter = RateLimiter.from_env()
+    assert limiter.requests_per_minute == 120
+    assert limiter.tokens_per_minute == 4000
+
+
+def test_acquire_spends_capacity():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=1000)
+    asyncio.run(limiter.acquire(tokens=100))
+    assert limiter.available_request_capacity < 60
+    assert 899 <= limiter.available_token_capacity < 901
+
+
+def test_acquire_waits_for_refill():
+    # 6000 RPM refills one request every 10ms
+    limiter = RateLimiter(requests_per_minute=6000)
+    limiter.available_request_capacity = 0
+    start = time.monotonic()
+    asyncio.run(limiter.acquire(tokens=1))
+    assert time.monotonic() - start >= 0.009
@@ -0,0 +1,91 @@
+"""
+Tests for the semantic response cache.
+"""
+import pytest
+
+from src.semantic_cache import SemanticCache
+
+
+def test_exact_repeat_hits_without_embeddings(tmp_path):
+    cache = SemanticCache(str(tmp_path))
+    cache._model = False  # no embedding model: exact (normalized) matches only
+
+    assert cache.get("GDPR compliance") is None
+    cache.set("GDPR compliance", {"risk_level": "high"})
+
+    assert cache.get("  gdpr   COMPLIANCE ") == {"risk_level": "high"}
+    assert cache.get("HIPAA compliance") is None
+
+
+def test_namespaces_are_isolated(tmp_path):
+    cache = SemanticCache(str(tmp_path))
+    cache._model = False
+
+    cache.set("Deploy on Friday?", "no", namespace="engineer")
+
+    assert cache.get("Deploy on Friday?", namespace="nurse") is None
+    assert cache.get("Deploy on Friday?", namespace="engineer") == "no"
+
+
+def test_entries_persist_across_instances(tmp_path):
+    first = SemanticCache(str(tmp_path))
+    first._model = False
+    first.set("Software Engineer in Technology", ["NEVER commit credentials"])
+
+    second = SemanticCache(str(tmp_path))
+    second._model = False
+
+    assert second.get("software engineer in technology") == ["NEVER commit credentials"]
+    assert second.clear() == 1
+
+
+def test_paraphrase_hit_above_threshold(tmp_path):
+    np = pytest.importorskip("numpy")
+    vectors = {
+        "gdpr compliance": np.array([1.0, 0.0], dtype="float32"),
+        "complying with gdpr": np.array([0.96, 0.28], dtype="float32"),
+        "quarterly budget": np.array([0.0, 1.0], dtype="float32"),
+    }
+    cache = SemanticCache(str(tmp_path), threshold=0.92)
+    cache._embed = lambda text: vectors[text]
+
+    cache.set("gdpr compliance", "answer")
+
+    assert cache.get("complying with gdpr") == "answer"
+    assert cache.get("quarterly budget") is None
+
+
+def test_prime_embeds_in_one_batch(tmp_path):
+    np = pytest.importorskip("numpy")
+
+    class CountingModel:
+        def __init__(self):
+            self.calls = []
+
+        def encode(self, texts, **kwargs):
+            self.calls.append(list(texts))
+            return np.array([[1.0, 0.0] if "nurse" in t.lower() else [0.0, 1.0] for t in texts], dtype="float32")
+
+    model = CountingModel()
+    cache = SemanticCache(str(tmp_path))
+    cache._model = model
+
+    cache.prime(["Nurse in Healthcare", "Pilot in Aviation", "Nurse in Healthcare"])
+    cache.set("Nurse in Healthcare", "rules")
+    assert cache.get("Pilot in Aviation") is None
+
+    assert model.calls == [["Nurse in Healthcare", "Pilot in Aviation"]]
+
+
+def test_exact_entries_skip_paraphrase_matching(tmp_path):
+    np = pytest.importorskip("numpy")
+    cache = SemanticCache(str(tmp_path), threshold=0.92)
+    cache._embed = lambda text: np.array([1.0, 0.0], dtype="float32")
+
+    cache.set("Nurse in Healthcare", "nurse rules", exact=True)
+    cache.set("Pilot in Aviation", "pilot answer")
+
+    assert cache.get("nurse in  healthcare", exact=True) == "nurse rules"
+    assert cache.get("Midwife in Healthcare", exact=True) is None
+    # Only the non-exact entry is embedded, so paraphrases can only reach it
+    assert cache.get("Midwife in Healthcare") == "pilot answer"
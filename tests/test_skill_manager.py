@@ -0,0 +1,119 @@
+"""
+Tests for SkillManager skill chaining.
+"""
+import threading
+
+from src.skills.base import Skill, SkillMetadata, SkillParameter, SkillResult, SkillRegistry
+from src.skills.manager import SkillManager
+
+
+class EchoSkill(Skill):
+    """Returns its input; fails on "fail". Records the threads it ran on."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def get_metadata(self) -> SkillMetadata:
+        return SkillMetadata(
+            name="echo",
+            description="Echo the value",
+            category="Test",
+            parameters=[SkillParameter(name="value", type="str", description="Value", required=True)],
+            returns="The value"
+        )
+
+    def execute(self, value) -> SkillResult:
+        self.calls.append((value, threading.get_ident()))
+        if value == "fail":
+            return SkillResult(success=False, error="failed")
+        return SkillResult(success=True, data=value)
+
+
+def make_manager():
+    registry = SkillRegistry()
+    skill = EchoSkill()
+    registry.register(skill)
+    return SkillManager(registry), skill
+
+
+def test_chain_substitutes_referenced_results():
+    manager, _ = make_manager()
+    results = manager.chain_skills([
+        {"skill": "echo", "parameters": {"value": "a"}, "output_var": "first"},
+        {"skill": "echo", "parameters": {"value": "b"}, "output_var": "second"},
+        {"skill": "echo", "parameters": {"value": "$first"}},
+    ])
+
+    assert [r.data for r in results] == ["a", "b", "a"]
+
+
+def test_chain_layers_follow_references():
+    dependencies = SkillManager._chain_dependencies([
+        {"skill": "echo", "parameters": {"value": "a"}, "output_var": "x"},
+        {"skill": "echo", "parameters": {"value": "b"}},
+        {"skill": "echo", "parameters": {"value": "$x"}, "output_var": "x"},
+        {"skill": "echo", "parameters": {"value": "$x"}},
+    ])
+
+    assert dependencies == [{}, {}, {"value": [0]}, {"value": [0, 2]}]
+    assert SkillManager._chain_layers(dependencies) == [[0, 1], [2], [3]]
+
+
+def test_chain_stops_at_first_failure_in_order():
+    manager, skill = make_manager()
+    results = manager.chain_skills([
+        {"skill": "echo", "parameters": {"value": "a"}, "output_var": "x"},
+        {"skill": "echo", "parameters": {"value": "$x"}},
+        {"skill": "echo", "parameters": {"value": "fail"}},
+        {"skill": "echo", "parameters": {"value": "$echo_result"}},
+    ])
+
+    assert [r.success for r in results] == [True, True, False]
+    assert "$echo_result" not in [value for value, _ in skill.calls]
+
+
+def test_chain_sequential_mode_does_not_run_past_failure():
+    manager, skill = make_manager()
+    results = manager.chain_skills([
+        {"skill": "echo", "parameters": {"value": "fail"}},
+        {"skill": "echo", "parameters": {"value": "b"}},
+    ], parallel=False)
+
+    assert len(results) == 1
+    assert [value for value, _ in skill.calls] == ["fail"]
+
+
+def test_chain_default_does_not_run_past_failure():
+    manager, skill = make_manager()
+    results = manager.chain_skills([
+        {"skill": "echo", "parameters": {"value": "fail"}},
+        {"skill": "echo", "parameters": {"value": "b"}},
+    ])
+
+    assert len(results) == 1
+    assert [value for value, _ in skill.calls] == ["fail"]
+
+
+def test_chain_parallel_mode_substitutes_referenced_results():
+    manager, _ = make_manager()
+    results = manager.chain_skills([
+        {"skill": "echo", "parameters": {"value": "a"}, "output_var": "first"},
+        {"skill": "echo", "parameters": {"value": "b"}, "output_var": "second"},
+        {"skill": "echo", "parameters": {"value": "$first"}},
+    ], parallel=True)
+
+    assert [r.data for r in results] == ["a", "b", "a"]
+
+
+def test_chain_falls_back_to_last_successful_producer():
+    for parallel in (False, True):
+        manager, skill = make_manager()
+        results = manager.chain_skills([
+            {"skill": "echo", "parameters": {"value": "a"}, "output_var": "x"},
+            {"skill": "echo", "parameters": {"value": "fail"}, "output_var": "x", "continue_on_error": True},
+            {"skill": "echo", "parameters": {"value": "$x"}},
+        ], parallel=parallel)
+
+        assert [r.success for r in results] == [True, False, True]
+        assert results[2].data == "a"